@@ -11,24 +11,34 @@ Main features:
 - Accepts POST requests with `name`, `email`, and `message`.
 - Validates and parses input using Pydantic.
 - Handles validation and database errors with appropriate HTTP responses.
+- Rate limits submissions per client IP and in total (see app/services/rate_limit.py).
+- Optionally queues submissions for batched insertion and answers `202 Accepted`
+  (`CONTACT_WRITE_BEHIND`, see app/services/contact_writer.py).
+- Scores submissions for spam before storing them (see app/services/spam.py).
+- Lets admins search the inbox (`GET /contact/search`) by text, date, status and language.
 - Supports language selection via dependency injection.
 """
 
 # Import external dependencies
-from fastapi import APIRouter, Depends, HTTPException, Request
+import logging
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
 # Import internal dependencies
+from app.core import config
 from app.db.queries import contact as crud
 from app.schemas import contact as schemas
-from app.services.i18n import get_language
+from app.services import contact_writer, spam
+from app.services.i18n import get_language, get_language_ids
+from app.services.rate_limit import limit_contact
 from app.services.db import get_async_session
-from app.services.user import fastapi_users
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
 
 
-# dependency that enforces the current user to be a superuser
-get_current_superuser = fastapi_users.current_user(superuser=True)
+logger = logging.getLogger(__name__)
 
 
 # Create a new APIRouter instance for the contact API
@@ -36,6 +46,7 @@ router = APIRouter(
     prefix="/contact",
     tags=["contact"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -56,9 +67,61 @@ async def get_contacts(lang: str = Depends(get_language),
     return await crud.get_contacts(lang, db)
 
 
-@router.post("/", response_model=schemas.SendingContact, status_code=201)
+def _naive_utc(value: datetime | None) -> datetime | None:
+    # creation dates are stored as naive UTC
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("/search", response_model=list[schemas.ContactRead])
+async def search_contacts(
+    q: str | None = Query(default=None, description="Full-text search over name, email and message "
+                                                    "(supports \"phrases\", or, -exclusions)."),
+    date_from: datetime | None = Query(default=None, description="Earliest creation date (inclusive)."),
+    date_to: datetime | None = Query(default=None, description="Latest creation date (exclusive)."),
+    send: bool | None = Query(default=None, description="Only delivered (true) or undelivered (false) contacts."),
+    language: str | None = Query(default=None, description="ISO 639-1 code of the contact language."),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    _admin=Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Searches the contact inbox.
+
+    Args:
+        q (str | None): Full-text search query.
+        date_from (datetime | None): Earliest creation date.
+        date_to (datetime | None): Latest creation date.
+        send (bool | None): Delivery status filter.
+        language (str | None): Language filter.
+        limit (int): Page size.
+        offset (int): Number of contacts to skip.
+        db (Session): Database session, injected via dependency.
+
+    Returns:
+        list[Contact]: Matching contacts, most relevant (or newest) first.
+    """
+    return await crud.search_contacts(
+        db,
+        query=q.strip() if q and q.strip() else None,
+        date_from=_naive_utc(date_from),
+        date_to=_naive_utc(date_to),
+        send=send,
+        language=language.strip().lower() if language else None,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.post("/", response_model=schemas.SendingContact, status_code=201,
+             dependencies=[Depends(limit_contact)],
+             responses={202: {"description": "Accepted, the contact is stored shortly (write-behind mode)"},
+                        503: {"description": "Too many contacts are waiting to be stored"}})
 async def post_contact(
     request: Request,
+    response: Response,
     lang: str = Depends(get_language),
     db: AsyncSession = Depends(get_async_session)
 ):
@@ -67,11 +130,13 @@ async def post_contact(
 
     - Parses and validates the request body.
     - Checks for required fields.
-    - Saves the contact to the database.
+    - Rejects spam; bots and duplicate submissions get a 202 without the contact being stored.
+    - Saves the contact to the database, or queues it in write-behind mode (202).
     - Returns the saved contact or an error message.
 
     Args:
         request (Request): FastAPI request object.
+        response (Response): The response, whose status is set to 202 if the contact is queued.
         lang (str): Language code, injected via dependency. Usually a iso 2 code is used.
         db (Session): Database session, injected via dependency.
 
@@ -95,9 +160,42 @@ async def post_contact(
         raise HTTPException(
             status_code=400, detail="All fields (name, email, message) are required.")
 
+    verdict = None
+    if config.SPAM_FILTER_ENABLED:
+        verdict = await spam.score(contact, body.get(config.SPAM_HONEYPOT_FIELD))
+        if verdict.is_spam:
+            logger.info("Rejected contact from %s as spam (score %.1f: %s)",
+                        contact.email, verdict.score, ", ".join(verdict.reasons))
+            if verdict.is_silent:
+                # give bots and double submissions no hint that the message was dropped
+                response.status_code = status.HTTP_202_ACCEPTED
+                return contact
+            raise HTTPException(status_code=400, detail="The message was rejected as spam.")
+
+    if config.CONTACT_WRITE_BEHIND:
+        # the supported languages are cached, so queuing needs no database round trip
+        language_id = (await get_language_ids(db)).get(lang)
+        if language_id is None:
+            if verdict:
+                spam.forget(verdict)
+            raise HTTPException(status_code=400, detail=f"Language '{lang}' not found in the database.")
+
+        try:
+            contact_writer.enqueue(contact, language_id)
+        except contact_writer.QueueFull as e:
+            if verdict:
+                spam.forget(verdict)
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e),
+                                headers={"Retry-After": "5"})
+
+        response.status_code = status.HTTP_202_ACCEPTED
+        return contact
+
     try:
         # Save the contact to the database (async helper)
         saved = await crud.save_contact(contact, db, lang)
         return saved
     except ValueError as e:
+        if verdict:
+            spam.forget(verdict)
         raise HTTPException(status_code=400, detail=str(e))
@@ -5,7 +5,7 @@ Provides endpoints to list and create 'Education' entries.
 
 Author: Simon Neidig <mail@simon-neidig.eu>
 
-- GET /education/  -> List education entries for a requested language.
+- GET /education/  -> List education entries for a requested language (or all languages with `?lang=all`).
 - POST /education/ -> Create a new education entry (requires superuser).
 
 Notes:
@@ -21,13 +21,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # Import internal dependencies
 from app.db.queries import education as crud
 from app.schemas import education as schemas
-from app.services.i18n import get_language
+from app.schemas.translation import localized_list
+from app.services.i18n import ALL_LANGUAGES, get_language_or_all, get_requested_language
 from app.services.db import get_async_session
-from app.services.user import fastapi_users
-
-
-# dependency that enforces the current user to be a superuser
-get_current_superuser = fastapi_users.current_user(superuser=True)
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
 
 
 # Create a new APIRouter instance for the education API
@@ -35,16 +33,17 @@ router = APIRouter(
     prefix="/education",
     tags=["education"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
-@router.get("/", response_model=list[schemas.EducationRead])
-async def get_education(lang: str = Depends(get_language), db: AsyncSession = Depends(get_async_session)):
+@router.get("/", response_model=localized_list(schemas.EducationRead, schemas.EducationAllLanguages))
+async def get_education(lang: str = Depends(get_language_or_all), db: AsyncSession = Depends(get_async_session)):
     """
     Retrieve education entries.
 
     Args:
-        lang (str): Language code resolved by the get_language dependency (e.g. 'en', 'de', 'fr').
+        lang (str): Language code or 'all', injected via dependency.
         db (AsyncSession): Async SQLAlchemy session provided by dependency injection.
 
     Returns:
@@ -54,14 +53,16 @@ async def get_education(lang: str = Depends(get_language), db: AsyncSession = De
         - This endpoint is read-only and publicly accessible.
         - Pagination and filtering are not implemented here (can be added later if needed).
     """
-    return await crud.get_educations(lang, db)
+    if lang == ALL_LANGUAGES:
+        return await crud.get_educations_all_languages(db)
 
+    return await crud.get_educations(lang, db)
 
 
 @router.post("/", response_model=schemas.EducationRead, status_code=status.HTTP_201_CREATED)
 async def create_education(
     payload: schemas.EducationCreate,
-    lang: str = Depends(get_language),
+    lang: str = Depends(get_requested_language),
     db: AsyncSession = Depends(get_async_session),
     _admin=Depends(get_current_superuser),
     response: Response = None,
@@ -18,13 +18,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # Import internal dependencies
 from app.db.queries import expertise as crud
 from app.schemas import expertise as schemas
-from app.services.i18n import get_language
+from app.schemas.translation import localized_list
+from app.services.i18n import ALL_LANGUAGES, get_language_or_all, get_requested_language
 from app.services.db import get_async_session
-from app.services.user import fastapi_users
-
-
-# dependency that enforces the current user to be a superuser
-get_current_superuser = fastapi_users.current_user(superuser=True)
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
 
 
 # Create a new APIRouter instance for the expertise API
@@ -32,29 +30,32 @@ router = APIRouter(
     prefix="/expertise",
     tags=["expertise"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
-@router.get("/", response_model=list[schemas.ExpertiseRead])
-async def get_expertises(lang: str = Depends(get_language), db: AsyncSession = Depends(get_async_session)):
+@router.get("/", response_model=localized_list(schemas.ExpertiseRead, schemas.ExpertiseAllLanguages))
+async def get_expertises(lang: str = Depends(get_language_or_all), db: AsyncSession = Depends(get_async_session)):
     """
     Retrieves a list of expertise entries.
 
     Args:
-        lang (str): Language code, injected via dependency.
+        lang (str): Language code or 'all', injected via dependency.
         db (Session): Database session, injected via dependency.
 
     Returns:
         list[Expertise]: List of expertise entries.
     """
-    return await crud.get_expertises(lang, db)
+    if lang == ALL_LANGUAGES:
+        return await crud.get_expertises_all_languages(db)
 
+    return await crud.get_expertises(lang, db)
 
 
 @router.post("/", response_model=schemas.ExpertiseRead, status_code=status.HTTP_201_CREATED)
 async def create_expertise(
     payload: schemas.ExpertiseCreate,
-    lang: str = Depends(get_language),
+    lang: str = Depends(get_requested_language),
     db: AsyncSession = Depends(get_async_session),
     _admin=Depends(get_current_superuser),
     response: Response = None,
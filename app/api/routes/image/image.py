@@ -3,24 +3,45 @@ Image API Route for FastAPI
 
 Author: Simon Neidig <mail@simon-neidig.eu>
 
-This module provides the endpoint for retrieving images via GET from `/image/{image_id}`.
+This module provides the endpoint for retrieving images via GET from `/image/{image_id}`
+and for uploading images via POST to `/image/`. Original files and their resized variants
+are additionally served immutable under their content hash from `/image/hash/{sha256}`, and
+`/image/manifest` lists dimensions and URLs of several images at once.
 An "Image" represents an image file stored and referenced by the website.
 Images can be used throughout the website in various objects. These objects return the image ID, and the actual image file can be retrieved via this route using that ID.
 
 Main features:
 - Accepts GET requests to retrieve images by ID.
-- Returns image files from disk.
+- Returns image files from the storage backend (local disk or S3-compatible object store), or hands the
+  transfer over to the reverse proxy (X-Accel-Redirect / X-Sendfile) or the object store (presigned redirect).
+- Accepts multipart uploads (admin only), stores them content-addressed and deduplicates identical files.
+- Renders resized variants at upload time and exposes them via a batch manifest for `srcset` generation.
 """
 
 # Import external dependencies
-import os
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Path, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import internal dependencies
 from app.db.queries import image as crud
+from app.schemas import image as schemas
+from app.services import image_storage
 from app.services.db import get_async_session
+from app.services.image_delivery import image_response, storage_exception
+from app.core import config
+from app.services.image_processing import VARIANT_MIME_TYPE, InvalidImage, inspect_image, render_variants
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
+from app.services.storage import StorageError
+
+
+# Maximum number of images that can be requested from the manifest at once
+MAX_MANIFEST_IDS = 100
+
+# Content-addressed files never change, so clients and CDNs may cache them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 
 # Create a new APIRouter instance for the image API
@@ -28,9 +49,100 @@ router = APIRouter(
     prefix="/image",
     tags=["image"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
+def _hash_url(request: Request, image) -> str:
+    """
+    Build the content-addressed URL of an image or variant (falls back to the ID based URL).
+    """
+    if image.sha256:
+        return request.app.url_path_for("get_image_by_hash", sha256=image.sha256)
+    return request.app.url_path_for("get_image", image_id=image.id)
+
+
+@router.get("/manifest", response_model=list[schemas.ImageManifestEntry])
+async def get_image_manifest(ids: str, request: Request, db: AsyncSession = Depends(get_async_session)):
+    """
+    Retrieves dimensions, MIME type, content-addressed URL and resized variants of several images.
+
+    Args:
+        ids (str): Comma separated image IDs (e.g. `1,2,3`).
+        request (Request): FastAPI request object, used to build URLs.
+        db (AsyncSession): Database session, injected via dependency.
+
+    Returns:
+        list[ImageManifestEntry]: One entry per found image, in the requested order.
+
+    Raises:
+        HTTPException(400): If the IDs are malformed or too many IDs are requested.
+    """
+    try:
+        image_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma separated list of integers")
+
+    if len(image_ids) > MAX_MANIFEST_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_MANIFEST_IDS} images can be requested at once")
+
+    images = {image.id: image for image in await crud.get_images_with_variants(image_ids, db)}
+
+    return [
+        {
+            "id": image.id,
+            "width": image.width,
+            "height": image.height,
+            "placeholder": image.placeholder,
+            "mime_type": image.mime_type,
+            "url": _hash_url(request, image),
+            "variants": [
+                {
+                    "width": variant.width,
+                    "height": variant.height,
+                    "mime_type": variant.mime_type,
+                    "url": _hash_url(request, variant),
+                }
+                for variant in image.variants
+            ],
+        }
+        for image in (images.get(image_id) for image_id in image_ids)
+        if image is not None
+    ]
+
+
+@router.get("/hash/{sha256}", response_class=FileResponse)
+async def get_image_by_hash(
+    sha256: str = Path(pattern="^[0-9a-f]{64}$"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Retrieves an image or image variant file by the SHA-256 digest of its content.
+
+    As the URL changes whenever the content changes, the response may be cached forever.
+
+    Args:
+        sha256 (str): Hex encoded SHA-256 digest.
+        db (AsyncSession): Database session, injected via dependency.
+
+    Returns:
+        FileResponse: The image file (or an offload response, see `get_image`).
+
+    Raises:
+        HTTPException: If no image or variant with this digest exists.
+    """
+    image = await crud.get_image_by_sha256(sha256, db) or await crud.get_image_variant_by_sha256(sha256, db)
+
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    response = await image_response(image.filepath, image.mime_type or "image/jpeg")
+    # presigned redirects expire and must not be cached forever
+    if response.status_code == status.HTTP_200_OK:
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
 @router.get("/{image_id}", response_class=FileResponse)
 async def get_image(image_id: int, db: AsyncSession = Depends(get_async_session)):
     """
@@ -41,7 +153,10 @@ async def get_image(image_id: int, db: AsyncSession = Depends(get_async_session)
         db (Session): Database session, injected via dependency.
 
     Returns:
-        FileResponse: The image file.
+        FileResponse: The image file, or an empty response carrying an `X-Accel-Redirect` /
+        `X-Sendfile` header if delivery is offloaded to the reverse proxy (`IMAGE_DELIVERY`).
+        Files in an object store are streamed through or redirected to a presigned URL
+        (`IMAGE_PRESIGNED_REDIRECT`).
 
     Raises:
         HTTPException: If the image or file is not found.
@@ -51,9 +166,98 @@ async def get_image(image_id: int, db: AsyncSession = Depends(get_async_session)
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
 
-    if not os.path.exists(image.filepath):
-        raise HTTPException(
-            status_code=404, detail="Image file missing on disk")
+    # images created before uploads recorded their MIME type are JPEGs
+    return await image_response(image.filepath, image.mime_type or "image/jpeg")
+
+
+@router.post("/", response_model=schemas.ImageRead, status_code=status.HTTP_201_CREATED)
+async def upload_image(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_session),
+    _admin=Depends(get_current_superuser),
+    response: Response = None,
+):
+    """
+    Upload a new image (admin only).
+
+    The file is streamed to a temporary file in chunks while its SHA-256 digest is computed
+    and then stored under that digest in the storage backend. Uploading content that is
+    already stored does not create a second file or row; the existing image is returned
+    with status 200 instead. Dimensions, a low-quality placeholder and the resized variants
+    (`IMAGE_VARIANT_WIDTHS`) are computed once here and stored with the image.
+
+    Args:
+        file (UploadFile): The uploaded image file (multipart/form-data).
+        db (AsyncSession): Async database session.
+        _admin: Injected current user (must be superuser) — used for authorization only.
+        response (Response): FastAPI Response object used to adjust the status code.
+
+    Returns:
+        ImageRead: The created (or already existing) image.
+
+    Raises:
+        HTTPException(413): If the file exceeds the configured maximum size.
+        HTTPException(415): If the file is not a supported or decodable image, or its content
+            does not match the declared type.
+        HTTPException(502/503): If the storage backend rejects the file or is unreachable.
+    """
+    try:
+        staged = await image_storage.stage_upload(file)
+    except image_storage.UnsupportedImageType as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    except image_storage.ImageTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+
+    try:
+        existing = await crud.get_image_by_sha256(staged.sha256, db)
+        if existing:
+            if response is not None:
+                response.status_code = status.HTTP_200_OK
+            return existing
+
+        # The staged copy is local, so it is inspected before anything reaches the storage backend
+        try:
+            metadata = await run_in_threadpool(inspect_image, staged.tmp_path)
+            rendered = await run_in_threadpool(render_variants, staged.tmp_path, config.IMAGE_VARIANT_WIDTHS)
+        except InvalidImage as e:
+            raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+
+        # the stored type and file extension must follow the content, not the declared type
+        if metadata.mime_type != staged.mime_type:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"The file is declared as '{staged.mime_type}' but contains "
+                       f"'{metadata.mime_type or 'an unknown format'}'.",
+            )
+
+        try:
+            variants = []
+            for variant in rendered:
+                stored_variant = await image_storage.store_bytes(variant.data, VARIANT_MIME_TYPE)
+                variants.append({
+                    "width": variant.width,
+                    "height": variant.height,
+                    "filepath": stored_variant.filepath,
+                    "sha256": stored_variant.sha256,
+                    "size": stored_variant.size,
+                    "mime_type": stored_variant.mime_type,
+                })
+
+            stored = await image_storage.commit(staged)
+        except StorageError as e:
+            raise storage_exception(e)
+    finally:
+        await image_storage.release(staged)
 
-    # oder image/png
-    return FileResponse(image.filepath, media_type="image/jpeg")
+    return await crud.create_image(
+        db,
+        filename=stored.filename,
+        filepath=stored.filepath,
+        sha256=stored.sha256,
+        size=stored.size,
+        mime_type=stored.mime_type,
+        width=metadata.width,
+        height=metadata.height,
+        placeholder=metadata.placeholder,
+        variants=variants,
+    )
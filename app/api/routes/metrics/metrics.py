@@ -0,0 +1,56 @@
+"""
+Metrics API Route for FastAPI
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module provides the endpoint for scraping the Prometheus metrics of the API via GET from
+`/metrics` (see app/services/metrics.py).
+
+Main features:
+- Returns the metrics in the Prometheus text exposition format, aggregated over all workers.
+- Is disabled unless `METRICS_ENABLED` is set.
+- Requires `Authorization: Bearer <METRICS_TOKEN>` if `METRICS_TOKEN` is set.
+- Is not part of the OpenAPI schema.
+"""
+
+# Import external dependencies
+import secrets
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+# Import internal dependencies
+from app.core import config
+from app.services import metrics
+
+
+# Create a new APIRouter instance for the metrics endpoint
+router = APIRouter(
+    prefix="/metrics",
+    include_in_schema=False,
+)
+
+
+@router.get("")
+async def get_metrics(request: Request):
+    """
+    Returns the metrics of the API.
+
+    Args:
+        request (Request): FastAPI request object.
+
+    Returns:
+        Response: The metrics in the Prometheus text format.
+
+    Raises:
+        HTTPException(404): If metrics are disabled.
+        HTTPException(401): If `METRICS_TOKEN` is set and the request does not carry it.
+    """
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    if config.METRICS_TOKEN:
+        authorization = request.headers.get("authorization", "")
+        if not secrets.compare_digest(authorization.encode(), f"Bearer {config.METRICS_TOKEN}".encode()):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
@@ -19,13 +19,11 @@ from datetime import datetime
 # Import internal dependencies
 from app.db.queries import page as crud
 from app.schemas import page as schemas
-from app.services.i18n import get_language
+from app.schemas.translation import localized_list
+from app.services.i18n import ALL_LANGUAGES, get_language, get_language_or_all, get_requested_language
 from app.services.db import get_async_session
-from app.services.user import fastapi_users
-
-
-# dependency that enforces the current user to be a superuser
-get_current_superuser = fastapi_users.current_user(superuser=True)
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
 
 
 # Create a new APIRouter instance for the page API
@@ -33,21 +31,25 @@ router = APIRouter(
     prefix="/page",
     tags=["page"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
-@router.get("/", response_model=list[schemas.PageRead])
-async def get_pages(lang: str = Depends(get_language), db: AsyncSession = Depends(get_async_session)):
+@router.get("/", response_model=localized_list(schemas.PageRead, schemas.PageAllLanguages))
+async def get_pages(lang: str = Depends(get_language_or_all), db: AsyncSession = Depends(get_async_session)):
     """
     Retrieves a list of pages.
 
     Args:
-        lang (str): Language code, injected via dependency.
+        lang (str): Language code or 'all', injected via dependency.
         db (Session): Database session, injected via dependency.
 
     Returns:
         list[Page]: List of pages.
     """
+    if lang == ALL_LANGUAGES:
+        return await crud.get_pages_all_languages(db)
+
     return await crud.get_pages(lang, db)
 
 
@@ -76,7 +78,7 @@ async def get_page(tech_key: str, lang: str = Depends(get_language), db: AsyncSe
 @router.post("/", response_model=schemas.PageRead, status_code=status.HTTP_201_CREATED)
 async def create_page(
     payload: schemas.PageCreate,
-    lang: str = Depends(get_language),
+    lang: str = Depends(get_requested_language),
     db: AsyncSession = Depends(get_async_session),
     _admin=Depends(get_current_superuser),
     response: Response = None,
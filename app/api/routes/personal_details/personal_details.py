@@ -21,6 +21,7 @@ from app.db.queries import personal_details as crud
 from app.schemas import personal_details as schemas
 from app.services.i18n import get_language
 from app.services.db import get_async_session
+from app.services.server_timing import TimedRoute
 
 
 # Create a new APIRouter instance for the personal details API
@@ -28,6 +29,7 @@ router = APIRouter(
     prefix="/personal-details",
     tags=["personal-details"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -18,13 +18,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # Import internal dependencies
 from app.db.queries import personal_information as crud
 from app.schemas import personal_information as schemas
-from app.services.i18n import get_language
+from app.schemas.translation import localized_list
+from app.services.i18n import ALL_LANGUAGES, get_language_or_all, get_requested_language
 from app.services.db import get_async_session
-from app.services.user import fastapi_users
-
-
-# dependency that enforces the current user to be a superuser
-get_current_superuser = fastapi_users.current_user(superuser=True)
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
 
 
 # Create a new APIRouter instance for the personal information API
@@ -32,28 +30,32 @@ router = APIRouter(
     prefix="/personal-information",
     tags=["personal-information"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
-@router.get("/", response_model=list[schemas.PersonalInformationRead])
-async def get_personal_information(lang: str = Depends(get_language), db: AsyncSession = Depends(get_async_session)):
+@router.get("/", response_model=localized_list(schemas.PersonalInformationRead, schemas.PersonalInformationAllLanguages))
+async def get_personal_information(lang: str = Depends(get_language_or_all), db: AsyncSession = Depends(get_async_session)):
     """
     Retrieves a list of personal information entries.
 
     Args:
-        lang (str): Language code, injected via dependency.
+        lang (str): Language code or 'all', injected via dependency.
         db (Session): Database session, injected via dependency.
 
     Returns:
         list[PersonalInformation]: List of personal information entries.
     """
+    if lang == ALL_LANGUAGES:
+        return await crud.get_personal_information_all_languages(db)
+
     return await crud.get_personal_information(lang, db)
 
 
 @router.post("/", response_model=schemas.PersonalInformationRead, status_code=status.HTTP_201_CREATED)
 async def create_personal_information(
     payload: schemas.PersonalInformationCreate,
-    lang: str = Depends(get_language),
+    lang: str = Depends(get_requested_language),
     db: AsyncSession = Depends(get_async_session),
     _admin=Depends(get_current_superuser),
     response: Response = None,
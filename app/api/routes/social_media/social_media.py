@@ -19,11 +19,8 @@ from app.db.queries import social_media as crud
 from app.schemas import social_media as schemas
 from app.services.i18n import get_language
 from app.services.db import get_async_session
-from app.services.user import fastapi_users
-
-
-# dependency that enforces the current user to be a superuser
-get_current_superuser = fastapi_users.current_user(superuser=True)
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
 
 
 # Create a new APIRouter instance for the social media API
@@ -31,6 +28,7 @@ router = APIRouter(
     prefix="/social-media",
     tags=["social media"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -48,7 +46,6 @@ async def get_social_medias(db: AsyncSession = Depends(get_async_session)):
     return await crud.get_social_medias(db)
 
 
-
 @router.post("/", response_model=schemas.SocialMediaRead, status_code=status.HTTP_201_CREATED)
 async def create_social_media(
     payload: schemas.SocialMediaCreate,
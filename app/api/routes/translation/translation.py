@@ -0,0 +1,52 @@
+"""
+Translation API Route for FastAPI
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module provides the endpoint for retrieving the translation coverage report via GET
+from `/translation/coverage`. Entries without a translation for the requested language are
+left out of the localized responses, so the report shows per translated entity and language
+how many entries are translated and which ones are missing.
+
+Main features:
+- Accepts GET requests to retrieve the coverage of all translation tables (admin only).
+- Computes the report in a single set-based query (see `app.db.queries.translation`).
+"""
+
+# Import external dependencies
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Import internal dependencies
+from app.db.queries import translation as crud
+from app.schemas import translation as schemas
+from app.services.db import get_async_session
+from app.services.user import get_current_superuser
+from app.services.server_timing import TimedRoute
+
+
+# Create a new APIRouter instance for the translation API
+router = APIRouter(
+    prefix="/translation",
+    tags=["translation"],
+    responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
+)
+
+
+@router.get("/coverage", response_model=list[schemas.TranslationCoverage])
+async def get_translation_coverage(
+    db: AsyncSession = Depends(get_async_session),
+    _admin=Depends(get_current_superuser),
+):
+    """
+    Retrieves the translation coverage per translated entity and language (admin only).
+
+    Args:
+        db (AsyncSession): Database session, injected via dependency.
+        _admin: Injected current user (must be superuser) — used for authorization only.
+
+    Returns:
+        list[TranslationCoverage]: Coverage entries ordered by entity and language.
+    """
+    return await crud.get_translation_coverage(db)
@@ -19,8 +19,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # Import internal dependencies
 from app.db.queries import work as crud
 from app.schemas import work as schemas
-from app.services.i18n import get_language
+from app.schemas.translation import localized_list
+from app.services.i18n import ALL_LANGUAGES, get_language_or_all
 from app.services.db import get_async_session
+from app.services.server_timing import TimedRoute
 
 
 # Create a new APIRouter instance for the work API
@@ -28,20 +30,24 @@ router = APIRouter(
     prefix="/work",
     tags=["work"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
-@router.get("/", response_model=list[schemas.Work])
-async def get_works(lang: str = Depends(get_language), db: AsyncSession = Depends(get_async_session)):
+@router.get("/", response_model=localized_list(schemas.Work, schemas.WorkAllLanguages))
+async def get_works(lang: str = Depends(get_language_or_all), db: AsyncSession = Depends(get_async_session)):
     """
     Retrieves a list of work entries.
 
     Args:
-        lang (str): Language code, injected via dependency.
+        lang (str): Language code or 'all', injected via dependency.
         db (Session): Database session, injected via dependency.
 
     Returns:
         list[Work]: List of work items.
 
     """
+    if lang == ALL_LANGUAGES:
+        return await crud.get_works_all_languages(db)
+
     return await crud.get_works(lang, db)
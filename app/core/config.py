@@ -16,4 +16,144 @@ import os
 load_dotenv()
 
 # Store variables in global accessible variables
-DB_CONNECTION = os.getenv('DB_CONNECTION')
\ No newline at end of file
+DB_CONNECTION = os.getenv('DB_CONNECTION')
+
+# Language used if none of the languages accepted by the client is supported, and the number of
+# seconds the supported languages are cached
+DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'en').lower()
+LANGUAGE_CACHE_TTL = int(os.getenv('LANGUAGE_CACHE_TTL', 300))
+
+# Listen for the change notifications of the database triggers and evict cached entries of
+# changed tables (see app/services/change_feed.py)
+CHANGE_FEED_ENABLED = os.getenv('CHANGE_FEED_ENABLED', 'true').lower() == 'true'
+
+# Image storage: directory for uploaded files and the maximum accepted upload size in bytes
+IMAGE_DIR = os.getenv('IMAGE_DIR', 'images')
+IMAGE_MAX_UPLOAD_SIZE = int(os.getenv('IMAGE_MAX_UPLOAD_SIZE', 20 * 1024 * 1024))
+
+# Image storage backend: 'local' keeps files below IMAGE_DIR, 's3' stores them in a bucket of an
+# S3-compatible object store (AWS S3, MinIO, ...) and uses IMAGE_DIR for temporary files only
+IMAGE_STORAGE = os.getenv('IMAGE_STORAGE', 'local').lower()
+S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL', 'http://localhost:9000')
+S3_PUBLIC_ENDPOINT_URL = os.getenv('S3_PUBLIC_ENDPOINT_URL', S3_ENDPOINT_URL)
+S3_BUCKET = os.getenv('S3_BUCKET', 'images')
+S3_REGION = os.getenv('S3_REGION', 'us-east-1')
+S3_ACCESS_KEY_ID = os.getenv('S3_ACCESS_KEY_ID')
+S3_SECRET_ACCESS_KEY = os.getenv('S3_SECRET_ACCESS_KEY')
+
+# Redirect image requests to presigned object store URLs (valid for the given seconds) instead
+# of streaming them through the application; only supported by the 's3' backend
+IMAGE_PRESIGNED_REDIRECT = os.getenv('IMAGE_PRESIGNED_REDIRECT', 'false').lower() == 'true'
+IMAGE_PRESIGNED_EXPIRES = int(os.getenv('IMAGE_PRESIGNED_EXPIRES', 300))
+
+# Image delivery: 'direct' streams files from the worker, 'x-accel-redirect' (nginx) and
+# 'x-sendfile' (Apache, lighttpd, Caddy) hand the file transfer over to the reverse proxy
+IMAGE_DELIVERY = os.getenv('IMAGE_DELIVERY', 'direct').lower()
+IMAGE_ACCEL_REDIRECT_PREFIX = os.getenv('IMAGE_ACCEL_REDIRECT_PREFIX', '/protected-images/')
+
+# Widths (in pixels) of the resized variants rendered for every uploaded image
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv('IMAGE_VARIANT_WIDTHS', '480,960,1920').split(',') if w.strip()]
+
+# Contact outbox: stored contact requests are delivered by mail to CONTACT_MAIL_TO by a
+# background worker (see app/services/contact_outbox.py); SMTP_SECURITY is 'none', 'starttls'
+# or 'tls'. The defaults (submission port 587 with STARTTLS) are the production settings; for a
+# local debugging server use SMTP_PORT=1025 and SMTP_SECURITY=none
+CONTACT_OUTBOX_ENABLED = os.getenv('CONTACT_OUTBOX_ENABLED', 'false').lower() == 'true'
+CONTACT_OUTBOX_INTERVAL = float(os.getenv('CONTACT_OUTBOX_INTERVAL', 10))
+CONTACT_OUTBOX_BATCH_SIZE = int(os.getenv('CONTACT_OUTBOX_BATCH_SIZE', 20))
+CONTACT_OUTBOX_MAX_ATTEMPTS = int(os.getenv('CONTACT_OUTBOX_MAX_ATTEMPTS', 8))
+CONTACT_OUTBOX_RETRY_DELAY = int(os.getenv('CONTACT_OUTBOX_RETRY_DELAY', 60))
+CONTACT_MAIL_FROM = os.getenv('CONTACT_MAIL_FROM', 'website@localhost')
+CONTACT_MAIL_TO = os.getenv('CONTACT_MAIL_TO', 'mail@localhost')
+SMTP_HOST = os.getenv('SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+SMTP_USERNAME = os.getenv('SMTP_USERNAME') or None
+SMTP_PASSWORD = os.getenv('SMTP_PASSWORD') or None
+SMTP_SECURITY = os.getenv('SMTP_SECURITY', 'starttls').lower()
+SMTP_TIMEOUT = float(os.getenv('SMTP_TIMEOUT', 30))
+
+# User lifecycle events (see app/services/user_events.py): comma separated sinks ('log', 'mail'),
+# queue size, delivery attempts and initial retry delay in seconds; the mails link to the
+# frontend, '{token}' is replaced with the reset or verification token
+USER_EVENT_SINKS = os.getenv('USER_EVENT_SINKS', 'log')
+USER_EVENT_QUEUE_SIZE = int(os.getenv('USER_EVENT_QUEUE_SIZE', 1000))
+USER_EVENT_MAX_ATTEMPTS = int(os.getenv('USER_EVENT_MAX_ATTEMPTS', 5))
+USER_EVENT_RETRY_DELAY = float(os.getenv('USER_EVENT_RETRY_DELAY', 2))
+USER_MAIL_FROM = os.getenv('USER_MAIL_FROM', CONTACT_MAIL_FROM)
+USER_RESET_PASSWORD_URL = os.getenv('USER_RESET_PASSWORD_URL', 'http://localhost:3000/reset-password?token={token}')
+USER_VERIFY_URL = os.getenv('USER_VERIFY_URL', 'http://localhost:3000/verify?token={token}')
+
+# Rate limits of the public write routes as "<requests>/<second|minute|hour|day>" per client IP
+# and for all clients together (empty disables a limit); buckets are kept per process
+# ('memory') or shared via Redis ('redis', see REDIS_URL)
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory').lower()
+RATE_LIMIT_CONTACT = os.getenv('RATE_LIMIT_CONTACT', '5/minute')
+RATE_LIMIT_CONTACT_GLOBAL = os.getenv('RATE_LIMIT_CONTACT_GLOBAL', '60/minute')
+RATE_LIMIT_AUTH = os.getenv('RATE_LIMIT_AUTH', '10/minute')
+RATE_LIMIT_AUTH_GLOBAL = os.getenv('RATE_LIMIT_AUTH_GLOBAL', '120/minute')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# Write-behind mode of the contact form: submissions are queued (at most
+# CONTACT_WRITE_BEHIND_QUEUE_SIZE) and inserted in batches of up to CONTACT_WRITE_BEHIND_BATCH_SIZE
+# rows at least every CONTACT_WRITE_BEHIND_INTERVAL_MS milliseconds (see app/services/contact_writer.py)
+CONTACT_WRITE_BEHIND = os.getenv('CONTACT_WRITE_BEHIND', 'false').lower() == 'true'
+CONTACT_WRITE_BEHIND_QUEUE_SIZE = int(os.getenv('CONTACT_WRITE_BEHIND_QUEUE_SIZE', 1000))
+CONTACT_WRITE_BEHIND_BATCH_SIZE = int(os.getenv('CONTACT_WRITE_BEHIND_BATCH_SIZE', 100))
+CONTACT_WRITE_BEHIND_INTERVAL_MS = int(os.getenv('CONTACT_WRITE_BEHIND_INTERVAL_MS', 200))
+
+# Spam scoring of contact submissions (see app/services/spam.py): submissions whose heuristics
+# add up to SPAM_SCORE_THRESHOLD are rejected
+SPAM_FILTER_ENABLED = os.getenv('SPAM_FILTER_ENABLED', 'true').lower() == 'true'
+SPAM_SCORE_THRESHOLD = float(os.getenv('SPAM_SCORE_THRESHOLD', 1.0))
+SPAM_HONEYPOT_FIELD = os.getenv('SPAM_HONEYPOT_FIELD', 'website')
+SPAM_DUPLICATE_WINDOW = int(os.getenv('SPAM_DUPLICATE_WINDOW', 86400))
+SPAM_MAX_TRACKED_MESSAGES = int(os.getenv('SPAM_MAX_TRACKED_MESSAGES', 10000))
+SPAM_MAX_LINKS = int(os.getenv('SPAM_MAX_LINKS', 2))
+SPAM_EMAIL_RATE = os.getenv('SPAM_EMAIL_RATE', '3/hour')
+
+# Contact retention (see app/jobs/contact_retention.py): contacts are kept for the given number
+# of full months; partitions are created the given number of months in advance
+CONTACT_RETENTION_MONTHS = int(os.getenv('CONTACT_RETENTION_MONTHS', 24))
+CONTACT_PARTITIONS_AHEAD = int(os.getenv('CONTACT_PARTITIONS_AHEAD', 3))
+
+# Lifetime of the issued JWTs in seconds, and interval in seconds in which every worker reloads
+# the token revocation list (see app/services/token_revocation.py)
+JWT_LIFETIME = int(os.getenv('JWT_LIFETIME', 3600))
+TOKEN_REVOCATION_REFRESH = int(os.getenv('TOKEN_REVOCATION_REFRESH', 60))
+
+# Cache of the superusers resolved from tokens: lifetime in seconds (capped by the token expiry)
+# and maximum number of cached tokens
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 300))
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 1000))
+
+# Password hashing pool (see app/services/password.py): number of threads (0 hashes inline on the
+# event loop, for benchmarks only) and of jobs that may wait for a thread before requests are
+# rejected with 503
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 16))
+
+# Statement budget per request (see app/services/query_budget.py): requests above the thresholds
+# are logged; in strict mode (CI, development) they fail and lazy loads raise
+SQL_STATEMENT_THRESHOLD = int(os.getenv('SQL_STATEMENT_THRESHOLD', 20))
+SQL_TIME_THRESHOLD_MS = float(os.getenv('SQL_TIME_THRESHOLD_MS', 500))
+SQL_STRICT_MODE = os.getenv('SQL_STRICT_MODE', 'false').lower() == 'true'
+
+# Server-Timing header with the phases of a request (see app/services/server_timing.py):
+# 'off', 'superuser' (only for requests authenticated as superuser) or 'all'
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'superuser').lower()
+
+# Prometheus metrics on /metrics (see app/services/metrics.py), optionally protected by a bearer
+# token; set PROMETHEUS_MULTIPROC_DIR (read by prometheus_client) to aggregate several workers.
+# Disabled by default: without METRICS_TOKEN, routes, latencies, pool and cache usage are public
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN') or None
+
+# Slow statement log (see app/services/slow_queries.py): threshold in milliseconds (negative to
+# disable), whether parameters are logged (off by default, as they contain personal data such as
+# emails, names and messages of users and contacts), and the share of slow SELECTs whose plan is
+# captured with EXPLAIN ANALYZE, at most once per interval in seconds
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 250))
+SLOW_QUERY_LOG_PARAMETERS = os.getenv('SLOW_QUERY_LOG_PARAMETERS', 'false').lower() == 'true'
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1))
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv('SLOW_QUERY_EXPLAIN_INTERVAL', 60))
@@ -0,0 +1,32 @@
+"""Make image variant sha256 non-unique
+
+Revision ID: 4d8a1f6c3b27
+Revises: 7b3e9d05a2c4
+Create Date: 2026-10-19 21:04:12.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8a1f6c3b27'
+down_revision: Union[str, None] = '7b3e9d05a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Two originals can render identical variants that share one content-addressed file
+    op.drop_index(op.f('ix_image_variant_sha256'), table_name='image_variant')
+    op.create_index(op.f('ix_image_variant_sha256'), 'image_variant', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails if variants with the same content have been stored in the meantime
+    op.drop_index(op.f('ix_image_variant_sha256'), table_name='image_variant')
+    op.create_index(op.f('ix_image_variant_sha256'), 'image_variant', ['sha256'], unique=True)
@@ -0,0 +1,136 @@
+"""Partition contact by month
+
+Revision ID: 5f0c7e93a1b8
+Revises: d81b6c0e2f57
+Create Date: 2026-10-19 17:36:50.114287
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0c7e93a1b8'
+down_revision: Union[str, None] = 'd81b6c0e2f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months created in advance (the retention job keeps creating them, see app/jobs/contact_retention.py)
+PARTITIONS_AHEAD = 3
+
+COLUMNS = (
+    'id, creation_date, sending_date, send, name, email, message, attempts, next_attempt_date, '
+    'last_error, language_id'
+)
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(message, '')), 'B')"
+)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_contact_creation_date', 'contact', ['creation_date'], unique=False)
+    op.create_index('ix_contact_search_vector', 'contact', ['search_vector'], unique=False,
+                    postgresql_using='gin')
+    op.create_index(
+        'ix_contact_outbox', 'contact', ['next_attempt_date'], unique=False,
+        postgresql_where=sa.text('send = false AND next_attempt_date IS NOT NULL'),
+    )
+
+
+def _drop_indexes() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_contact_creation_date')
+    op.execute('DROP INDEX IF EXISTS ix_contact_search_vector')
+    op.execute('DROP INDEX IF EXISTS ix_contact_outbox')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The partition key must be part of the primary key and must not be null
+    op.execute("UPDATE contact SET creation_date = now() at time zone 'utc' WHERE creation_date IS NULL")
+
+    op.execute('ALTER TABLE contact RENAME TO contact_unpartitioned')
+    op.execute('ALTER TABLE contact_unpartitioned RENAME CONSTRAINT contact_pkey TO contact_unpartitioned_pkey')
+    op.execute('ALTER SEQUENCE contact_id_seq OWNED BY NONE')
+    _drop_indexes()
+
+    op.execute(f"""
+        CREATE TABLE contact (
+            id integer NOT NULL DEFAULT nextval('contact_id_seq'),
+            creation_date timestamp without time zone NOT NULL,
+            sending_date timestamp without time zone,
+            send boolean,
+            name varchar,
+            email varchar,
+            message varchar,
+            attempts integer NOT NULL DEFAULT 0,
+            next_attempt_date timestamp without time zone,
+            last_error varchar,
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED,
+            language_id integer REFERENCES language (id),
+            PRIMARY KEY (id, creation_date)
+        ) PARTITION BY RANGE (creation_date)
+    """)
+    op.execute('ALTER SEQUENCE contact_id_seq OWNED BY contact.id')
+
+    # One partition per month from the oldest contact until PARTITIONS_AHEAD months from now,
+    # and a default partition catching contacts outside of them
+    oldest = op.get_bind().execute(sa.text('SELECT min(creation_date) FROM contact_unpartitioned')).scalar()
+    today = date.today()
+    month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last = _add_months(date(today.year, today.month, 1), PARTITIONS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE contact_y{month.year}m{month.month:02d} PARTITION OF contact "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    op.execute('CREATE TABLE contact_default PARTITION OF contact DEFAULT')
+
+    op.execute(f'INSERT INTO contact ({COLUMNS}) SELECT {COLUMNS} FROM contact_unpartitioned')
+    op.execute('DROP TABLE contact_unpartitioned')
+
+    _create_indexes()
+    op.execute('ANALYZE contact')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER TABLE contact RENAME TO contact_partitioned')
+    op.execute('ALTER SEQUENCE contact_id_seq OWNED BY NONE')
+    _drop_indexes()
+
+    op.execute(f"""
+        CREATE TABLE contact (
+            id integer NOT NULL DEFAULT nextval('contact_id_seq'),
+            creation_date timestamp without time zone,
+            sending_date timestamp without time zone,
+            send boolean,
+            name varchar,
+            email varchar,
+            message varchar,
+            attempts integer NOT NULL DEFAULT 0,
+            next_attempt_date timestamp without time zone,
+            last_error varchar,
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED,
+            language_id integer REFERENCES language (id)
+        )
+    """)
+    op.execute(f'INSERT INTO contact ({COLUMNS}) SELECT {COLUMNS} FROM contact_partitioned')
+    # drops the partitions as well
+    op.execute('DROP TABLE contact_partitioned')
+    op.execute('ALTER TABLE contact ADD CONSTRAINT contact_pkey PRIMARY KEY (id)')
+    op.execute('ALTER SEQUENCE contact_id_seq OWNED BY contact.id')
+
+    _create_indexes()
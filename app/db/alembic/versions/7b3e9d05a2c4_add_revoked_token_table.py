@@ -0,0 +1,55 @@
+"""Add revoked token table
+
+Revision ID: 7b3e9d05a2c4
+Revises: e2a4c6b81d93
+Create Date: 2026-10-19 19:12:41.507318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import fastapi_users_db_sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d05a2c4'
+down_revision: Union[str, None] = 'e2a4c6b81d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Channel the notifications are sent to (see app.services.change_feed.CHANNEL)
+CHANNEL = 'table_changed'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revoked_token',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(), nullable=True),
+    sa.Column('revocation_date', sa.DateTime(), nullable=False),
+    sa.Column('expiry_date', sa.DateTime(), nullable=False),
+    sa.Column('user_id', fastapi_users_db_sqlalchemy.generics.GUID(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    op.create_index(op.f('ix_revoked_token_expiry_date'), 'revoked_token', ['expiry_date'], unique=False)
+    op.create_index(op.f('ix_revoked_token_user_id'), 'revoked_token', ['user_id'], unique=False)
+
+    # Lets every worker reload the revocation list right away (see
+    # app.services.token_revocation); uses the function created in revision 9a96b1b326c8
+    op.execute(
+        'CREATE TRIGGER revoked_token_notify_change '
+        'AFTER INSERT ON revoked_token '
+        f"FOR EACH ROW EXECUTE FUNCTION notify_table_change('{CHANNEL}')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS revoked_token_notify_change ON revoked_token')
+    op.drop_index(op.f('ix_revoked_token_user_id'), table_name='revoked_token')
+    op.drop_index(op.f('ix_revoked_token_expiry_date'), table_name='revoked_token')
+    op.drop_table('revoked_token')
@@ -0,0 +1,30 @@
+"""Add original sha256 to image
+
+Revision ID: 8e2f4b7d1c95
+Revises: 4d8a1f6c3b27
+Create Date: 2026-10-19 22:37:05.402916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4b7d1c95'
+down_revision: Union[str, None] = '4d8a1f6c3b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('image', sa.Column('original_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_image_original_sha256'), 'image', ['original_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_image_original_sha256'), table_name='image')
+    op.drop_column('image', 'original_sha256')
@@ -0,0 +1,96 @@
+"""Add change notification triggers
+
+Revision ID: 9a96b1b326c8
+Revises: 360a3741ebcb
+Create Date: 2026-10-19 14:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a96b1b326c8'
+down_revision: Union[str, None] = '360a3741ebcb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Channel the notifications are sent to (see app.services.change_feed.CHANNEL)
+CHANNEL = 'table_changed'
+
+# Content, translation and lookup tables whose changes are published
+TABLES = [
+    'address',
+    'category',
+    'category_translation',
+    'education',
+    'education_translation',
+    'experience',
+    'experience_translation',
+    'expertise',
+    'expertise_translation',
+    'image',
+    'image_variant',
+    'institution',
+    'institution_translation',
+    'language',
+    'page',
+    'page_translation',
+    'personal_details',
+    'personal_details_translation',
+    'personal_information',
+    'personal_information_translation',
+    'social_media',
+    'work',
+    'work_category',
+    'work_translation',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Publishes {"table", "op", "id"} for every changed row; the id is null for TRUNCATE and
+    # for tables without an id column. Notifications are delivered on commit only.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_table_change() RETURNS trigger AS $$
+        DECLARE
+            row_id text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_id := to_jsonb(OLD) ->> 'id';
+            ELSIF TG_OP IN ('INSERT', 'UPDATE') THEN
+                row_id := to_jsonb(NEW) ->> 'id';
+            END IF;
+
+            PERFORM pg_notify(
+                TG_ARGV[0],
+                json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_id)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for table in TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_change "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION notify_table_change('{CHANNEL}')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_truncate "
+            f"AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change('{CHANNEL}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_truncate ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}")
+
+    op.execute("DROP FUNCTION IF EXISTS notify_table_change()")
@@ -0,0 +1,43 @@
+"""Add delivery state to contact
+
+Revision ID: c3f1a9d27e44
+Revises: 9a96b1b326c8
+Create Date: 2026-10-19 15:21:09.871342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a9d27e44'
+down_revision: Union[str, None] = '9a96b1b326c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contact', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('contact', sa.Column('next_attempt_date', sa.DateTime(), nullable=True))
+    op.add_column('contact', sa.Column('last_error', sa.String(), nullable=True))
+    op.create_index(
+        'ix_contact_outbox', 'contact', ['next_attempt_date'], unique=False,
+        postgresql_where=sa.text('send = false AND next_attempt_date IS NOT NULL'),
+    )
+
+    # Contacts stored so far are not queued (next_attempt_date stays NULL), so the outbox does not
+    # mail the whole past inbox including spam; queue them explicitly if wanted with
+    # `python -m app.jobs.contact_outbox --requeue-since <date>`
+    op.execute("UPDATE contact SET send = false WHERE send IS NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contact_outbox', table_name='contact',
+                  postgresql_where=sa.text('send = false AND next_attempt_date IS NOT NULL'))
+    op.drop_column('contact', 'last_error')
+    op.drop_column('contact', 'next_attempt_date')
+    op.drop_column('contact', 'attempts')
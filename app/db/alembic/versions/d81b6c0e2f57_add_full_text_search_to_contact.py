@@ -0,0 +1,43 @@
+"""Add full text search to contact
+
+Revision ID: d81b6c0e2f57
+Revises: c3f1a9d27e44
+Create Date: 2026-10-19 16:48:12.305981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81b6c0e2f57'
+down_revision: Union[str, None] = 'c3f1a9d27e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contact', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(message, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_contact_search_vector', 'contact', ['search_vector'], unique=False,
+                    postgresql_using='gin')
+    op.create_index(op.f('ix_contact_creation_date'), 'contact', ['creation_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contact_creation_date'), table_name='contact')
+    op.drop_index('ix_contact_search_vector', table_name='contact', postgresql_using='gin')
+    op.drop_column('contact', 'search_vector')
@@ -0,0 +1,44 @@
+"""Add change notification trigger to user
+
+Revision ID: e2a4c6b81d93
+Revises: 5f0c7e93a1b8
+Create Date: 2026-10-19 18:27:03.640172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4c6b81d93'
+down_revision: Union[str, None] = '5f0c7e93a1b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Channel the notifications are sent to (see app.services.change_feed.CHANNEL)
+CHANNEL = 'table_changed'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Evicts cached superusers on every worker (see app.services.user.get_current_superuser);
+    # uses the function created in revision 9a96b1b326c8
+    op.execute(
+        'CREATE TRIGGER user_notify_change '
+        'AFTER UPDATE OR DELETE ON "user" '
+        f"FOR EACH ROW EXECUTE FUNCTION notify_table_change('{CHANNEL}')"
+    )
+    op.execute(
+        'CREATE TRIGGER user_notify_truncate '
+        'AFTER TRUNCATE ON "user" '
+        f"FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change('{CHANNEL}')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS user_notify_truncate ON "user"')
+    op.execute('DROP TRIGGER IF EXISTS user_notify_change ON "user"')
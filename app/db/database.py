@@ -10,6 +10,8 @@ Main features:
 - Creates the engine from configuration.
 - Exposes a scoped SessionLocal for request-scoped DB sessions.
 - Provides the Base declarative class for model definitions.
+- Instruments the engine to account statements to requests (see app/db/instrumentation.py)
+  and, in strict mode, makes lazy loads raise.
 """
 
 # Import external dependencies
@@ -20,10 +22,14 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 
 # Import internal dependencies
 from app.core import config
+from app.db import instrumentation
 
 
 # Create database engine and connect to configured db string
-engine = create_async_engine(config.DB_CONNECTION)
+engine = create_async_engine(config.DB_CONNECTION, poolclass=instrumentation.TimedQueuePool)
+instrumentation.instrument(engine.sync_engine)
+if config.SQL_STRICT_MODE:
+    instrumentation.enable_strict_loading()
 async_session_maker = sessionmaker(
     autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
 
@@ -0,0 +1,164 @@
+"""
+Database instrumentation
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module hooks into the cursor events of the SQLAlchemy engine (see app/db/database.py)
+and accounts every executed statement to the request that issued it. A request opts in by
+calling `start_request`, which puts a `RequestStats` into a context variable; statements
+executed outside of such a request (jobs, background workers) are not accounted.
+
+Observers registered with `on_statement` are called with every executed statement and its
+duration (see app/services/slow_queries.py).
+
+`TimedQueuePool`, the connection pool of the engine, reports how long every checkout took
+to the observers registered with `on_pool_wait` (see app/services/metrics.py).
+
+`enable_strict_loading` makes every lazy load that would emit SQL raise instead, for CI and
+development (see app/services/query_budget.py).
+
+SQLAlchemy runs the driver calls of the async engine in greenlets that share the context of
+the calling task, so the statements of a request are attributed to it even under
+concurrency.
+"""
+
+# Import external dependencies
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class RequestStats:
+    """
+    Database usage of a request.
+
+    Attributes:
+        statements (int): Number of executed statements.
+        db_time (float): Time spent executing them (including the round trips), in seconds.
+    """
+    statements: int = 0
+    db_time: float = 0.0
+
+
+_stats: ContextVar[RequestStats | None] = ContextVar("db_request_stats", default=None)
+
+
+def start_request() -> tuple[RequestStats, Token]:
+    """
+    Account the statements of the current context to a new `RequestStats`.
+
+    Returns:
+        tuple[RequestStats, Token]: The stats and the token to pass to `end_request`.
+    """
+    stats = RequestStats()
+    return stats, _stats.set(stats)
+
+
+def end_request(token: Token):
+    """
+    Stop accounting statements to the stats created by `start_request`.
+    """
+    _stats.reset(token)
+
+
+def current() -> RequestStats | None:
+    """
+    Return the stats of the current request, if it is accounted.
+    """
+    return _stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._instrumentation_start = time.perf_counter()
+
+
+# Called with the statement, its parameters, whether it was an executemany and its duration
+_statement_observers: list[Callable[[str, object, bool, float], None]] = []
+
+
+def on_statement(observer: Callable[[str, object, bool, float], None]):
+    """
+    Call an observer after every executed statement.
+
+    Args:
+        observer (Callable): Non-blocking callback receiving the statement (as sent to the
+            driver), its parameters, whether it was an executemany and its duration in seconds.
+    """
+    _statement_observers.append(observer)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_instrumentation_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+
+    for observer in _statement_observers:
+        observer(statement, parameters, executemany, elapsed)
+
+    stats = _stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += elapsed
+
+
+def instrument(engine: Engine):
+    """
+    Register the cursor event hooks on an engine (the `sync_engine` of an async engine).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+_pool_wait_observers: list[Callable[[float], None]] = []
+
+
+def on_pool_wait(observer: Callable[[float], None]):
+    """
+    Call an observer with the duration in seconds of every connection checkout.
+
+    Args:
+        observer (Callable[[float], None]): Non-blocking callback.
+    """
+    _pool_wait_observers.append(observer)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool measuring how long checkouts take, i.e. the time waiting for a free connection
+    (or opening a new one).
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            for observer in _pool_wait_observers:
+                observer(elapsed)
+
+
+def _raise_on_lazy_load(state: ORMExecuteState):
+    # explicit loader options of the query take precedence over the wildcard
+    if state.is_select and not state.is_relationship_load and not state.is_column_load:
+        state.statement = state.statement.options(raiseload("*", sql_only=True))
+
+
+def enable_strict_loading(session_class: type[Session] = Session):
+    """
+    Make lazy loads of relationships that would emit SQL raise in all sessions of a class.
+
+    Relationships loaded by the query (e.g. `selectinload`), set by hand or found in the
+    identity map are not affected.
+    """
+    if not event.contains(session_class, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(session_class, "do_orm_execute", _raise_on_lazy_load)
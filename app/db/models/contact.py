@@ -7,11 +7,25 @@ This module defines the Contact SQLAlchemy model which represents contact inquir
 submitted via the website's contact form. Contact records store sender information,
 message content, timestamps and the language association. These records are persisted
 and can be queried by the API to display or process incoming inquiries.
+
+Stored contacts form an outbox: the contact outbox worker (app/services/contact_outbox.py)
+delivers every unsent contact whose `next_attempt_date` is due by mail and reschedules
+failed deliveries with exponential backoff.
+
+The table is partitioned by month on `creation_date` (partitions `contact_yYYYYmMM` plus
+`contact_default`); the retention job (app/jobs/contact_retention.py) creates upcoming
+partitions and drops expired ones, so old contacts are removed without large DELETEs.
+As the partition key has to be part of the primary key, it is (`id`, `creation_date`).
+
+`search_vector` is a generated full-text search column over name, email and message used by
+the admin inbox search. It uses the 'simple' configuration (no stemming), as the messages
+are written in several languages.
 """
 
 # Import external dependencies
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, Computed, DateTime, Index, Integer, String, ForeignKey, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 # Import internal dependencies
 from app.db.database import Base
@@ -26,33 +40,65 @@ class Contact(Base):
     Represents a contact inquiry submitted through the website contact form.
 
     Attributes:
-        id (int): Primary key.
-        creation_date (datetime): Timestamp when the entry was created.
+        id (int): Primary key (together with `creation_date`).
+        creation_date (datetime): Timestamp when the entry was created (partition key).
         sending_date (datetime | None): Timestamp when the message was sent/processed.
         send (bool): Flag indicating whether the message has been sent or processed.
         name (str): Sender's name.
         email (str): Sender's email address.
         message (str): The message body.
+        attempts (int): Number of delivery attempts made so far.
+        next_attempt_date (datetime | None): Timestamp from which the next delivery attempt is due;
+            None once the message was sent or delivery was given up.
+        last_error (str | None): Error of the last failed delivery attempt.
+        search_vector (str): Generated full-text search document (not loaded by default).
         language_id (int): Foreign key referencing Language for localization.
 
     Relationships:
         language: Relationship to the Language model (contact.language).
     """
 
-    # Primary key
-    id = Column(Integer, primary_key=True)
+    # Primary key (including the partition key)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    creation_date = Column(DateTime, primary_key=True, nullable=False, index=True)
 
     # Content
-    creation_date = Column(DateTime)
     sending_date = Column(DateTime)
     send = Column(Boolean)
     name = Column(String)
     email = Column(String)
     message = Column(String)
 
+    # Delivery state
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_date = Column(DateTime)
+    last_error = Column(String)
+
+    # Full-text search document, maintained by the database
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(message, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
     # Foreign keys
     language_id = Column(Integer, ForeignKey("language.id"))
 
     # Establishing relationships
     language = relationship(
         "Language", back_populates="contact")
+
+    # Due deliveries are looked up by the outbox worker on every poll; the inbox search uses
+    # the GIN index
+    __table_args__ = (
+        Index("ix_contact_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_contact_outbox",
+            "next_attempt_date",
+            postgresql_where=text("send = false AND next_attempt_date IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (creation_date)"},
+    )
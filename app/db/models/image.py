@@ -14,6 +14,7 @@ from sqlalchemy.orm import relationship
 # Import internal dependencies
 from app.db.database import Base
 from app.db.models.personal_details import PersonalDetails
+from app.db.models.image_variant import ImageVariant
 
 
 class Image(Base):
@@ -28,10 +29,19 @@ class Image(Base):
         id (int): Primary key.
         filename (str): Unique filename identifier.
         filepath (str): Absolute or relative file path on disk.
+        sha256 (str): Hex encoded SHA-256 digest of the file content.
+        original_sha256 (str): Digest of the uploaded content if the file was re-encoded since
+            (see app/jobs/optimize_images.py), so published hash URLs keep resolving.
+        size (int): File size in bytes.
+        mime_type (str): MIME type of the file (e.g. 'image/png').
+        width (int): Width in pixels (after applying the EXIF orientation).
+        height (int): Height in pixels (after applying the EXIF orientation).
+        placeholder (str): Tiny base64 encoded preview (data URI) used as low-quality placeholder.
 
     Relationships:
         work: referenced as a thumbnail for Work.
         personal_details: referenced as profile picture.
+        variants: resized renditions of the image (ImageVariant).
     """
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -39,6 +49,13 @@ class Image(Base):
     # Content
     filename = Column(String, nullable=False, unique=True)
     filepath = Column(String, nullable=False)
+    sha256 = Column(String(64), unique=True, index=True)
+    original_sha256 = Column(String(64), index=True)
+    size = Column(Integer)
+    mime_type = Column(String)
+    width = Column(Integer)
+    height = Column(Integer)
+    placeholder = Column(String)
 
     # Establishing relationships
     work = relationship(
@@ -47,3 +64,6 @@ class Image(Base):
     personal_details = relationship(
         "PersonalDetails", back_populates="profile_picture", uselist=False
     )
+    variants = relationship(
+        "ImageVariant", back_populates="image"
+    )
@@ -0,0 +1,57 @@
+"""
+ImageVariant DB model for FastAPI
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module defines the ImageVariant model representing a resized rendition of an Image.
+Variants are rendered once at ingest time for the configured widths and are used by the
+frontend to build responsive `srcset` attributes.
+"""
+
+# Import external dependencies
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.orm import relationship
+
+# Import internal dependencies
+from app.db.database import Base
+
+
+class ImageVariant(Base):
+    __tablename__ = "image_variant"
+
+    """
+    Database object: ImageVariant
+
+    Represents a resized rendition of an image stored content-addressed on disk.
+
+    Attributes:
+        id (int): Primary key.
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+        filepath (str): Absolute or relative file path on disk.
+        sha256 (str): Hex encoded SHA-256 digest of the file content.
+        size (int): File size in bytes.
+        mime_type (str): MIME type of the file.
+        image_id (int): FK to the original Image.
+
+    Relationships:
+        image: the original Image this variant was rendered from.
+    """
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    # Content
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    filepath = Column(String, nullable=False)
+    # Not unique: identical variants of different originals share one file
+    sha256 = Column(String(64), nullable=False, index=True)
+    size = Column(Integer)
+    mime_type = Column(String)
+
+    # Foreign keys
+    image_id = Column(Integer, ForeignKey("image.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Establishing relationships
+    image = relationship(
+        "Image", back_populates="variants")
@@ -0,0 +1,49 @@
+"""
+RevokedToken DB model for FastAPI
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module defines the RevokedToken model, the revocation list of the JWTs issued by the
+authentication backend. It is the source of truth for app/services/token_revocation.py,
+which keeps the unexpired revocations of the table in memory on every worker.
+
+A row either revokes a single token (`jti` set, e.g. on logout) or every token of a user
+issued before `revocation_date` (`jti` null, e.g. after a password change or a demotion).
+A row is useless once every token it revokes has expired, i.e. after `expiry_date`, and is
+then deleted.
+"""
+
+# Import external dependencies
+from fastapi_users_db_sqlalchemy.generics import GUID
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+# Import internal dependencies
+from app.db.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_token"
+
+    """
+    Database object: RevokedToken
+
+    Represents the revocation of one token or of all tokens of a user.
+
+    Attributes:
+        id (int): Primary key.
+        jti (str | None): ID of the revoked token; None to revoke all tokens of the user
+            issued before `revocation_date`.
+        user_id (uuid.UUID): FK to the user the tokens were issued to.
+        revocation_date (datetime): Timestamp of the revocation (naive UTC).
+        expiry_date (datetime): Timestamp after which every revoked token has expired (naive UTC).
+    """
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    # Content
+    jti = Column(String, unique=True)
+    revocation_date = Column(DateTime, nullable=False)
+    expiry_date = Column(DateTime, nullable=False, index=True)
+
+    # Foreign keys
+    user_id = Column(GUID, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
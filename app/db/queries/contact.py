@@ -11,12 +11,16 @@ Main features:
 - Persist contact inquiries to the database.
 - Resolve and validate language association by ISO639-1 code.
 - Provide a simple, reusable API for other services/routes to save contact messages.
+- Search the inbox with filters and full-text search (`search_vector`, GIN index).
+- Insert queued contacts in batches (write-behind mode).
+- Claim due contacts for delivery and record the delivery outcome (contact outbox).
 """
 
 # Import external dependencies
-from sqlalchemy import select
+from sqlalchemy import cast, func, insert, select, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 # Import internal dependencies
 from app.db.models.contact import Contact
@@ -59,6 +63,70 @@ async def get_contacts(lang: str, db: AsyncSession):
     return mapped_results
 
 
+async def search_contacts(
+    db: AsyncSession,
+    query: str | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    send: bool | None = None,
+    language: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> list[Contact]:
+    """
+    Search contacts by text, creation date, delivery status and language.
+
+    The text is matched with `websearch_to_tsquery` (quoted phrases, `or`, `-word`) against
+    the generated `search_vector` column, so the GIN index is used; results are ordered by
+    relevance (matches in name and email weigh more than in the message) and then by
+    creation date. Without a text, the newest contacts come first (B-tree on `creation_date`).
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+        query (str | None): Full-text search over name, email and message.
+        date_from (datetime | None): Earliest creation date (naive UTC, inclusive).
+        date_to (datetime | None): Latest creation date (naive UTC, exclusive).
+        send (bool | None): Only delivered (True) or undelivered (False) contacts.
+        language (str | None): ISO 639-1 code of the contact language.
+        limit (int): Maximum number of contacts.
+        offset (int): Number of contacts to skip.
+
+    Returns:
+        list[Contact]: Matching contacts with the language name attached as `lang`.
+    """
+    statement = select(Contact, Language.name).outerjoin(Language, Contact.language_id == Language.id)
+
+    if date_from is not None:
+        statement = statement.where(Contact.creation_date >= date_from)
+    if date_to is not None:
+        statement = statement.where(Contact.creation_date < date_to)
+    if send is not None:
+        statement = statement.where(Contact.send.is_(send))
+    if language is not None:
+        statement = statement.where(Language.iso639_1 == language)
+
+    if query:
+        # same text search configuration as the generated column
+        tsquery = func.websearch_to_tsquery(cast("simple", REGCONFIG), query)
+        statement = (
+            statement
+            .where(Contact.search_vector.op("@@")(tsquery))
+            .order_by(func.ts_rank(Contact.search_vector, tsquery).desc(), Contact.creation_date.desc())
+        )
+    else:
+        statement = statement.order_by(Contact.creation_date.desc())
+
+    result = await db.execute(statement.order_by(Contact.id.desc()).limit(limit).offset(offset))
+
+    # Map the additional fields to the Contact object
+    mapped_results = []
+    for contact, name in result.all():
+        contact.lang = name
+        mapped_results.append(contact)
+
+    return mapped_results
+
+
 async def save_contact(contact: SendingContact, db: AsyncSession, lang: str) -> Contact:
     """
     Save a new contact to the database (async).
@@ -88,6 +156,8 @@ async def save_contact(contact: SendingContact, db: AsyncSession, lang: str) ->
             message=contact.message,
             creation_date=naive_utc_now,
             send=False,
+            attempts=0,
+            next_attempt_date=naive_utc_now,
             language_id=language.id
         )
         db.add(new_contact)
@@ -98,3 +168,146 @@ async def save_contact(contact: SendingContact, db: AsyncSession, lang: str) ->
         await db.rollback()
         raise ValueError(f"Validation or DB error: {e}")
 
+
+async def insert_contacts(contacts: list[dict], db: AsyncSession):
+    """
+    Insert several contacts with a single multi-row statement and commit.
+
+    Args:
+        contacts (list[dict]): Column values of the contacts (`name`, `email`, `message`,
+            `creation_date`, `send`, `attempts`, `next_attempt_date`, `language_id`).
+        db (AsyncSession): The async database session.
+    """
+    try:
+        # executemany style: SQLAlchemy sends the rows as batched multi-row INSERTs
+        await db.execute(insert(Contact), contacts)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+
+def _utcnow() -> datetime:
+    # naive UTC, as the date columns are TIMESTAMP WITHOUT TIME ZONE
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def claim_due_contacts(db: AsyncSession, limit: int, lease: timedelta) -> list[dict]:
+    """
+    Claim unsent contacts whose next delivery attempt is due.
+
+    The due rows are locked with `FOR UPDATE SKIP LOCKED`, so concurrent workers claim
+    disjoint batches, and their `next_attempt_date` is moved `lease` into the future before
+    the transaction is committed. Claimed contacts are therefore invisible to other workers
+    while they are being delivered, without holding a transaction open during delivery; if
+    the worker dies, they become due again once the lease has expired.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+        limit (int): Maximum number of contacts to claim.
+        lease (timedelta): Time the claimed contacts are reserved for this worker.
+
+    Returns:
+        list[dict]: The claimed contacts with `id`, `name`, `email`, `message`,
+        `creation_date`, `attempts` (including the current attempt) and `lang`.
+    """
+    now = _utcnow()
+    due = (
+        select(Contact.id)
+        .where(Contact.send.is_(False), Contact.next_attempt_date <= now)
+        .order_by(Contact.next_attempt_date)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = (
+        update(Contact)
+        .where(Contact.id.in_(due))
+        .values(attempts=Contact.attempts + 1, next_attempt_date=now + lease)
+        .returning(
+            Contact.id, Contact.name, Contact.email, Contact.message,
+            Contact.creation_date, Contact.attempts, Contact.language_id,
+        )
+        .cte("claimed")
+    )
+
+    result = await db.execute(
+        select(claimed, Language.iso639_1)
+        .outerjoin(Language, claimed.c.language_id == Language.id)
+        .order_by(claimed.c.id)
+    )
+    contacts = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "email": row.email,
+            "message": row.message,
+            "creation_date": row.creation_date,
+            "attempts": row.attempts,
+            "lang": row.iso639_1,
+        }
+        for row in result.all()
+    ]
+    await db.commit()
+
+    return contacts
+
+
+async def requeue_contacts(since: datetime, db: AsyncSession) -> int:
+    """
+    Queue unsent contacts that were never queued for delivery (e.g. stored before the outbox existed).
+
+    Contacts the outbox gave up on keep their state.
+
+    Args:
+        since (datetime): Only contacts created at or after this naive UTC timestamp are queued.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        int: Number of queued contacts.
+    """
+    result = await db.execute(
+        update(Contact)
+        .where(
+            Contact.send.is_(False),
+            Contact.next_attempt_date.is_(None),
+            Contact.attempts == 0,
+            Contact.creation_date >= since,
+        )
+        .values(next_attempt_date=_utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def mark_contact_sent(contact_id: int, db: AsyncSession):
+    """
+    Record the successful delivery of a contact.
+
+    Args:
+        contact_id (int): ID of the contact.
+        db (AsyncSession): SQLAlchemy async database session.
+    """
+    await db.execute(
+        update(Contact)
+        .where(Contact.id == contact_id)
+        .values(send=True, sending_date=_utcnow(), next_attempt_date=None, last_error=None)
+    )
+    await db.commit()
+
+
+async def mark_contact_failed(contact_id: int, error: str, retry_at: datetime | None, db: AsyncSession):
+    """
+    Record a failed delivery attempt of a contact.
+
+    Args:
+        contact_id (int): ID of the contact.
+        error (str): Description of the error.
+        retry_at (datetime | None): Naive UTC timestamp of the next attempt, or None to give up.
+        db (AsyncSession): SQLAlchemy async database session.
+    """
+    await db.execute(
+        update(Contact)
+        .where(Contact.id == contact_id)
+        .values(last_error=error, next_attempt_date=retry_at)
+    )
+    await db.commit()
@@ -0,0 +1,167 @@
+"""
+Contact partition maintenance queries
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+The `contact` table is partitioned by month on `creation_date`. This module lists, creates
+and drops its monthly partitions, which are named `contact_yYYYYmMM` (e.g. `contact_y2026m10`
+holds the contacts created in October 2026). Dropping a partition is a metadata operation,
+unlike deleting its rows. Contacts outside of all monthly partitions end up in the default
+partition `contact_default`.
+"""
+
+# Import external dependencies
+import re
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+PARTITION_NAME = re.compile(r"^contact_y(\d{4})m(\d{2})$")
+
+DEFAULT_PARTITION = "contact_default"
+
+# Columns copied when moving contacts between partitions (search_vector is generated)
+COLUMNS = (
+    "id, creation_date, sending_date, send, name, email, message, attempts, next_attempt_date, "
+    "last_error, language_id"
+)
+
+# Contacts still waiting for delivery
+PENDING = "send = false AND next_attempt_date IS NOT NULL"
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Return the first day of the month `months` months after the month of `month`.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    Return the name of the partition holding the contacts of a month.
+    """
+    return f"contact_y{month.year}m{month.month:02d}"
+
+
+async def get_contact_partitions(db: AsyncSession) -> list[tuple[str, date]]:
+    """
+    List the monthly partitions of the contact table.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[tuple[str, date]]: Name and first day of the month of every monthly partition,
+        oldest first (the default partition is not included).
+    """
+    result = await db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'contact'::regclass"
+    ))
+
+    partitions = []
+    for (name,) in result.all():
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def create_contact_partition(month: date, db: AsyncSession):
+    """
+    Create the partition of a month, unless it exists.
+
+    Postgres refuses to create a partition while the default partition holds rows of its
+    range. In that case the default partition is detached, the partition created, the
+    contacts of the month moved over and the default partition attached again, all in one
+    transaction.
+
+    Args:
+        month (date): Any day of the month.
+        db (AsyncSession): SQLAlchemy async database session.
+    """
+    start = date(month.year, month.month, 1)
+    name = partition_name(start)
+    in_range = f"creation_date >= '{start.isoformat()}' AND creation_date < '{add_months(start, 1).isoformat()}'"
+
+    result = await db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"))
+    move = result.scalar()
+
+    try:
+        if move:
+            await db.execute(text(f"ALTER TABLE contact DETACH PARTITION {DEFAULT_PARTITION}"))
+
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF contact "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+        ))
+
+        if move:
+            await db.execute(text(
+                f"INSERT INTO {name} ({COLUMNS}) SELECT {COLUMNS} FROM {DEFAULT_PARTITION} WHERE {in_range}"
+            ))
+            await db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+            await db.execute(text(f"ALTER TABLE contact ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+
+async def count_pending_contacts(name: str, db: AsyncSession) -> int:
+    """
+    Count the contacts of a partition that are still waiting for delivery.
+
+    Args:
+        name (str): Name of a monthly partition.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        int: Number of unsent contacts with a scheduled delivery attempt.
+    """
+    if not PARTITION_NAME.match(name):
+        raise ValueError(f"'{name}' is not a contact partition")
+
+    result = await db.execute(text(f"SELECT count(*) FROM {name} WHERE {PENDING}"))
+    return result.scalar_one()
+
+
+async def delete_expired_default_contacts(before: date, db: AsyncSession) -> int:
+    """
+    Delete the contacts in the default partition created before a date.
+
+    Contacts still waiting for delivery are kept.
+
+    Args:
+        before (date): Contacts created before this day are deleted.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        int: Number of deleted contacts.
+    """
+    result = await db.execute(text(
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE creation_date < :before AND NOT ({PENDING})"
+    ), {"before": before})
+    await db.commit()
+    return result.rowcount
+
+
+async def drop_contact_partition(name: str, db: AsyncSession):
+    """
+    Detach a monthly partition from the contact table and drop it.
+
+    Args:
+        name (str): Name of a monthly partition.
+        db (AsyncSession): SQLAlchemy async database session.
+    """
+    if not PARTITION_NAME.match(name):
+        raise ValueError(f"'{name}' is not a contact partition")
+
+    await db.execute(text(f"ALTER TABLE contact DETACH PARTITION {name}"))
+    await db.execute(text(f"DROP TABLE {name}"))
+    await db.commit()
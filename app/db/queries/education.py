@@ -10,7 +10,7 @@ instances for API consumption.
 """
 
 # Import external dependencies
-from sqlalchemy import select, or_
+from sqlalchemy import and_, select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import internal dependencies
@@ -150,6 +150,76 @@ async def get_educations(lang: str, db: AsyncSession):
     return mapped_results
 
 
+async def get_educations_all_languages(db: AsyncSession):
+    """
+    Retrieve education entries with the localized fields of all languages.
+
+    All translation rows are joined instead of being filtered by language, so a single query
+    returns every language; the rows are folded per education in Python. The university name
+    is joined in the language of the education translation of the same row.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[dict]: Educations as plain dicts with `translations` (course_of_study and
+        description keyed by ISO 639-1 code) and the university with its own `translations`.
+    """
+    result = await db.execute(
+        select(
+            Education,
+            Language.iso639_1,
+            EducationTranslation.course_of_study,
+            EducationTranslation.description,
+            Institution,
+            Address,
+            InstitutionTranslation.name.label("university_name")
+        )
+        .join(Education.translations)
+        .join(Language, Language.id == EducationTranslation.language_id)
+        .outerjoin(Education.university)
+        .outerjoin(Institution.address)
+        .outerjoin(
+            InstitutionTranslation,
+            and_(
+                InstitutionTranslation.institution_id == Education.institution_id,
+                InstitutionTranslation.language_id == EducationTranslation.language_id,
+            )
+        )
+    )
+
+    education_map: dict[int, dict] = {}
+    for (
+        edu,
+        code,
+        course_of_study,
+        description,
+        university,
+        address,
+        university_name,
+    ) in result.all():
+        if edu.id not in education_map:
+            education_map[edu.id] = {
+                "id": edu.id,
+                "degree": edu.degree,
+                "grade": edu.grade,
+                "start_date": edu.start_date,
+                "end_date": edu.end_date,
+                "university": (
+                    {"id": university.id, "address": address, "translations": {}}
+                    if university is not None else None
+                ),
+                "translations": {},
+            }
+
+        entry = education_map[edu.id]
+        entry["translations"][code] = {"course_of_study": course_of_study, "description": description}
+        if university_name is not None:
+            entry["university"]["translations"][code] = {"name": university_name}
+
+    return list(education_map.values())
+
+
 async def create_education(lang: str, db: AsyncSession, *,
                            start_date=None, end_date=None, degree=None, grade=None,
                            institution_id=None, course_of_study=None, description=None):
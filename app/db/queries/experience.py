@@ -10,7 +10,7 @@ so they can be returned directly by the API.
 """
 
 # Import external dependencies
-from sqlalchemy import select, or_
+from sqlalchemy import and_, select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import internal dependencies
@@ -160,6 +160,84 @@ async def get_experiences(lang: str, db: AsyncSession):
     return mapped_results
 
 
+async def get_experiences_all_languages(db: AsyncSession):
+    """
+    Retrieve experience entries with the localized fields of all languages.
+
+    All translation rows are joined instead of being filtered by language, so a single query
+    returns every language; the rows are folded per experience in Python. The company name
+    is joined in the language of the experience translation of the same row.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[dict]: Experiences as plain dicts with `translations` (title, extract, description
+        and industry keyed by ISO 639-1 code) and the company with its own `translations`.
+    """
+    result = await db.execute(
+        select(
+            Experience,
+            Language.iso639_1,
+            ExperienceTranslation.title,
+            ExperienceTranslation.extract,
+            ExperienceTranslation.description,
+            ExperienceTranslation.industry,
+            Institution,
+            Address,
+            InstitutionTranslation.name.label("company_name"),
+        )
+        .join(Experience.translations)
+        .join(Language, Language.id == ExperienceTranslation.language_id)
+        .outerjoin(Experience.company)
+        .outerjoin(Institution.address)
+        .outerjoin(
+            InstitutionTranslation,
+            and_(
+                InstitutionTranslation.institution_id == Experience.institution_id,
+                InstitutionTranslation.language_id == ExperienceTranslation.language_id,
+            )
+        )
+    )
+
+    experience_map: dict[int, dict] = {}
+    for (
+        exp,
+        code,
+        title,
+        extract,
+        description,
+        industry,
+        company,
+        address,
+        company_name,
+    ) in result.all():
+        if exp.id not in experience_map:
+            experience_map[exp.id] = {
+                "id": exp.id,
+                "url": exp.url,
+                "start_date": exp.start_date,
+                "end_date": exp.end_date,
+                "company": (
+                    {"id": company.id, "address": address, "translations": {}}
+                    if company is not None else None
+                ),
+                "translations": {},
+            }
+
+        entry = experience_map[exp.id]
+        entry["translations"][code] = {
+            "title": title,
+            "extract": extract,
+            "description": description,
+            "industry": industry,
+        }
+        if company_name is not None:
+            entry["company"]["translations"][code] = {"name": company_name}
+
+    return list(experience_map.values())
+
+
 async def create_experience(lang: str, db: AsyncSession, *,
                             title=None, extract=None, description=None, industry=None, url=None,
                            start_date=None, end_date=None, institution_id=None):
@@ -96,6 +96,45 @@ async def get_expertises(lang: str, db: AsyncSession):
     return mapped_results
 
 
+async def get_expertises_all_languages(db: AsyncSession):
+    """
+    Retrieve expertise entries with the localized fields of all languages.
+
+    All translation rows are joined instead of being filtered by language, so a single query
+    returns every language; the rows are folded per expertise in Python.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[dict]: Expertises as plain dicts with `translations` (title and description keyed
+        by ISO 639-1 code).
+    """
+    result = await db.execute(
+        select(
+            Expertise,
+            Language.iso639_1,
+            ExpertiseTranslation.title,
+            ExpertiseTranslation.description
+        )
+        .join(Expertise.translations)
+        .join(Language, Language.id == ExpertiseTranslation.language_id)
+    )
+
+    expertise_map: dict[int, dict] = {}
+    for exp, code, title, description in result.all():
+        if exp.id not in expertise_map:
+            expertise_map[exp.id] = {
+                "id": exp.id,
+                "icon": exp.icon,
+                "sort": exp.sort,
+                "translations": {},
+            }
+        expertise_map[exp.id]["translations"][code] = {"title": title, "description": description}
+
+    return list(expertise_map.values())
+
+
 async def create_expertise(lang: str, db: AsyncSession, *, title=None, description=None, icon=None, sort=None):
     """
     Create a new Expertise and its localized translation for the given language.
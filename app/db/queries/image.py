@@ -3,16 +3,21 @@ Image query helpers
 
 Author: Simon Neidig <mail@simon-neidig.de>
 
-This module provides a small helper to retrieve Image model instances by their ID.
-Images are stored on disk and referenced by other entities; this helper returns the
-Image model (including filepath) so callers can serve or validate the file.
+This module provides small helpers to retrieve and create Image model instances and
+their resized variants. Images are stored on disk and referenced by other entities;
+these helpers return the Image model (including filepath) so callers can serve or
+validate the file.
 """
 
 # Import external dependencies
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
 # Import internal dependencies
 from app.db.models.image import Image
+from app.db.models.image_variant import ImageVariant
 
 
 async def get_image(image_id: int, db: AsyncSession):
@@ -28,3 +33,210 @@ async def get_image(image_id: int, db: AsyncSession):
     """
     # Use AsyncSession.get to fetch by primary key without triggering sync IO
     return await db.get(Image, image_id)
+
+
+async def get_image_by_sha256(sha256: str, db: AsyncSession):
+    """
+    Retrieve an Image by the SHA-256 digest of its content.
+
+    The digest of the uploaded content matches as well after the file has been re-encoded
+    by the optimization job, so hash URLs handed out before keep working and re-uploads of
+    the original are still deduplicated.
+
+    Args:
+        sha256 (str): Hex encoded SHA-256 digest.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        Image | None: The Image instance if found, otherwise None.
+    """
+    result = await db.execute(
+        select(Image).where(or_(Image.sha256 == sha256, Image.original_sha256 == sha256))
+    )
+    return result.scalars().first()
+
+
+async def get_image_variant_by_sha256(sha256: str, db: AsyncSession):
+    """
+    Retrieve an ImageVariant by the SHA-256 digest of its content.
+
+    Args:
+        sha256 (str): Hex encoded SHA-256 digest.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        ImageVariant | None: The ImageVariant instance if found, otherwise None.
+    """
+    result = await db.execute(select(ImageVariant).where(ImageVariant.sha256 == sha256))
+    return result.scalars().first()
+
+
+async def get_images_with_variants(image_ids: list[int], db: AsyncSession):
+    """
+    Retrieve several Images together with their variants in a single query.
+
+    The primary key index is used for all IDs at once (`id IN (...)`) and variants are
+    joined via their `image_id` index, instead of issuing one lookup per image.
+
+    Args:
+        image_ids (list[int]): The IDs of the images to retrieve.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[Image]: The found Image instances with `variants` populated (ordered by width).
+        Unknown IDs are skipped.
+    """
+    result = await db.execute(
+        select(Image)
+        .outerjoin(Image.variants)
+        .options(contains_eager(Image.variants))
+        .where(Image.id.in_(image_ids))
+        .order_by(Image.id, ImageVariant.width)
+    )
+
+    return result.unique().scalars().all()
+
+
+async def create_image(db: AsyncSession, *, filename=None, filepath=None, sha256=None, size=None, mime_type=None,
+                       width=None, height=None, placeholder=None, variants=None):
+    """
+    Create a new Image row for a stored file together with its resized variants.
+
+    `variants` is a list of dicts with the ImageVariant columns (width, height, filepath,
+    sha256, size, mime_type).
+
+    If a concurrent request stored the same content first, the unique constraint on
+    `sha256` rejects the insert and the already existing Image is returned instead.
+    Any other integrity error is raised.
+
+    Returns the newly created (or already existing) Image instance.
+    """
+    img = Image(
+        filename=filename,
+        filepath=filepath,
+        sha256=sha256,
+        size=size,
+        mime_type=mime_type,
+        width=width,
+        height=height,
+        placeholder=placeholder,
+        variants=[ImageVariant(**variant) for variant in variants or []],
+    )
+    db.add(img)
+
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        existing = await get_image_by_sha256(sha256, db)
+        if existing is None:
+            raise
+        return existing
+
+    await db.refresh(img)
+    return img
+
+
+async def get_images(db: AsyncSession):
+    """
+    Retrieve all Images.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[Image]: All Image instances ordered by ID.
+    """
+    result = await db.execute(select(Image).order_by(Image.id))
+    return result.scalars().all()
+
+
+async def replace_image_file(image_id: int, old_filepath: str, db: AsyncSession, **values) -> bool:
+    """
+    Point an Image to a new file and update the stored file metadata in one statement.
+
+    The update only applies if the Image still references `old_filepath`, so a concurrent
+    change of the image is never overwritten. If the digest changes, the digest of the
+    uploaded content is kept in `original_sha256`.
+
+    Args:
+        image_id (int): The ID of the image to update.
+        old_filepath (str): The file path the image is expected to reference.
+        db (AsyncSession): SQLAlchemy async database session.
+        **values: New column values (filename, filepath, sha256, size, mime_type, ...).
+
+    Returns:
+        bool: True if the image was updated, False if it changed in the meantime.
+
+    Raises:
+        IntegrityError: If another image already stores the same content.
+    """
+    if "sha256" in values:
+        values["original_sha256"] = func.coalesce(Image.original_sha256, Image.sha256)
+
+    result = await db.execute(
+        update(Image)
+        .where(Image.id == image_id, Image.filepath == old_filepath)
+        .values(**values)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def is_file_referenced(filepath: str, db: AsyncSession) -> bool:
+    """
+    Check whether any Image or ImageVariant still references a file.
+
+    Args:
+        filepath (str): The file path to check.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        bool: True if the file is still referenced.
+    """
+    result = await db.execute(
+        select(
+            or_(
+                exists().where(Image.filepath == filepath),
+                exists().where(ImageVariant.filepath == filepath),
+            )
+        )
+    )
+    return bool(result.scalar())
+
+
+async def get_file_locations(db: AsyncSession) -> list[tuple[str, str | None]]:
+    """
+    List the distinct file locations referenced by Images and ImageVariants.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[tuple[str, str | None]]: Location and MIME type of every referenced file.
+    """
+    result = await db.execute(
+        select(Image.filepath, Image.mime_type).where(Image.filepath.is_not(None))
+        .union(select(ImageVariant.filepath, ImageVariant.mime_type))
+    )
+    return [(row.filepath, row.mime_type) for row in result.all()]
+
+
+async def relocate_file(old_filepath: str, new_filepath: str, db: AsyncSession) -> int:
+    """
+    Point all Images and ImageVariants referencing a file to its new location.
+
+    Args:
+        old_filepath (str): The current location.
+        new_filepath (str): The new location.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        int: Number of updated rows.
+    """
+    images = await db.execute(update(Image).where(Image.filepath == old_filepath).values(filepath=new_filepath))
+    variants = await db.execute(
+        update(ImageVariant).where(ImageVariant.filepath == old_filepath).values(filepath=new_filepath)
+    )
+    await db.commit()
+    return images.rowcount + variants.rowcount
@@ -99,6 +99,41 @@ async def get_institutions(lang: str, db: AsyncSession):
     return mapped_results
 
 
+async def get_institutions_all_languages(db: AsyncSession):
+    """
+    Retrieve institution entries with the localized name of all languages.
+
+    All translation rows are joined instead of being filtered by language, so a single query
+    returns every language; the rows are folded per institution in Python.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[dict]: Institutions as plain dicts with `address` and `translations` (name keyed
+        by ISO 639-1 code).
+    """
+    result = await db.execute(
+        select(
+            Institution,
+            Address,
+            Language.iso639_1,
+            InstitutionTranslation.name
+        )
+        .join(Institution.translations)
+        .join(Language, Language.id == InstitutionTranslation.language_id)
+        .outerjoin(Institution.address)
+    )
+
+    institution_map: dict[int, dict] = {}
+    for inst, address, code, name in result.all():
+        if inst.id not in institution_map:
+            institution_map[inst.id] = {"id": inst.id, "address": address, "translations": {}}
+        institution_map[inst.id]["translations"][code] = {"name": name}
+
+    return list(institution_map.values())
+
+
 async def create_institution(lang: str, db: AsyncSession, *, name=None, address_id=None):
     """
     Create a new Institution and its localized translation for the given language.
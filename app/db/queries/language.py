@@ -0,0 +1,32 @@
+"""
+Language query helpers
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Query helpers for the languages content is available in. They are used by the language
+negotiation in `app.services.i18n` and return plain values instead of Language instances.
+"""
+
+# Import external dependencies
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Import internal dependencies
+from app.db.models.language import Language
+
+
+async def get_language_ids(db: AsyncSession) -> dict[str, int]:
+    """
+    Retrieve the IDs of all languages keyed by their ISO 639-1 code.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        dict[str, int]: Mapping of lowercase ISO 639-1 codes to language IDs.
+    """
+    result = await db.execute(
+        select(Language.iso639_1, Language.id).where(Language.iso639_1.is_not(None))
+    )
+
+    return {code.lower(): language_id for code, language_id in result.all()}
@@ -80,6 +80,46 @@ async def get_pages(lang: str, db: AsyncSession):
     return mapped_results
 
 
+async def get_pages_all_languages(db: AsyncSession):
+    """
+    Retrieve pages with the localized fields of all languages.
+
+    All translation rows are joined instead of being filtered by language, so a single query
+    returns every language; the rows are folded per page in Python.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[dict]: Pages as plain dicts with `translations` (title, abstract and html keyed
+        by ISO 639-1 code).
+    """
+    result = await db.execute(
+        select(
+            Page,
+            Language.iso639_1,
+            PageTranslation.title,
+            PageTranslation.abstract,
+            PageTranslation.html
+        )
+        .join(Page.translations)
+        .join(Language, Language.id == PageTranslation.language_id)
+    )
+
+    page_map: dict[int, dict] = {}
+    for page, code, title, abstract, html in result.all():
+        if page.id not in page_map:
+            page_map[page.id] = {
+                "id": page.id,
+                "tech_key": page.tech_key,
+                "creation_date": page.creation_date,
+                "translations": {},
+            }
+        page_map[page.id]["translations"][code] = {"title": title, "abstract": abstract, "html": html}
+
+    return list(page_map.values())
+
+
 async def create_page(lang: str, db: AsyncSession, *, tech_key=None, title=None, abstract=None, html=None, creation_date=None):
     """
     Create a new Page and its localized translation for the given language.
@@ -4,7 +4,8 @@ Personal details query helpers
 Author: Simon Neidig <mail@simon-neidig.eu>
 
 This module provides a helper to load the primary PersonalDetails record together
-with its localized fields (position, abstract) for a requested language.
+with its localized fields (position, abstract) and its profile picture preview
+for a requested language.
 The function maps translation fields onto the PersonalDetails model instance
 so the returned object can be directly consumed by the API layer.
 """
@@ -16,12 +17,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # Import internal dependencies
 from app.db.models.personal_details import PersonalDetails
 from app.db.models.personal_details_translation import PersonalDetailsTranslation
+from app.db.models.image import Image
 
 
 async def get_personal_details(lang: str, db: AsyncSession):
     """
     Fetch the first PersonalDetails object with its position and abstract
     populated from the corresponding translation for the specified language.
+    The profile picture (dimensions and placeholder) is selected in the same query.
 
     Args:
         lang (str): The language code (e.g., "en", "de").
@@ -35,16 +38,20 @@ async def get_personal_details(lang: str, db: AsyncSession):
             PersonalDetails,
             PersonalDetailsTranslation.position,
             PersonalDetailsTranslation.abstract,
+            Image,
         )
         .join(PersonalDetailsTranslation)
+        .outerjoin(Image, Image.id == PersonalDetails.profile_picture_id)
         .where(PersonalDetailsTranslation.language.has(iso639_1=lang))
     )
 
     row = result.first()
     if row:
-        personal_details, position, abstract = row
+        personal_details, position, abstract, profile_picture = row
         personal_details.position = position
         personal_details.abstract = abstract
+        # attach selected profile picture (avoid lazy load)
+        setattr(personal_details, "profile_picture", profile_picture)
         return personal_details
 
     return None
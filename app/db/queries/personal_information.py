@@ -91,6 +91,40 @@ async def get_personal_information(lang: str, db: AsyncSession):
     return mapped_results
 
 
+async def get_personal_information_all_languages(db: AsyncSession):
+    """
+    Retrieve personal information entries with the localized fields of all languages.
+
+    All translation rows are joined instead of being filtered by language, so a single query
+    returns every language; the rows are folded per entry in Python.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[dict]: Entries as plain dicts with `translations` (label and value keyed by
+        ISO 639-1 code).
+    """
+    result = await db.execute(
+        select(
+            PersonalInformation,
+            Language.iso639_1,
+            PersonalInformationTranslation.label,
+            PersonalInformationTranslation.value
+        )
+        .join(PersonalInformation.translations)
+        .join(Language, Language.id == PersonalInformationTranslation.language_id)
+    )
+
+    info_map: dict[int, dict] = {}
+    for info, code, label, value in result.all():
+        if info.id not in info_map:
+            info_map[info.id] = {"id": info.id, "icon": info.icon, "translations": {}}
+        info_map[info.id]["translations"][code] = {"label": label, "value": value}
+
+    return list(info_map.values())
+
+
 async def create_personal_information(lang: str, db: AsyncSession, *, label=None, value=None, icon=None):
     """
     Create a new Expertise and its localized translation for the given language.
@@ -0,0 +1,84 @@
+"""
+Token revocation queries for the database
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module records revoked JWTs and reads the revocation list back for the in-memory copy
+kept by app/services/token_revocation.py. All dates are naive UTC.
+"""
+
+# Import external dependencies
+import uuid
+from datetime import datetime
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Import internal dependencies
+from app.db.models.revoked_token import RevokedToken
+
+
+async def revoke_token(jti: str, user_id: uuid.UUID, revocation_date: datetime, expiry_date: datetime,
+                       db: AsyncSession):
+    """
+    Revoke a single token; revoking it again has no effect.
+
+    Args:
+        jti (str): ID of the token.
+        user_id (uuid.UUID): ID of the user the token was issued to.
+        revocation_date (datetime): Timestamp of the revocation.
+        expiry_date (datetime): Expiry of the token.
+        db (AsyncSession): SQLAlchemy async database session.
+    """
+    await db.execute(
+        insert(RevokedToken)
+        .values(jti=jti, user_id=user_id, revocation_date=revocation_date, expiry_date=expiry_date)
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    await db.commit()
+
+
+async def revoke_user_tokens(user_id: uuid.UUID, revocation_date: datetime, expiry_date: datetime,
+                             db: AsyncSession):
+    """
+    Revoke every token of a user issued before `revocation_date`.
+
+    Args:
+        user_id (uuid.UUID): ID of the user.
+        revocation_date (datetime): Timestamp of the revocation.
+        expiry_date (datetime): Time by which every token issued before the revocation has expired.
+        db (AsyncSession): SQLAlchemy async database session.
+    """
+    db.add(RevokedToken(jti=None, user_id=user_id, revocation_date=revocation_date, expiry_date=expiry_date))
+    await db.commit()
+
+
+async def get_revocations(now: datetime, db: AsyncSession) -> list[RevokedToken]:
+    """
+    List the revocations of tokens that have not expired yet.
+
+    Args:
+        now (datetime): Current timestamp.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[RevokedToken]: The unexpired revocations.
+    """
+    result = await db.execute(select(RevokedToken).where(RevokedToken.expiry_date > now))
+    return list(result.scalars().all())
+
+
+async def delete_expired_revocations(now: datetime, db: AsyncSession) -> int:
+    """
+    Delete the revocations whose tokens have all expired.
+
+    Args:
+        now (datetime): Current timestamp.
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        int: Number of deleted revocations.
+    """
+    result = await db.execute(delete(RevokedToken).where(RevokedToken.expiry_date <= now))
+    await db.commit()
+    return result.rowcount
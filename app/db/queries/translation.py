@@ -0,0 +1,121 @@
+"""
+Translation coverage query helpers
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module computes how completely the translated entities are translated into every
+language. Entries without a translation for the requested language are silently left out
+of API responses, so the coverage report is the place to spot them.
+
+The report is computed in a single statement: for every translated entity, all rows are
+cross joined with all languages and left joined with the (deduplicated) translation rows;
+the per-entity selects are combined with UNION ALL and aggregated per language, so the
+database does the whole computation in one set-based pass with hash joins.
+"""
+
+# Import external dependencies
+from sqlalchemy import String, and_, cast, func, literal, select, true, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Import internal dependencies
+from app.db.models.category import Category
+from app.db.models.category_translation import CategoryTranslation
+from app.db.models.education import Education
+from app.db.models.education_translation import EducationTranslation
+from app.db.models.experience import Experience
+from app.db.models.experience_translation import ExperienceTranslation
+from app.db.models.expertise import Expertise
+from app.db.models.expertise_translation import ExpertiseTranslation
+from app.db.models.institution import Institution
+from app.db.models.institution_translation import InstitutionTranslation
+from app.db.models.language import Language
+from app.db.models.page import Page
+from app.db.models.page_translation import PageTranslation
+from app.db.models.personal_details import PersonalDetails
+from app.db.models.personal_details_translation import PersonalDetailsTranslation
+from app.db.models.personal_information import PersonalInformation
+from app.db.models.personal_information_translation import PersonalInformationTranslation
+from app.db.models.work import Work
+from app.db.models.work_translation import WorkTranslation
+
+
+# Translated entities: name in the report, entity model and foreign key of the translation table
+TRANSLATED_ENTITIES = [
+    ("category", Category, CategoryTranslation.category_id),
+    ("education", Education, EducationTranslation.education_id),
+    ("experience", Experience, ExperienceTranslation.experience_id),
+    ("expertise", Expertise, ExpertiseTranslation.expertise_id),
+    ("institution", Institution, InstitutionTranslation.institution_id),
+    ("page", Page, PageTranslation.page_id),
+    ("personal_details", PersonalDetails, PersonalDetailsTranslation.personal_details_id),
+    ("personal_information", PersonalInformation, PersonalInformationTranslation.personal_information_id),
+    ("work", Work, WorkTranslation.work_id),
+]
+
+
+def _coverage_select(name: str, entity, foreign_key):
+    """
+    Build the coverage select of one entity, grouped by language.
+    """
+    translation = foreign_key.class_
+    # several translation rows for the same language must not count twice
+    translated = (
+        select(foreign_key.label("entity_id"), translation.language_id)
+        .distinct()
+        .subquery()
+    )
+
+    return (
+        select(
+            cast(literal(name), String).label("entity"),
+            Language.iso639_1.label("language"),
+            func.count().label("total"),
+            func.count(translated.c.entity_id).label("translated"),
+            func.array_agg(aggregate_order_by(entity.id, entity.id))
+            .filter(translated.c.entity_id.is_(None))
+            .label("missing_ids"),
+        )
+        .select_from(entity)
+        .join(Language, true())
+        .outerjoin(
+            translated,
+            and_(translated.c.entity_id == entity.id, translated.c.language_id == Language.id),
+        )
+        .where(Language.iso639_1.is_not(None))
+        .group_by(Language.iso639_1)
+    )
+
+
+async def get_translation_coverage(db: AsyncSession) -> list[dict]:
+    """
+    Compute the translation coverage per translated entity and language.
+
+    Entities without any rows do not appear in the report.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        list[dict]: One dict per entity and language with `entity`, `language`, `total`,
+        `translated`, `missing`, `coverage` (0.0 - 1.0) and the sorted `missing_ids`,
+        ordered by entity and language.
+    """
+    coverage = union_all(
+        *(_coverage_select(name, entity, foreign_key) for name, entity, foreign_key in TRANSLATED_ENTITIES)
+    ).subquery()
+
+    result = await db.execute(select(coverage).order_by(coverage.c.entity, coverage.c.language))
+
+    return [
+        {
+            "entity": row.entity,
+            "language": row.language,
+            "total": row.total,
+            "translated": row.translated,
+            "missing": row.total - row.translated,
+            "coverage": row.translated / row.total,
+            "missing_ids": row.missing_ids or [],
+        }
+        for row in result.all()
+    ]
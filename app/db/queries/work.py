@@ -4,13 +4,13 @@ Work query helpers
 Author: Simon Neidig <mail@simon-neidig.eu>
 
 This module provides helper functions to load Work (portfolio) entries together with
-their localized title and associated categories for a requested language. The helper
-maps translation fields and localized category names onto Work model instances for
-API consumption.
+their localized title, associated categories and thumbnail preview for a requested
+language. The helper maps translation fields and localized category names onto Work
+model instances for API consumption.
 """
 
 # Import external dependencies
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import internal dependencies
@@ -18,6 +18,8 @@ from app.db.models.work import Work
 from app.db.models.work_translation import WorkTranslation
 from app.db.models.category import Category
 from app.db.models.category_translation import CategoryTranslation
+from app.db.models.image import Image
+from app.db.models.language import Language
 
 
 async def get_works(lang: str, db: AsyncSession):
@@ -29,7 +31,8 @@ async def get_works(lang: str, db: AsyncSession):
         db (AsyncSession): Async SQLAlchemy session.
 
     Returns:
-        list[Work]: Work instances with `title` and `categories` populated (categories include localized `name`).
+        list[Work]: Work instances with `title`, `categories` (including localized `name`) and the
+        `thumbnail` preview (dimensions and placeholder) populated.
     """
     result = await db.execute(
         select(
@@ -37,6 +40,7 @@ async def get_works(lang: str, db: AsyncSession):
             WorkTranslation.title,
             Category,
             CategoryTranslation.name.label("category_name"),
+            Image,
         )
         .join(WorkTranslation)
         .join(Work.categories)  # join to Category
@@ -44,6 +48,7 @@ async def get_works(lang: str, db: AsyncSession):
             CategoryTranslation,
             CategoryTranslation.category_id == Category.id,
         )
+        .outerjoin(Image, Image.id == Work.thumbnail_id)
         .where(WorkTranslation.language.has(iso639_1=lang))
         .where(CategoryTranslation.language.has(iso639_1=lang))
     )
@@ -52,13 +57,14 @@ async def get_works(lang: str, db: AsyncSession):
 
     # Map the additional fields into plain dicts to avoid any lazy-loading on ORM objects
     work_map: dict[int, dict] = {}
-    for work, title, category, category_name in rows:
+    for work, title, category, category_name, thumbnail in rows:
         wid = work.id
         if wid not in work_map:
             work_map[wid] = {
                 "id": wid,
                 "url": getattr(work, "url", None),
-                "thumbnail_id": getattr(work, "thumbnail_id", None) or getattr(work, "thumbnail", None),
+                "thumbnail_id": getattr(work, "thumbnail_id", None),
+                "thumbnail": thumbnail,
                 "title": title,
                 "categories": [],
             }
@@ -68,3 +74,63 @@ async def get_works(lang: str, db: AsyncSession):
 
     # Return a list of plain dicts compatible with the Work Pydantic schema
     return list(work_map.values())
+
+
+async def get_works_all_languages(db: AsyncSession):
+    """
+    Async helper to retrieve works with the localized titles and category names of all languages.
+
+    All translation rows are joined instead of being filtered by language, so a single query
+    returns every language; category names are joined in the language of the work translation
+    of the same row and the rows are folded per work in Python.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session.
+
+    Returns:
+        list[dict]: Works as plain dicts with `translations` (title keyed by ISO 639-1 code),
+        the `thumbnail` preview and `categories` with their own `translations`.
+    """
+    result = await db.execute(
+        select(
+            Work,
+            Language.iso639_1,
+            WorkTranslation.title,
+            Category,
+            CategoryTranslation.name.label("category_name"),
+            Image,
+        )
+        .join(Work.translations)
+        .join(Language, Language.id == WorkTranslation.language_id)
+        .join(Work.categories)
+        .join(
+            CategoryTranslation,
+            and_(
+                CategoryTranslation.category_id == Category.id,
+                CategoryTranslation.language_id == WorkTranslation.language_id,
+            )
+        )
+        .outerjoin(Image, Image.id == Work.thumbnail_id)
+    )
+
+    work_map: dict[int, dict] = {}
+    for work, code, title, category, category_name, thumbnail in result.all():
+        if work.id not in work_map:
+            work_map[work.id] = {
+                "id": work.id,
+                "url": work.url,
+                "thumbnail_id": work.thumbnail_id,
+                "thumbnail": thumbnail,
+                "categories": {},
+                "translations": {},
+            }
+
+        entry = work_map[work.id]
+        entry["translations"][code] = {"title": title}
+        categories = entry["categories"]
+        if category.id not in categories:
+            categories[category.id] = {"id": category.id, "translations": {}}
+        categories[category.id]["translations"][code] = {"name": category_name}
+
+    # Return plain dicts compatible with the WorkAllLanguages schema
+    return [{**work, "categories": list(work["categories"].values())} for work in work_map.values()]
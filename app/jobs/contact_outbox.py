@@ -0,0 +1,80 @@
+"""
+Contact outbox worker
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module runs the contact outbox (see `app.services.contact_outbox`) outside of the API
+process, e.g. as a dedicated service when `CONTACT_OUTBOX_ENABLED` is off for the API
+workers, or from cron with `--once`. Several instances may run at the same time.
+
+Contacts stored before the outbox existed are not delivered automatically;
+`--requeue-since <date>` queues those created on or after the given day and exits.
+
+Usage:
+    python -m app.jobs.contact_outbox [--once] [--requeue-since YYYY-MM-DD]
+"""
+
+# Import external dependencies
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime
+from importlib import import_module
+from pkgutil import iter_modules
+
+# Import internal dependencies
+from app.db import models
+from app.db.database import async_session_maker
+from app.db.queries import contact as crud
+from app.services import contact_outbox
+
+# Import all models so that string based relationships can be resolved
+for _, module_name, _ in iter_modules(models.__path__):
+    import_module(f"app.db.models.{module_name}")
+
+
+async def run_once() -> int:
+    """
+    Deliver due contacts until none are left.
+
+    Returns:
+        int: Number of processed contacts.
+    """
+    total = 0
+    while claimed := await contact_outbox.deliver_due_contacts():
+        total += claimed
+    return total
+
+
+async def requeue(since: date) -> int:
+    """
+    Queue the contacts created since a day that were never queued for delivery.
+
+    Returns:
+        int: Number of queued contacts.
+    """
+    async with async_session_maker() as db:
+        return await crud.requeue_contacts(datetime(since.year, since.month, since.day), db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver stored contact requests by mail.")
+    parser.add_argument("--once", action="store_true", help="process all due contacts and exit")
+    parser.add_argument(
+        "--requeue-since", type=date.fromisoformat, metavar="YYYY-MM-DD",
+        help="queue never delivered contacts created on or after this day (UTC) and exit",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.requeue_since:
+        print(f"Queued {asyncio.run(requeue(args.requeue_since))} contacts for delivery.")
+    elif args.once:
+        print(f"Processed {asyncio.run(run_once())} contacts.")
+    else:
+        asyncio.run(contact_outbox.run())
+
+
+if __name__ == "__main__":
+    main()
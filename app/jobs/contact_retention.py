@@ -0,0 +1,99 @@
+"""
+Contact retention job
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module maintains the monthly partitions of the `contact` table. It creates the
+partitions of the current and the next `--ahead` months, moving contacts of those months
+out of the default partition, and drops the partitions of months that ended more than
+`--retention-months` ago, unless they still contain contacts waiting for delivery. Expired
+contacts in the default partition are deleted row by row. Meant to be run daily (e.g. from
+cron).
+
+Usage:
+    python -m app.jobs.contact_retention [--retention-months 24] [--ahead 3] [--dry-run]
+"""
+
+# Import external dependencies
+import argparse
+import asyncio
+from datetime import date
+from importlib import import_module
+from pkgutil import iter_modules
+
+# Import internal dependencies
+from app.core import config
+from app.db import models
+from app.db.database import async_session_maker
+from app.db.queries import contact_partition as crud
+
+# Import all models so that string based relationships can be resolved
+for _, module_name, _ in iter_modules(models.__path__):
+    import_module(f"app.db.models.{module_name}")
+
+
+async def run(retention_months: int, ahead: int, dry_run: bool):
+    """
+    Create upcoming and drop expired contact partitions.
+
+    Args:
+        retention_months (int): Number of full months contacts are kept.
+        ahead (int): Number of future months to create partitions for.
+        dry_run (bool): Only print what would be done.
+    """
+    today = date.today()
+    this_month = date(today.year, today.month, 1)
+    # partitions of months before the cutoff month have expired
+    cutoff = crud.add_months(this_month, -retention_months)
+
+    async with async_session_maker() as db:
+        existing = {name for name, _ in await crud.get_contact_partitions(db)}
+
+        for offset in range(ahead + 1):
+            month = crud.add_months(this_month, offset)
+            if crud.partition_name(month) not in existing:
+                print(f"Creating partition {crud.partition_name(month)}")
+                if not dry_run:
+                    await crud.create_contact_partition(month, db)
+
+        for name, month in await crud.get_contact_partitions(db):
+            if month >= cutoff:
+                continue
+
+            pending = await crud.count_pending_contacts(name, db)
+            if pending:
+                print(f"Keeping partition {name}: {pending} contacts are waiting for delivery")
+                continue
+
+            print(f"Dropping partition {name}")
+            if not dry_run:
+                await crud.drop_contact_partition(name, db)
+
+        # contacts outside of the monthly partitions are not covered by dropping partitions
+        print(f"Deleting contacts created before {cutoff.isoformat()} from {crud.DEFAULT_PARTITION}")
+        if not dry_run:
+            deleted = await crud.delete_expired_default_contacts(cutoff, db)
+            print(f"Deleted {deleted} contacts from {crud.DEFAULT_PARTITION}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create upcoming and drop expired contact partitions.")
+    parser.add_argument(
+        "--retention-months", type=int, default=config.CONTACT_RETENTION_MONTHS,
+        help="number of full months contacts are kept (default: CONTACT_RETENTION_MONTHS)",
+    )
+    parser.add_argument(
+        "--ahead", type=int, default=config.CONTACT_PARTITIONS_AHEAD,
+        help="number of future months to create partitions for (default: CONTACT_PARTITIONS_AHEAD)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="only print what would be done")
+    args = parser.parse_args()
+
+    if args.retention_months < 1:
+        parser.error("--retention-months must be at least 1")
+
+    asyncio.run(run(args.retention_months, args.ahead, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
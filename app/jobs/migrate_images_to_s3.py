@@ -0,0 +1,113 @@
+"""
+Image storage migration job
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module moves the image files of the local disk to the object store after switching to
+`IMAGE_STORAGE=s3`. Every original and variant whose location is still a path on disk is
+uploaded under its content-addressed key, and all rows referencing the file are pointed to
+the key afterwards. Until then, the S3 backend keeps serving these files from the local disk
+(see `app.services.storage.S3Storage`), so the job can run while the API is serving. It
+can be run repeatedly; files already moved are skipped.
+
+Usage:
+    python -m app.jobs.migrate_images_to_s3 [--delete-local] [--dry-run]
+"""
+
+# Import external dependencies
+import argparse
+import asyncio
+import os
+from importlib import import_module
+from pkgutil import iter_modules
+
+# Import internal dependencies
+from app.db import models
+from app.db.database import async_session_maker
+from app.db.queries import image as crud
+from app.services import image_storage, storage
+
+# Import all models so that string based relationships can be resolved
+for _, module_name, _ in iter_modules(models.__path__):
+    import_module(f"app.db.models.{module_name}")
+
+
+async def run(delete_local: bool, dry_run: bool) -> dict:
+    """
+    Upload all files still stored on the local disk and point their rows to the object keys.
+
+    Args:
+        delete_local (bool): Remove the local files once no row references them anymore.
+        dry_run (bool): Only count the files that would be moved.
+
+    Returns:
+        dict: Number of files per outcome ("moved", "missing", "unsupported", "changed").
+    """
+    counts = {"moved": 0, "missing": 0, "unsupported": 0, "changed": 0}
+
+    async with async_session_maker() as db:
+        locations = [
+            (filepath, mime_type) for filepath, mime_type in await crud.get_file_locations(db)
+            if not storage.is_object_key(filepath)
+        ]
+
+        for filepath, mime_type in locations:
+            if not os.path.exists(filepath):
+                print(f"Missing on disk: {filepath}")
+                counts["missing"] += 1
+                continue
+
+            # images created before uploads recorded their MIME type are JPEGs
+            try:
+                staged = await image_storage.stage_file(filepath, mime_type or "image/jpeg")
+            except image_storage.UnsupportedImageType as e:
+                print(f"Skipping {filepath}: {e}")
+                counts["unsupported"] += 1
+                continue
+
+            if dry_run:
+                await image_storage.release(staged)
+                counts["moved"] += 1
+                continue
+
+            try:
+                stored = await image_storage.commit(staged)
+            finally:
+                await image_storage.release(staged)
+
+            if not await crud.relocate_file(filepath, stored.filepath, db):
+                # the rows changed in the meantime; the uploaded object is content-addressed and
+                # will be picked up by any row storing the same content
+                counts["changed"] += 1
+                continue
+
+            print(f"Moved {filepath} -> {stored.filepath}")
+            counts["moved"] += 1
+
+            if delete_local and not await crud.is_file_referenced(filepath, db):
+                await storage.LocalStorage(os.path.dirname(filepath)).delete(filepath)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move image files from the local disk to the object store.")
+    parser.add_argument("--delete-local", action="store_true", help="remove the local files after moving them")
+    parser.add_argument("--dry-run", action="store_true", help="only report the files that would be moved")
+    args = parser.parse_args()
+
+    if not isinstance(storage.get_storage(), storage.S3Storage):
+        parser.error("moving images requires the S3 storage backend (IMAGE_STORAGE=s3)")
+
+    async def migrate():
+        try:
+            return await run(args.delete_local, args.dry_run)
+        finally:
+            await storage.close()
+
+    counts = asyncio.run(migrate())
+    print(", ".join(f"{outcome}: {count}" for outcome, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
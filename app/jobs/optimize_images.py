@@ -0,0 +1,204 @@
+"""
+Offline image optimization job
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module recompresses all original image files referenced by the `image` table and
+strips their metadata (see `app.services.image_processing.optimize_image`). The CPU heavy
+work runs in a process pool; for every file that got smaller the optimized copy is moved
+to its new content-addressed path, the row (filepath, hash, size) is updated in a single
+statement and only afterwards the old file is removed. The digest of the uploaded content
+stays resolvable (`Image.original_sha256`), so published hash URLs keep working. Images without stored dimensions
+or placeholder get them computed on the way.
+
+The job reads and rewrites files on the local disk and therefore requires the `local`
+storage backend (`IMAGE_STORAGE`).
+
+Usage:
+    python -m app.jobs.optimize_images [--workers N] [--report PATH] [--dry-run]
+"""
+
+# Import external dependencies
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from importlib import import_module
+from pkgutil import iter_modules
+from sqlalchemy.exc import IntegrityError
+
+# Import internal dependencies
+from app.core import config
+from app.db import models
+from app.db.database import async_session_maker
+from app.db.queries import image as crud
+from app.services.image_processing import InvalidImage, optimize_image
+from app.services.image_storage import StagedFile, commit
+from app.services.storage import LocalStorage, get_storage
+
+# Import all models so that string based relationships can be resolved
+for _, module_name, _ in iter_modules(models.__path__):
+    import_module(f"app.db.models.{module_name}")
+
+
+def _is_managed(filepath: str) -> bool:
+    """
+    Check whether a file lives below the image directory and may be removed by the job.
+    """
+    relative = os.path.relpath(os.path.abspath(filepath), os.path.abspath(config.IMAGE_DIR))
+    return not (relative == os.pardir or relative.startswith(os.pardir + os.sep))
+
+
+async def _apply(image, optimized, metadata, db, dry_run: bool) -> str:
+    """
+    Move an optimized file into place and point the image row to it.
+
+    Returns:
+        str: The outcome ("optimized", "changed" or "duplicate").
+    """
+    if dry_run:
+        os.unlink(optimized.tmp_path)
+        return "optimized"
+
+    stored = await commit(StagedFile(
+        tmp_path=optimized.tmp_path,
+        sha256=optimized.sha256,
+        size=optimized.size,
+        mime_type=optimized.mime_type,
+    ))
+    filepath = stored.filepath
+
+    values = {
+        "filename": stored.filename,
+        "filepath": filepath,
+        "sha256": optimized.sha256,
+        "size": optimized.size,
+        "mime_type": optimized.mime_type,
+    }
+    if metadata is not None:
+        values.update(width=metadata.width, height=metadata.height, placeholder=metadata.placeholder)
+
+    try:
+        updated = await crud.replace_image_file(image.id, image.filepath, db, **values)
+    except IntegrityError:
+        # another image already stores exactly this content
+        await db.rollback()
+        return "duplicate"
+
+    if not updated:
+        if not await crud.is_file_referenced(filepath, db):
+            os.unlink(filepath)
+        return "changed"
+
+    # The row references the new file now; drop the old one unless something else uses it
+    if _is_managed(image.filepath) and not await crud.is_file_referenced(image.filepath, db):
+        os.unlink(image.filepath)
+
+    return "optimized"
+
+
+async def run(workers: int, report_path: str, dry_run: bool) -> dict:
+    """
+    Optimize all images and write a JSON report.
+
+    Args:
+        workers (int): Number of worker processes.
+        report_path (str): Path of the JSON report.
+        dry_run (bool): Only measure the savings without changing files or rows.
+
+    Returns:
+        dict: The report.
+    """
+    started = datetime.now(timezone.utc)
+    entries = []
+
+    async with async_session_maker() as db:
+        images = await crud.get_images(db)
+        # Detach the rows; updates are issued as plain statements
+        db.expunge_all()
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+
+            async def optimize(image):
+                try:
+                    optimized, metadata = await loop.run_in_executor(
+                        pool, optimize_image, image.filepath, config.IMAGE_DIR, image.placeholder is None
+                    )
+                    return image, optimized, metadata, None
+                except InvalidImage as e:
+                    return image, None, None, e
+
+            missing = [image for image in images if not os.path.exists(image.filepath)]
+            missing_ids = {image.id for image in missing}
+            tasks = [optimize(image) for image in images if image.id not in missing_ids]
+
+            # Rows are updated one after another as soon as their worker finishes
+            for task in asyncio.as_completed(tasks):
+                image, optimized, metadata, error = await task
+                old_size = os.path.getsize(image.filepath)
+
+                if error is not None:
+                    entries.append({"id": image.id, "status": "invalid", "error": str(error)})
+                    continue
+
+                if optimized is None:
+                    # The file stays as it is, but missing dimensions or placeholder are filled in
+                    if metadata is not None and not dry_run:
+                        await crud.replace_image_file(
+                            image.id, image.filepath, db,
+                            width=metadata.width, height=metadata.height, placeholder=metadata.placeholder,
+                        )
+                    entries.append({"id": image.id, "status": "unchanged", "size": old_size})
+                    continue
+
+                status = await _apply(image, optimized, metadata, db, dry_run)
+                saved = old_size - optimized.size if status == "optimized" else 0
+                entries.append({
+                    "id": image.id,
+                    "status": status,
+                    "old_size": old_size,
+                    "new_size": optimized.size,
+                    "bytes_saved": saved,
+                })
+
+    entries.extend({"id": image.id, "status": "missing", "filepath": image.filepath} for image in missing)
+    entries.sort(key=lambda entry: entry["id"])
+
+    report = {
+        "started": started.isoformat(),
+        "finished": datetime.now(timezone.utc).isoformat(),
+        "dry_run": dry_run,
+        "images": len(entries),
+        "optimized": sum(1 for entry in entries if entry["status"] == "optimized"),
+        "bytes_saved": sum(entry.get("bytes_saved", 0) for entry in entries),
+        "entries": entries,
+    }
+
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompress image originals and strip their metadata.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--report", default="optimize_images_report.json", help="path of the JSON report")
+    parser.add_argument("--dry-run", action="store_true", help="only report possible savings")
+    args = parser.parse_args()
+
+    if not isinstance(get_storage(), LocalStorage):
+        parser.error("optimizing images requires the local storage backend (IMAGE_STORAGE=local)")
+
+    report = asyncio.run(run(args.workers, args.report, args.dry_run))
+    print(
+        f"Optimized {report['optimized']} of {report['images']} images, "
+        f"saved {report['bytes_saved']} bytes. Report written to {args.report}."
+    )
+
+
+if __name__ == "__main__":
+    main()
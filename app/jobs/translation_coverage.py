@@ -0,0 +1,76 @@
+"""
+Translation coverage report
+
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+This module prints the translation coverage per translated entity and language (see
+`app.db.queries.translation`). With `--min-coverage` it exits with status 1 if any entity is
+translated into any language below the given share, so it can gate CI pipelines or
+deployments on complete translations.
+
+Usage:
+    python -m app.jobs.translation_coverage [--min-coverage 1.0] [--json]
+"""
+
+# Import external dependencies
+import argparse
+import asyncio
+import json
+import sys
+from importlib import import_module
+from pkgutil import iter_modules
+
+# Import internal dependencies
+from app.db import models
+from app.db.database import async_session_maker
+from app.db.queries import translation as crud
+
+# Import all models so that string based relationships can be resolved
+for _, module_name, _ in iter_modules(models.__path__):
+    import_module(f"app.db.models.{module_name}")
+
+
+async def run() -> list[dict]:
+    """
+    Compute the translation coverage report.
+
+    Returns:
+        list[dict]: Coverage entries ordered by entity and language.
+    """
+    async with async_session_maker() as db:
+        return await crud.get_translation_coverage(db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the translation coverage per entity and language.")
+    parser.add_argument(
+        "--min-coverage", type=float, default=None,
+        help="fail (exit status 1) if any entity/language is covered below this share (0.0 - 1.0)",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run())
+    failing = [
+        entry for entry in report
+        if args.min_coverage is not None and entry["coverage"] < args.min_coverage
+    ]
+
+    if args.json:
+        print(json.dumps({"min_coverage": args.min_coverage, "passed": not failing, "entries": report}, indent=2))
+    else:
+        print(f"{'entity':<22}{'language':<10}{'translated':>12}{'coverage':>10}  missing ids")
+        for entry in report:
+            print(
+                f"{entry['entity']:<22}{entry['language']:<10}"
+                f"{entry['translated']:>6}/{entry['total']:<5}{entry['coverage']:>10.1%}  "
+                f"{', '.join(map(str, entry['missing_ids']))}"
+            )
+        if failing:
+            print(f"\n{len(failing)} entity/language combinations are below a coverage of {args.min_coverage:.1%}.")
+
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,17 @@ Author: Simon Neidig <mail@simon-neidig.eu>
 This module creates and configures the FastAPI application instance and includes
 all API routers used by the backend. Importing this module prepares the app for
 running (e.g. via uvicorn).
+
+The lifespan starts the background tasks of the worker: the change feed listener (see
+app/services/change_feed.py), the contact outbox (see app/services/contact_outbox.py),
+the contact writer (see app/services/contact_writer.py) and the user event worker (see
+app/services/user_events.py), and keeps the token revocation list up to date (see
+app/services/token_revocation.py).
 """
 
 # Import external dependencies
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 
 # Import internal dependencies
 from app.api.routes.contact import contact
@@ -18,21 +25,61 @@ from app.api.routes.experience import experience
 from app.api.routes.expertise import expertise
 from app.api.routes.image import image
 from app.api.routes.institution import institution
+from app.api.routes.metrics import metrics as metrics_route
 from app.api.routes.page import page
 from app.api.routes.personal_details import personal_details
 from app.api.routes.personal_information import personal_information
 from app.api.routes.social_media import social_media
+from app.api.routes.translation import translation
 from app.api.routes.work import work
 from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.services import (change_feed, contact_outbox, contact_writer, metrics, rate_limit, slow_queries, storage,
+                          token_revocation, user_events)
+from app.services.query_budget import QueryBudgetMiddleware
+from app.services.routing import include_router
+from app.services.server_timing import ServerTimingMiddleware
 from app.services.user import auth_backend, fastapi_users
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run background tasks of the worker while the application is serving.
+    """
+    await change_feed.start()
+    await contact_outbox.start()
+    await contact_writer.start()
+    await token_revocation.start()
+    await user_events.start()
+    try:
+        yield
+    finally:
+        # store queued contacts while the database connections are still available
+        await contact_writer.stop()
+        await user_events.stop()
+        await token_revocation.stop()
+        await contact_outbox.stop()
+        await change_feed.stop()
+        await slow_queries.stop()
+        await rate_limit.close()
+        await storage.close()
+        metrics.mark_process_dead()
+
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ServerTimingMiddleware)
+# middlewares added later run first: the query budget accounts the statements for the
+# Server-Timing header as well, and the request duration includes both
+app.add_middleware(QueryBudgetMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
 
 # Define route prefixes as constants
 AUTH_PREFIX = "/auth"
 
+# The unauthenticated auth routes hash passwords or send mails and are rate limited
+AUTH_RATE_LIMIT = [Depends(rate_limit.limit_auth)]
+
 # Add routes to FastAPI app
 app.include_router(contact.router)
 app.include_router(education.router)
@@ -40,30 +87,41 @@ app.include_router(experience.router)
 app.include_router(expertise.router)
 app.include_router(image.router)
 app.include_router(institution.router)
+app.include_router(metrics_route.router)
 app.include_router(page.router)
 app.include_router(personal_details.router)
 app.include_router(personal_information.router)
 app.include_router(social_media.router)
+app.include_router(translation.router)
 app.include_router(work.router)
-app.include_router(
-    fastapi_users.get_auth_router(auth_backend), prefix=f"{AUTH_PREFIX}/jwt", tags=["auth"]
+# routers mounted with a prefix record their full path templates (see app/services/routing.py)
+include_router(
+    app, fastapi_users.get_auth_router(auth_backend), prefix=f"{AUTH_PREFIX}/jwt", tags=["auth"],
+    dependencies=AUTH_RATE_LIMIT,
 )
-app.include_router(
+include_router(
+    app,
     fastapi_users.get_register_router(UserRead, UserCreate),
     prefix=AUTH_PREFIX,
     tags=["auth"],
+    dependencies=AUTH_RATE_LIMIT,
 )
-app.include_router(
+include_router(
+    app,
     fastapi_users.get_reset_password_router(),
     prefix=AUTH_PREFIX,
     tags=["auth"],
+    dependencies=AUTH_RATE_LIMIT,
 )
-app.include_router(
+include_router(
+    app,
     fastapi_users.get_verify_router(UserRead),
     prefix=AUTH_PREFIX,
     tags=["auth"],
+    dependencies=AUTH_RATE_LIMIT,
 )
-app.include_router(
+include_router(
+    app,
     fastapi_users.get_users_router(UserRead, UserUpdate),
     prefix="/users",
     tags=["users"],
@@ -36,3 +36,31 @@ class Category(CategoryBase):
         Enables ORM mode to allow compatibility with SQLAlchemy models.
         """
         orm_mode = True
+
+
+class CategoryTranslationRead(BaseModel):
+    """
+    Localized fields of a category in one language.
+
+    Attributes:
+        name (str | None): The name of the category.
+    """
+    name: str | None = None
+
+
+class CategoryAllLanguages(CategoryBase):
+    """
+    A category with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        translations (dict[str, CategoryTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    translations: dict[str, CategoryTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
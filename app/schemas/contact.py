@@ -29,6 +29,9 @@ class ContactRead(ContactBase):
     email: str | None = None
     message: str | None = None
     lang: str | None = None
+    attempts: int | None = None
+    next_attempt_date: datetime.datetime | None = None
+    last_error: str | None = None
 
     class Config:
         """
@@ -15,7 +15,7 @@ from pydantic import BaseModel
 import datetime
 
 # Import internal dependencies
-from app.schemas.institution import InstitutionRead
+from app.schemas.institution import InstitutionAllLanguages, InstitutionRead
 
 
 class EducationBase(BaseModel):
@@ -58,6 +58,46 @@ class EducationRead(EducationBase):
         orm_mode = True
 
 
+class EducationTranslationRead(BaseModel):
+    """
+    Localized fields of an education record in one language.
+
+    Attributes:
+        course_of_study (str | None): The course of study or major.
+        description (str | None): A description of the education.
+    """
+    course_of_study: str | None = None
+    description: str | None = None
+
+
+class EducationAllLanguages(EducationBase):
+    """
+    An education record with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        degree (str | None): The degree obtained (e.g., Bachelor's, Master's).
+        grade (float | None): The grade achieved.
+        start_date (datetime.date | None): The start date of the education.
+        end_date (datetime.date | None): The end date of the education.
+        university (InstitutionAllLanguages | None): The associated university with its translations.
+        translations (dict[str, EducationTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    degree: str | None = None
+    grade: float | None = None
+    start_date: datetime.date | None = None
+    end_date: datetime.date | None = None
+    university: InstitutionAllLanguages | None = None
+    translations: dict[str, EducationTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
 class EducationCreate(BaseModel):
     """
     Schema used to create a new Education record together with its
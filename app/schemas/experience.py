@@ -15,7 +15,7 @@ from pydantic import BaseModel
 import datetime
 
 # Import internal dependencies
-from app.schemas.institution import InstitutionRead
+from app.schemas.institution import InstitutionAllLanguages, InstitutionRead
 
 
 class ExperienceBase(BaseModel):
@@ -60,6 +60,48 @@ class ExperienceRead(ExperienceBase):
         orm_mode = True
 
 
+class ExperienceTranslationRead(BaseModel):
+    """
+    Localized fields of an experience record in one language.
+
+    Attributes:
+        title (str | None): The title of the experience.
+        extract (str | None): A short summary or extract of the experience.
+        description (str | None): A detailed description of the experience.
+        industry (str | None): The industry associated with the experience.
+    """
+    title: str | None = None
+    extract: str | None = None
+    description: str | None = None
+    industry: str | None = None
+
+
+class ExperienceAllLanguages(ExperienceBase):
+    """
+    An experience record with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        url (str | None): A URL related to the experience (e.g., company website).
+        start_date (datetime.date | None): The start date of the experience.
+        end_date (datetime.date | None): The end date of the experience.
+        company (InstitutionAllLanguages | None): The associated company with its translations.
+        translations (dict[str, ExperienceTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    url: str | None = None
+    start_date: datetime.date | None = None
+    end_date: datetime.date | None = None
+    company: InstitutionAllLanguages | None = None
+    translations: dict[str, ExperienceTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
 class ExperienceCreate(BaseModel):
     """
     Schema used to create a new Experience record together with its
@@ -43,6 +43,40 @@ class ExpertiseRead(ExpertiseBase):
         orm_mode = True
 
 
+class ExpertiseTranslationRead(BaseModel):
+    """
+    Localized fields of an expertise in one language.
+
+    Attributes:
+        title (str | None): The title of the expertise.
+        description (str | None): A description of the expertise.
+    """
+    title: str | None = None
+    description: str | None = None
+
+
+class ExpertiseAllLanguages(ExpertiseBase):
+    """
+    An expertise with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        icon (str | None): The icon of the expertise.
+        sort (int | None): The sort order of the expertise.
+        translations (dict[str, ExpertiseTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    icon: str | None = None
+    sort: int | None = None
+    translations: dict[str, ExpertiseTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
 class ExpertiseCreate(BaseModel):
     """
     Schema used to create a new Expertise record together with its
@@ -0,0 +1,99 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module defines the Pydantic schemas for the "Image" entity used in the application.
+Images are stored content-addressed on disk, so besides the ID the schemas expose the
+SHA-256 digest, the size and the MIME type of the stored file.
+"""
+
+# Import external dependencies
+from pydantic import BaseModel
+
+
+class ImageBase(BaseModel):
+    """
+    Base model for an image.
+
+    Attributes:
+        id (int): The unique identifier for the image.
+    """
+    id: int
+
+
+class ImagePreview(ImageBase):
+    """
+    Image reference embedded into other objects (e.g. work thumbnails).
+
+    Carries everything needed to render a layout-stable page before the image itself loads.
+
+    Attributes:
+        width (int | None): Width in pixels.
+        height (int | None): Height in pixels.
+        placeholder (str | None): Tiny base64 preview as data URI (low-quality image placeholder).
+    """
+    width: int | None = None
+    height: int | None = None
+    placeholder: str | None = None
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
+class ImageRead(ImagePreview):
+    """
+    Extended model for an image with all metadata of the stored file.
+
+    Attributes:
+        filename (str | None): The content-addressed filename of the image.
+        sha256 (str | None): Hex encoded SHA-256 digest of the file content.
+        size (int | None): File size in bytes.
+        mime_type (str | None): MIME type of the file.
+    """
+    filename: str | None = None
+    sha256: str | None = None
+    size: int | None = None
+    mime_type: str | None = None
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
+class ImageVariantRead(BaseModel):
+    """
+    A resized rendition of an image as listed in the image manifest.
+
+    Attributes:
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+        mime_type (str | None): MIME type of the variant.
+        url (str): Content-addressed URL of the variant.
+    """
+    width: int
+    height: int
+    mime_type: str | None = None
+    url: str
+
+
+class ImageManifestEntry(ImagePreview):
+    """
+    Manifest entry for an image, used by the frontend to build responsive `srcset`s.
+
+    Attributes:
+        mime_type (str | None): MIME type of the original image.
+        url (str): Content-addressed URL of the original image.
+        variants (list[ImageVariantRead]): Available resized variants ordered by width.
+    """
+    mime_type: str | None = None
+    url: str
+    variants: list[ImageVariantRead] = []
@@ -47,6 +47,36 @@ class InstitutionRead(InstitutionBase):
         orm_mode = True
         
         
+class InstitutionTranslationRead(BaseModel):
+    """
+    Localized fields of an institution in one language.
+
+    Attributes:
+        name (str | None): The name of the institution.
+    """
+    name: str | None = None
+
+
+class InstitutionAllLanguages(InstitutionBase):
+    """
+    An institution with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        address (Address | None): The address of the institution.
+        translations (dict[str, InstitutionTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    address: Address | None = None
+    translations: dict[str, InstitutionTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
 class InstitutionCreate(BaseModel):
     """
     Schema used to create a new Institution record together with its
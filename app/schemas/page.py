@@ -59,6 +59,42 @@ class PageRead(PageBase):
         orm_mode = True
 
 
+class PageTranslationRead(BaseModel):
+    """
+    Localized fields of a page in one language.
+
+    Attributes:
+        title (str | None): The title of the page.
+        abstract (str | None): A short abstract of the page.
+        html (str | None): The HTML content of the page.
+    """
+    title: str | None = None
+    abstract: str | None = None
+    html: str | None = None
+
+
+class PageAllLanguages(PageBase):
+    """
+    A page with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        tech_key (str | None): The technical key of the page.
+        creation_date (datetime.date | None): The creation date of the page.
+        translations (dict[str, PageTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    tech_key: str | None = None
+    creation_date: datetime.date | None = None
+    translations: dict[str, PageTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
 class PageCreate(BaseModel):
     """
     Schema used to create a new Page record together with its
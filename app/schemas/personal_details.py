@@ -13,6 +13,9 @@ and serialization in the application.
 # Import external dependencies
 from pydantic import BaseModel
 
+# Import internal dependencies
+from app.schemas.image import ImagePreview
+
 
 class PersonalDetailsBase(BaseModel):
     """
@@ -32,11 +35,14 @@ class PersonalDetails(PersonalDetailsBase):
         name (str | None): The name of the individual.
         position (str | None): The position or title of the individual.
         abstract (str | None): A brief abstract or summary about the individual.
+        profile_picture_id (int | None): The ID of the profile picture image.
+        profile_picture (ImagePreview | None): Dimensions and placeholder of the profile picture.
     """
     name: str | None = None
     position: str | None = None
     abstract: str | None = None
     profile_picture_id: int | None = None
+    profile_picture: ImagePreview | None = None
 
 
     class Config:
@@ -46,6 +46,38 @@ class PersonalInformationRead(PersonalInformationsBase):
         orm_mode = True
 
 
+class PersonalInformationTranslationRead(BaseModel):
+    """
+    Localized fields of a personal information entry in one language.
+
+    Attributes:
+        label (str | None): The label of the entry.
+        value (str | None): The value of the entry.
+    """
+    label: str | None = None
+    value: str | None = None
+
+
+class PersonalInformationAllLanguages(PersonalInformationsBase):
+    """
+    A personal information entry with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        icon (str | None): The icon of the entry.
+        translations (dict[str, PersonalInformationTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    icon: str | None = None
+    translations: dict[str, PersonalInformationTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
+
+
 class PersonalInformationCreate(BaseModel):
     """
     Schema used to create a new personal information record together with its
@@ -0,0 +1,79 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module defines shared Pydantic helpers for localized content.
+
+List routes accepting `?lang=all` return either the entries of a single language or the
+entries with the localized fields of all languages in a `translations` dict.
+`localized_list` builds the response model for these routes; the variant is selected by
+a discriminator instead of trial validation, as validating ORM instances against the
+all-languages schema would access (and lazy load) their `translations` relationship.
+
+`TranslationCoverage` is an entry of the translation coverage report.
+"""
+
+# Import external dependencies
+from typing import Annotated, Any, Union
+from pydantic import BaseModel, Discriminator, Tag
+
+
+ALL_LANGUAGES_TAG = "all"
+SINGLE_LANGUAGE_TAG = "single"
+
+
+def _translations_mode(value: Any) -> str:
+    """
+    Tell whether a list of entries carries the translations of all languages.
+    """
+    first = value[0] if isinstance(value, list) and value else None
+
+    if isinstance(first, BaseModel):
+        has_translations = "translations" in type(first).model_fields
+    else:
+        # ORM instances have a `translations` relationship, but are always single-language entries
+        has_translations = isinstance(first, dict) and "translations" in first
+
+    return ALL_LANGUAGES_TAG if has_translations else SINGLE_LANGUAGE_TAG
+
+
+def localized_list(read_schema: type[BaseModel], all_languages_schema: type[BaseModel]):
+    """
+    Build the response model of a list route supporting `?lang=all`.
+
+    Args:
+        read_schema (type[BaseModel]): Schema of an entry in a single language.
+        all_languages_schema (type[BaseModel]): Schema of an entry with all translations.
+
+    Returns:
+        A discriminated union of `list[all_languages_schema]` and `list[read_schema]`.
+    """
+    return Annotated[
+        Union[
+            Annotated[list[all_languages_schema], Tag(ALL_LANGUAGES_TAG)],
+            Annotated[list[read_schema], Tag(SINGLE_LANGUAGE_TAG)],
+        ],
+        Discriminator(_translations_mode),
+    ]
+
+
+class TranslationCoverage(BaseModel):
+    """
+    Translation coverage of one translated entity in one language.
+
+    Attributes:
+        entity (str): Name of the translated entity (e.g. "experience").
+        language (str): ISO 639-1 code of the language.
+        total (int): Number of entries of the entity.
+        translated (int): Number of entries translated into the language.
+        missing (int): Number of entries without a translation into the language.
+        coverage (float): Share of translated entries (0.0 - 1.0).
+        missing_ids (list[int]): IDs of the entries without a translation.
+    """
+    entity: str
+    language: str
+    total: int
+    translated: int
+    missing: int
+    coverage: float
+    missing_ids: list[int] = []
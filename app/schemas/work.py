@@ -10,7 +10,8 @@ The schemas are used for data validation and serialization/deserialization of wo
 from pydantic import BaseModel
 
 # Import internal dependencies
-from app.schemas.category import Category
+from app.schemas.category import Category, CategoryAllLanguages
+from app.schemas.image import ImagePreview
 
 
 class WorkBase(BaseModel):
@@ -30,12 +31,14 @@ class Work(WorkBase):
     Attributes:
         title (str | None): The title of the work.
         url (str | None): The URL associated with the work.
-        thumbnail (str | None): The thumbnail image URL for the work.
+        thumbnail_id (int | None): The ID of the thumbnail image for the work.
+        thumbnail (ImagePreview | None): Dimensions and placeholder of the thumbnail image.
         categories (list[Category] | None): A list of categories associated with the work.
     """
     title: str | None = None
     url: str | None = None
     thumbnail_id: int | None = None
+    thumbnail: ImagePreview | None = None
     categories: list[Category] | None = None
 
     class Config:
@@ -45,3 +48,39 @@ class Work(WorkBase):
         Enables ORM mode to allow compatibility with SQLAlchemy models.
         """
         orm_mode = True
+
+
+class WorkTranslationRead(BaseModel):
+    """
+    Localized fields of a work in one language.
+
+    Attributes:
+        title (str | None): The title of the work.
+    """
+    title: str | None = None
+
+
+class WorkAllLanguages(WorkBase):
+    """
+    A work with the localized fields of all languages (`?lang=all`).
+
+    Attributes:
+        url (str | None): The URL of the work.
+        thumbnail_id (int | None): The ID of the thumbnail image.
+        thumbnail (ImagePreview | None): The thumbnail preview (dimensions and placeholder).
+        categories (list[CategoryAllLanguages]): The categories of the work with their translations.
+        translations (dict[str, WorkTranslationRead]): Localized fields keyed by ISO 639-1 code.
+    """
+    url: str | None = None
+    thumbnail_id: int | None = None
+    thumbnail: ImagePreview | None = None
+    categories: list[CategoryAllLanguages] = []
+    translations: dict[str, WorkTranslationRead]
+
+    class Config:
+        """
+        Configuration for the Pydantic model.
+
+        Enables ORM mode to allow compatibility with SQLAlchemy models.
+        """
+        orm_mode = True
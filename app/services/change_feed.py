@@ -0,0 +1,187 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module turns Postgres change notifications into cache evictions.
+
+Triggers on the content, translation and lookup tables (see the migration
+`add_change_notification_triggers`) publish every committed change as
+`{"table": ..., "op": ..., "id": ...}` on the `table_changed` channel, no matter whether
+it was written by the API, psql, a data migration or a seeding script. Every worker runs one
+listener on a dedicated asyncpg connection (started in the application lifespan) and
+dispatches the notifications to the handlers subscribed for the changed table.
+
+Handlers receive a `Change` and must not block. If the listening connection is lost,
+notifications may have been missed; after reconnecting, every handler is therefore called
+once with `op == RESYNC` and `row_id is None`, meaning "drop everything".
+"""
+
+# Import external dependencies
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
+
+import asyncpg
+
+# Import internal dependencies
+from app.core import config
+
+
+logger = logging.getLogger(__name__)
+
+# Channel the triggers notify (see the migration `add_change_notification_triggers`)
+CHANNEL = "table_changed"
+
+# Operation passed to the handlers after (re)connecting
+RESYNC = "RESYNC"
+
+# Delay between reconnection attempts in seconds (doubled after each failure)
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 60
+
+
+@dataclass(frozen=True)
+class Change:
+    """
+    A committed change of a table.
+
+    Attributes:
+        table (str): Name of the changed table.
+        op (str): INSERT, UPDATE, DELETE, TRUNCATE or RESYNC.
+        row_id (int | str | None): ID of the changed row (str for non-integer IDs such as
+            UUIDs), or None if unknown (TRUNCATE, RESYNC, tables without an id column).
+    """
+    table: str
+    op: str
+    row_id: int | str | None = None
+
+
+_handlers: dict[str, list[Callable[[Change], None]]] = defaultdict(list)
+_task: asyncio.Task | None = None
+
+
+def subscribe(tables: str | list[str], handler: Callable[[Change], None]):
+    """
+    Call a handler for every change of the given tables.
+
+    Args:
+        tables (str | list[str]): Table name(s).
+        handler (Callable[[Change], None]): Non-blocking callback.
+    """
+    for table in [tables] if isinstance(tables, str) else tables:
+        _handlers[table].append(handler)
+
+
+def asyncpg_dsn() -> str:
+    """
+    Return the configured database URL in the form understood by asyncpg.
+
+    Returns:
+        str: `DB_CONNECTION` without the SQLAlchemy driver suffix (`postgresql+asyncpg://`).
+    """
+    scheme, separator, rest = config.DB_CONNECTION.partition("://")
+    return scheme.split("+")[0] + separator + rest
+
+
+def dispatch(change: Change):
+    """
+    Call the handlers subscribed for the changed table; failing handlers are logged and skipped.
+
+    Args:
+        change (Change): The change.
+    """
+    for handler in _handlers.get(change.table, []):
+        try:
+            handler(change)
+        except Exception:
+            logger.exception("Change handler %r failed for %s", handler, change)
+
+
+def _on_notification(connection, pid, channel, payload):
+    try:
+        data = json.loads(payload)
+        row_id = data.get("id")
+        change = Change(
+            table=data["table"],
+            op=data["op"],
+            row_id=int(row_id) if isinstance(row_id, str) and row_id.isdigit() else row_id,
+        )
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed change notification %r", payload)
+        return
+
+    dispatch(change)
+
+
+def _resync():
+    for table in list(_handlers):
+        dispatch(Change(table=table, op=RESYNC))
+
+
+async def _listen():
+    """
+    Keep a listening connection open, reconnecting with exponential backoff.
+    """
+    delay = RECONNECT_DELAY
+    while True:
+        # CancelledError is no Exception and ends the loop when the worker stops
+        try:
+            connection = await asyncpg.connect(asyncpg_dsn())
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("Change feed cannot connect (%s); retrying in %ss", e, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            continue
+        except Exception:
+            logger.exception("Change feed cannot connect; retrying in %ss", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            continue
+
+        try:
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(CHANNEL, _on_notification)
+
+            # changes committed while nobody was listening are unknown
+            _resync()
+            delay = RECONNECT_DELAY
+
+            await lost.wait()
+            logger.warning("Change feed connection lost; reconnecting")
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("Change feed failed (%s); reconnecting", e)
+        except Exception:
+            # an unexpected error must not end the listener; back off so it cannot spin
+            logger.exception("Change feed failed; reconnecting in %ss", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+        finally:
+            if not connection.is_closed():
+                connection.terminate()
+
+
+async def start():
+    """
+    Start the listener task of this worker (no-op if disabled via `CHANGE_FEED_ENABLED`).
+    """
+    global _task
+    if config.CHANGE_FEED_ENABLED and _task is None:
+        _task = asyncio.create_task(_listen(), name="change-feed")
+
+
+async def stop():
+    """
+    Stop the listener task and close its connection.
+    """
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
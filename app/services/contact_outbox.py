@@ -0,0 +1,220 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module delivers stored contact requests by mail (transactional outbox).
+
+`POST /contact/` only stores the request; the `contact` table is the outbox. The worker of
+this module polls it every `CONTACT_OUTBOX_INTERVAL` seconds, claims a batch of due contacts
+(see `claim_due_contacts`, which uses `FOR UPDATE SKIP LOCKED`, so any number of API workers
+and job processes can run it side by side without sending a message twice), delivers them
+over one SMTP connection and records the outcome per message.
+
+Failed deliveries are retried after `CONTACT_OUTBOX_RETRY_DELAY` seconds, doubling with every
+attempt (capped at `MAX_RETRY_DELAY`), until `CONTACT_OUTBOX_MAX_ATTEMPTS` is reached.
+Permanent failures (5xx SMTP replies, invalid addresses) are not retried. Given up contacts
+keep `send = false` and the reason in `last_error`.
+
+Delivery is at least once: if a worker dies between sending a message and recording it,
+the message is sent again after the claim lease has expired.
+
+For local development, a debugging SMTP server printing all messages can be started with
+`python -m aiosmtpd -n -l localhost:1025` (with `SMTP_PORT=1025` and `SMTP_SECURITY=none`).
+"""
+
+# Import external dependencies
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import formataddr
+
+import aiosmtplib
+
+# Import internal dependencies
+from app.core import config
+from app.db.database import async_session_maker
+from app.db.queries import contact as crud
+
+
+logger = logging.getLogger(__name__)
+
+# Time a claimed batch is reserved for the claiming worker
+CLAIM_LEASE = timedelta(minutes=5)
+
+# Upper bound of the delay between two delivery attempts
+MAX_RETRY_DELAY = timedelta(hours=6)
+
+_task: asyncio.Task | None = None
+
+
+def build_message(contact: dict) -> EmailMessage:
+    """
+    Build the mail forwarding a contact request to `CONTACT_MAIL_TO`.
+
+    Args:
+        contact (dict): A claimed contact (see `claim_due_contacts`).
+
+    Returns:
+        EmailMessage: The mail, with the sender of the request as `Reply-To`.
+
+    Raises:
+        ValueError: If a header value is invalid (e.g. contains line breaks).
+    """
+    received = contact["creation_date"]
+    # the name comes from a form field and must not break the header lines
+    name = " ".join((contact["name"] or "").split())
+    domain = config.CONTACT_MAIL_FROM.rpartition("@")[2] or "localhost"
+
+    message = EmailMessage()
+    message["From"] = config.CONTACT_MAIL_FROM
+    message["To"] = config.CONTACT_MAIL_TO
+    message["Reply-To"] = formataddr((name, contact["email"]))
+    message["Subject"] = f"Contact request from {name}"
+    # stable per contact, so a message delivered twice can be recognized as duplicate
+    message["Message-ID"] = f"<contact-{contact['id']}@{domain}>"
+    message.set_content(
+        f"{contact['message']}\n\n"
+        f"--\n"
+        f"Name: {contact['name']}\n"
+        f"Email: {contact['email']}\n"
+        f"Language: {contact['lang']}\n"
+        f"Received: {f'{received:%Y-%m-%d %H:%M} UTC' if received else 'unknown'}\n"
+    )
+    return message
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Return the delay before the next delivery attempt.
+
+    Args:
+        attempts (int): Number of attempts made so far (>= 1).
+
+    Returns:
+        timedelta: `CONTACT_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)`, at most `MAX_RETRY_DELAY`.
+    """
+    delay = timedelta(seconds=config.CONTACT_OUTBOX_RETRY_DELAY * 2 ** min(attempts - 1, 20))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def is_permanent(error: Exception) -> bool:
+    """
+    Tell whether retrying a failed delivery is pointless.
+    """
+    if isinstance(error, ValueError):
+        return True
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(refused.code >= 500 for refused in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return error.code >= 500
+    return False
+
+
+def smtp_client() -> aiosmtplib.SMTP:
+    """
+    Return an unconnected client for the configured SMTP server (`SMTP_*`).
+    """
+    return aiosmtplib.SMTP(
+        hostname=config.SMTP_HOST,
+        port=config.SMTP_PORT,
+        username=config.SMTP_USERNAME,
+        password=config.SMTP_PASSWORD,
+        use_tls=config.SMTP_SECURITY == "tls",
+        start_tls=config.SMTP_SECURITY == "starttls",
+        timeout=config.SMTP_TIMEOUT,
+    )
+
+
+async def _record_failure(contact: dict, error: Exception, db):
+    if is_permanent(error) or contact["attempts"] >= config.CONTACT_OUTBOX_MAX_ATTEMPTS:
+        retry_at = None
+        logger.error("Giving up delivery of contact %s after %s attempts: %s",
+                     contact["id"], contact["attempts"], error)
+    else:
+        retry_at = datetime.now(timezone.utc).replace(tzinfo=None) + retry_delay(contact["attempts"])
+        logger.warning("Delivery of contact %s failed (attempt %s), retrying at %s: %s",
+                       contact["id"], contact["attempts"], retry_at, error)
+
+    await crud.mark_contact_failed(contact["id"], f"{type(error).__name__}: {error}"[:1000], retry_at, db)
+
+
+async def deliver_due_contacts(batch_size: int | None = None) -> int:
+    """
+    Claim and deliver one batch of due contacts.
+
+    Args:
+        batch_size (int | None): Maximum number of contacts; defaults to `CONTACT_OUTBOX_BATCH_SIZE`.
+
+    Returns:
+        int: Number of claimed contacts (delivered or not).
+    """
+    async with async_session_maker() as db:
+        contacts = await crud.claim_due_contacts(
+            db, batch_size or config.CONTACT_OUTBOX_BATCH_SIZE, CLAIM_LEASE
+        )
+        if not contacts:
+            return 0
+
+        smtp = smtp_client()
+        try:
+            await smtp.connect()
+        except (aiosmtplib.SMTPException, OSError) as e:
+            for contact in contacts:
+                await _record_failure(contact, e, db)
+            return len(contacts)
+
+        try:
+            for contact in contacts:
+                try:
+                    await smtp.send_message(build_message(contact))
+                except (aiosmtplib.SMTPException, OSError, ValueError) as e:
+                    await _record_failure(contact, e, db)
+                    continue
+                await crud.mark_contact_sent(contact["id"], db)
+        finally:
+            if smtp.is_connected:
+                try:
+                    await smtp.quit()
+                except aiosmtplib.SMTPException:
+                    smtp.close()
+
+    return len(contacts)
+
+
+async def run():
+    """
+    Deliver due contacts until cancelled; full batches are followed by the next one immediately.
+    """
+    while True:
+        try:
+            claimed = await deliver_due_contacts()
+        except Exception:
+            logger.exception("Contact outbox run failed")
+            claimed = 0
+
+        if claimed < config.CONTACT_OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(config.CONTACT_OUTBOX_INTERVAL)
+
+
+async def start():
+    """
+    Start the outbox worker of this process (no-op unless `CONTACT_OUTBOX_ENABLED`).
+    """
+    global _task
+    if config.CONTACT_OUTBOX_ENABLED and _task is None:
+        _task = asyncio.create_task(run(), name="contact-outbox")
+
+
+async def stop():
+    """
+    Stop the outbox worker; a batch being delivered is reclaimed after its lease expired.
+    """
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,197 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module batches the inserts of contact submissions (write-behind).
+
+With `CONTACT_WRITE_BEHIND` enabled, `POST /contact/` only validates a submission, puts it
+into a bounded in-process queue and answers `202 Accepted`. A background flusher collects
+queued contacts until `CONTACT_WRITE_BEHIND_BATCH_SIZE` rows are queued or
+`CONTACT_WRITE_BEHIND_INTERVAL_MS` milliseconds passed since the first one, and inserts
+them with a single multi-row statement on one pooled connection. A burst of submissions
+thus costs a few inserts instead of one connection and transaction per request.
+
+If the queue is full (e.g. while the database is unreachable), submissions are rejected
+with `503`, so memory stays bounded. Failed inserts are retried with backoff a bounded number
+of times. If the database rejects a batch (constraint or data errors), its rows are inserted
+one by one and the offending rows are logged and dropped, so they cannot block the others. On
+shutdown the queue is flushed before the worker exits.
+"""
+
+# Import external dependencies
+import asyncio
+import logging
+from datetime import datetime, timezone
+from sqlalchemy.exc import DataError, IntegrityError
+
+# Import internal dependencies
+from app.core import config
+from app.db.database import async_session_maker
+from app.db.queries import contact as crud
+from app.schemas.contact import SendingContact
+
+
+logger = logging.getLogger(__name__)
+
+# Delay before a failed insert is retried, in seconds; doubled per attempt up to MAX_RETRY_DELAY
+RETRY_DELAY = 1
+MAX_RETRY_DELAY = 30
+# Attempts to store a batch before its contacts are logged and dropped
+MAX_ATTEMPTS = 8
+
+_queue: asyncio.Queue | None = None
+_task: asyncio.Task | None = None
+# Set once enough contacts are queued to fill a batch, so the flusher need not wait any longer
+_batch_full: asyncio.Event | None = None
+
+
+class QueueFull(RuntimeError):
+    """Raised if a contact cannot be queued because the queue is full."""
+
+
+def enqueue(contact: SendingContact, language_id: int):
+    """
+    Queue a validated contact for insertion.
+
+    Args:
+        contact (SendingContact): The submitted contact.
+        language_id (int): ID of the language of the submission.
+
+    Raises:
+        QueueFull: If the queue is full or the writer is not running.
+    """
+    if _queue is None:
+        raise QueueFull("The contact writer is not running")
+
+    # naive UTC, as the date columns are TIMESTAMP WITHOUT TIME ZONE
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    try:
+        _queue.put_nowait({
+            "name": contact.name,
+            "email": contact.email,
+            "message": contact.message,
+            "creation_date": now,
+            "send": False,
+            "attempts": 0,
+            "next_attempt_date": now,
+            "language_id": language_id,
+        })
+    except asyncio.QueueFull:
+        raise QueueFull("Too many contacts are waiting to be stored")
+
+    # the flusher holds one contact while waiting
+    if _queue.qsize() + 1 >= config.CONTACT_WRITE_BEHIND_BATCH_SIZE:
+        _batch_full.set()
+
+
+async def _collect(queue: asyncio.Queue, batch: list[dict]):
+    """
+    Wait for the first queued contact, then collect until the batch is full or the interval passed.
+    """
+    batch.append(await queue.get())
+
+    if queue.qsize() + len(batch) < config.CONTACT_WRITE_BEHIND_BATCH_SIZE:
+        _batch_full.clear()
+        try:
+            await asyncio.wait_for(_batch_full.wait(), config.CONTACT_WRITE_BEHIND_INTERVAL_MS / 1000)
+        except asyncio.TimeoutError:
+            pass
+
+    while len(batch) < config.CONTACT_WRITE_BEHIND_BATCH_SIZE and not queue.empty():
+        batch.append(queue.get_nowait())
+
+
+async def _insert(batch: list[dict]):
+    async with async_session_maker() as db:
+        await crud.insert_contacts(batch, db)
+
+
+async def _store(batch: list[dict]):
+    """
+    Insert a batch; stored rows are removed from it, so a retry only covers the remaining ones.
+
+    If the database rejects the batch because of its content, the rows are inserted one by one
+    and rejected rows are logged and dropped.
+    """
+    try:
+        await _insert(batch)
+        batch.clear()
+        return
+    except (IntegrityError, DataError):
+        logger.warning("Storing %s queued contacts was rejected; inserting them one by one", len(batch))
+
+    for contact in list(batch):
+        try:
+            await _insert([contact])
+        except (IntegrityError, DataError):
+            logger.exception("Dropping queued contact rejected by the database: %r", contact)
+        batch.remove(contact)
+
+
+async def _flush_remaining(queue: asyncio.Queue, pending: list[dict]):
+    """
+    Insert the pending batch and everything still queued (used on shutdown).
+    """
+    while not queue.empty():
+        pending.append(queue.get_nowait())
+
+    for start in range(0, len(pending), config.CONTACT_WRITE_BEHIND_BATCH_SIZE):
+        batch = pending[start:start + config.CONTACT_WRITE_BEHIND_BATCH_SIZE]
+        try:
+            await _store(batch)
+        except Exception:
+            logger.exception("Could not store %s queued contacts on shutdown: %r", len(batch), batch)
+
+
+async def run(queue: asyncio.Queue):
+    """
+    Insert queued contacts in batches until cancelled, then flush the queue.
+    """
+    batch: list[dict] = []
+    try:
+        while True:
+            await _collect(queue, batch)
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    await _store(batch)
+                    break
+                except Exception:
+                    if attempt == MAX_ATTEMPTS:
+                        logger.exception(
+                            "Dropping %s queued contacts after %s failed attempts: %r", len(batch), attempt, batch
+                        )
+                        break
+                    delay = min(RETRY_DELAY * 2 ** (attempt - 1), MAX_RETRY_DELAY)
+                    logger.exception("Storing %s queued contacts failed; retrying in %ss", len(batch), delay)
+                    await asyncio.sleep(delay)
+            batch = []
+    except asyncio.CancelledError:
+        await _flush_remaining(queue, batch)
+        raise
+
+
+async def start():
+    """
+    Start the writer of this process (no-op unless `CONTACT_WRITE_BEHIND`).
+    """
+    global _queue, _task, _batch_full
+    if config.CONTACT_WRITE_BEHIND and _task is None:
+        _queue = asyncio.Queue(maxsize=config.CONTACT_WRITE_BEHIND_QUEUE_SIZE)
+        _batch_full = asyncio.Event()
+        _task = asyncio.create_task(run(_queue), name="contact-writer")
+
+
+async def stop():
+    """
+    Stop accepting contacts and store all queued ones.
+    """
+    global _queue, _task
+    if _task is not None:
+        _queue = None
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
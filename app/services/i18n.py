@@ -2,26 +2,298 @@
 Author: Simon Neidig <mail@simon-neidig.eu>
 
 Description:
-This module provides a utility function for handling internationalization (i18n).
+This module provides utility functions for handling internationalization (i18n).
 
-The `get_language` function extracts the preferred language from the `Accept-Language`
-header of an incoming HTTP request. It defaults to English ("en") if no language
-is specified in the header.
+The `get_language` dependency negotiates the response language from the `Accept-Language`
+header of an incoming HTTP request. The weighted language ranges of the header are matched
+against the languages stored in the `language` table with the "lookup" scheme of RFC 4647
+(section 3.4): ranges are tried in order of their q-value and each range is truncated
+subtag by subtag (`de-CH-1996` -> `de-CH` -> `de`) until a supported language is found.
+If nothing matches, `DEFAULT_LANGUAGE` is used.
+
+Clients and CDNs may instead select the language explicitly with the `lang` query
+parameter. It is normalized the same way (`?lang=de_DE` -> `de`); requests for a
+non-canonical value are redirected to the canonical URL, so a cache only ever sees one URL
+per language. Responses carry `Content-Language`, and `Vary: Accept-Language` whenever the
+header decided the language.
+
+List routes additionally accept `?lang=all` (see `get_language_or_all`) and then return the
+localized fields of every language at once, keyed by ISO 639-1 code, so the frontend can
+switch languages without refetching.
+
+Parsing is memoized per raw header value, as browsers send only a few dozen distinct
+headers, and the supported languages are cached for `LANGUAGE_CACHE_TTL` seconds, or until
+the change feed reports a change of the `language` table.
 """
 
-from fastapi import Request
+# Import external dependencies
+import re
+import time
+from functools import lru_cache
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Import internal dependencies
+from app.core import config
+from app.db.queries import language as crud
+from app.services import change_feed, metrics
+from app.services.db import get_async_session
+
+
+# Language range as defined by RFC 4647 (e.g. "*", "en", "de-ch", "zh-hant-tw")
+LANGUAGE_RANGE = re.compile(r"^(\*|[a-z]{1,8}(-[a-z0-9]{1,8})*)$")
+
+# Value of the `lang` query parameter requesting all translations at once
+ALL_LANGUAGES = "all"
+
+# Cached mapping of supported ISO 639-1 codes to language IDs and the time it was loaded
+_language_ids: dict[str, int] = {}
+_language_ids_loaded: float | None = None
+
+
+@lru_cache(maxsize=256)
+def parse_accept_language(header: str) -> tuple[str, ...]:
+    """
+    Parse an `Accept-Language` header into its language ranges ordered by preference.
+
+    Ranges are lowercased and sorted by descending q-value; ranges with equal weight keep
+    the order of the header. Malformed entries and ranges with `q=0` (not acceptable) are
+    dropped.
+
+    Args:
+        header (str): The raw header value (e.g. "de-CH, de;q=0.9, en;q=0.8, *;q=0.5").
+
+    Returns:
+        tuple[str, ...]: The language ranges (e.g. ("de-ch", "de", "en", "*")).
+    """
+    ranges = []
+    for position, entry in enumerate(header.split(",")):
+        tag, *params = (part.strip() for part in entry.split(";"))
+        tag = tag.lower()
+        if not LANGUAGE_RANGE.match(tag):
+            continue
+
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = -1.0
+        if not 0 < weight <= 1:
+            continue
+
+        ranges.append((-weight, position, tag))
+
+    return tuple(tag for _, _, tag in sorted(ranges))
+
+
+def normalize_language_tag(value: str) -> str | None:
+    """
+    Normalize a language tag given by a client to its canonical lowercase form.
+
+    Args:
+        value (str): The tag (e.g. " de_DE ", "EN-gb").
+
+    Returns:
+        str | None: The normalized tag (e.g. "de-de", "en-gb"), or None if it is malformed.
+    """
+    tag = value.strip().lower().replace("_", "-")
+    if tag == "*" or not LANGUAGE_RANGE.match(tag):
+        return None
+    return tag
+
+
+def lookup(ranges: tuple[str, ...], supported, default: str | None) -> str | None:
+    """
+    Select the best supported language for a list of language ranges (RFC 4647 lookup).
+
+    Args:
+        ranges (tuple[str, ...]): Language ranges ordered by preference.
+        supported: Container of supported lowercase language tags.
+        default (str | None): Language returned if no range matches.
 
+    Returns:
+        str | None: The matching supported language, or `default`.
+    """
+    for language_range in ranges:
+        # the wildcard does not select a specific language; lookup falls back to the default
+        if language_range == "*":
+            continue
+
+        tag = language_range
+        while tag:
+            if tag in supported:
+                return tag
+            tag = tag.rpartition("-")[0]
+            # a single-character subtag (e.g. "x" in "de-x-foo") must not end up at the end
+            if len(tag) > 1 and tag[-2] == "-":
+                tag = tag[:-2]
 
-def get_language(request: Request):
+    return default
+
+
+async def get_language_ids(db: AsyncSession) -> dict[str, int]:
     """
-    Extract the preferred language from the `Accept-Language` header.
+    Return the supported languages as mapping of ISO 639-1 code to language ID.
+
+    The mapping is read from the database at most once per `LANGUAGE_CACHE_TTL` seconds.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        dict[str, int]: Mapping of lowercase ISO 639-1 codes to language IDs.
+    """
+    global _language_ids, _language_ids_loaded
+
+    now = time.monotonic()
+    if _language_ids_loaded is None or now - _language_ids_loaded >= config.LANGUAGE_CACHE_TTL:
+        metrics.cache_miss("language_ids")
+        _language_ids = await crud.get_language_ids(db)
+        _language_ids_loaded = now
+    else:
+        metrics.cache_hit("language_ids")
+
+    return _language_ids
+
+
+def invalidate_language_ids():
+    """
+    Drop the cached supported languages, e.g. after a language was added.
+    """
+    global _language_ids_loaded
+    _language_ids_loaded = None
+
+
+change_feed.subscribe("language", lambda change: invalidate_language_ids())
+
+
+def _redirect_to_canonical(request: Request, code: str):
+    """
+    Redirect GET and HEAD requests to the URL carrying the canonical `lang` value.
+
+    Raises:
+        HTTPException(308): For GET and HEAD requests.
+    """
+    if request.method in ("GET", "HEAD"):
+        raise HTTPException(
+            status_code=status.HTTP_308_PERMANENT_REDIRECT,
+            detail=f"Use the canonical language code '{code}'",
+            headers={"Location": str(request.url.include_query_params(lang=code))},
+        )
+
+
+async def get_language(
+    request: Request,
+    response: Response,
+    lang: str | None = Query(
+        default=None,
+        description="ISO 639-1 code of the response language; overrides the Accept-Language header.",
+    ),
+    db: AsyncSession = Depends(get_async_session),
+) -> str:
+    """
+    Determine the response language from the `lang` query parameter or the `Accept-Language` header.
+
+    Sets `Content-Language` on the response, and `Vary: Accept-Language` if the language was
+    negotiated from the header.
 
     Args:
         request (Request): The incoming HTTP request.
+        response (Response): The response whose headers are set.
+        lang (str | None): Explicitly requested language (query parameter).
+        db (AsyncSession): Database session, injected via dependency.
 
     Returns:
-        str: The preferred language code (e.g., "en", "de").
+        str: A supported ISO 639-1 language code (e.g., "en", "de"), or `DEFAULT_LANGUAGE`.
+
+    Raises:
+        HTTPException(308): If `lang` is supported but not given in its canonical form.
+        HTTPException(400): If `lang` is malformed or not supported.
     """
-    lang = request.headers.get("accept-language", "en")
-    code = lang.split(",")[0].strip().lower()  # e.g., "en-GB,de;q=0.9" -> "en-GB"
-    return code.split("-")[0]  # "en-GB" -> "en", "de" -> "de"
+    supported = await get_language_ids(db)
+
+    if lang is not None:
+        tag = normalize_language_tag(lang)
+        code = lookup((tag,), supported, default=None) if tag else None
+        if code is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported language '{lang}'. Supported languages: {', '.join(sorted(supported))}",
+            )
+
+        if code != lang:
+            _redirect_to_canonical(request, code)
+    else:
+        ranges = parse_accept_language(request.headers.get("accept-language", ""))
+        code = lookup(ranges, supported, config.DEFAULT_LANGUAGE)
+        response.headers.add_vary_header("Accept-Language")
+
+    response.headers["Content-Language"] = code
+    return code
+
+
+async def get_language_or_all(
+    request: Request,
+    response: Response,
+    lang: str | None = Query(
+        default=None,
+        description="ISO 639-1 code of the response language, or 'all' for the translations of all "
+                    "languages; overrides the Accept-Language header.",
+    ),
+    db: AsyncSession = Depends(get_async_session),
+) -> str:
+    """
+    Like `get_language`, but additionally accepts `lang=all`.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        response (Response): The response whose headers are set.
+        lang (str | None): Explicitly requested language (query parameter).
+        db (AsyncSession): Database session, injected via dependency.
+
+    Returns:
+        str: A supported ISO 639-1 language code, or `ALL_LANGUAGES`.
+    """
+    if lang is not None and lang.strip().lower() == ALL_LANGUAGES:
+        if lang != ALL_LANGUAGES:
+            _redirect_to_canonical(request, ALL_LANGUAGES)
+        # Content-Language may list several languages (RFC 9110, section 8.5)
+        response.headers["Content-Language"] = ", ".join(sorted(await get_language_ids(db)))
+        return ALL_LANGUAGES
+
+    return await get_language(request, response, lang, db)
+
+
+def get_requested_language(
+    request: Request,
+    lang: str | None = Query(
+        default=None,
+        description="ISO 639-1 code of the content language; overrides the Accept-Language header.",
+    ),
+) -> str:
+    """
+    Return the primary subtag of the requested language, supported or not.
+
+    Used by admin routes creating content, which may introduce a new language.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        lang (str | None): Explicitly requested language (query parameter).
+
+    Returns:
+        str: The requested language code (e.g., "en", "de"), or `DEFAULT_LANGUAGE`.
+
+    Raises:
+        HTTPException(400): If `lang` is malformed.
+    """
+    if lang is not None:
+        tag = normalize_language_tag(lang)
+        if tag is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid language '{lang}'")
+        return tag.split("-")[0]
+
+    ranges = [r for r in parse_accept_language(request.headers.get("accept-language", "")) if r != "*"]
+    return ranges[0].split("-")[0] if ranges else config.DEFAULT_LANGUAGE
@@ -0,0 +1,111 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module builds the HTTP response that delivers an image file to the client.
+
+Depending on `IMAGE_DELIVERY` the file is either streamed by the worker itself (`direct`)
+or the response only carries an `X-Accel-Redirect` (nginx) or `X-Sendfile` header and an
+empty body, so the reverse proxy sends the file and the worker is free for API traffic.
+Lookup and authorization always happen in the application before the handover.
+
+Files kept in an object store (`IMAGE_STORAGE=s3`) are streamed through from the backend
+chunk by chunk, or, with `IMAGE_PRESIGNED_REDIRECT`, the client is redirected to a
+short-lived presigned URL and downloads the file from the object store directly.
+
+Example nginx location for `x-accel-redirect` with the default prefix:
+
+    location /protected-images/ {
+        internal;
+        alias /code/images/;
+    }
+"""
+
+# Import external dependencies
+import os
+from fastapi import HTTPException, Response
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+
+# Import internal dependencies
+from app.core import config
+from app.services.storage import StorageError, StorageUnavailable, get_storage
+
+
+DELIVERY_DIRECT = "direct"
+DELIVERY_X_ACCEL_REDIRECT = "x-accel-redirect"
+DELIVERY_X_SENDFILE = "x-sendfile"
+
+
+def _accel_redirect_uri(filepath: str) -> str | None:
+    """
+    Map a file below the image directory to the internal nginx location.
+
+    Returns:
+        str | None: The internal URI, or None if the file is not stored below `IMAGE_DIR`.
+    """
+    relative = os.path.relpath(os.path.abspath(filepath), os.path.abspath(config.IMAGE_DIR))
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return None
+    return config.IMAGE_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + relative.replace(os.sep, "/")
+
+
+def storage_exception(error: StorageError) -> HTTPException:
+    """
+    Map a storage backend failure to an HTTP error: 503 if the backend is unreachable,
+    502 if it rejected the request.
+    """
+    if isinstance(error, StorageUnavailable):
+        return HTTPException(status_code=503, detail="Image storage is unavailable")
+    return HTTPException(status_code=502, detail="Image storage rejected the request")
+
+
+async def image_response(filepath: str, media_type: str) -> Response:
+    """
+    Build the response delivering an image file according to the configured storage and delivery mode.
+
+    Args:
+        filepath (str): Location of the file in the storage backend.
+        media_type (str): MIME type sent to the client.
+
+    Returns:
+        Response: A FileResponse or StreamingResponse, an empty response with an offload
+        header, or a redirect to a presigned URL.
+
+    Raises:
+        HTTPException(404): If the file is served by the application and missing in storage.
+        HTTPException(502/503): If the storage backend rejects the request or is unreachable.
+    """
+    storage = get_storage()
+
+    if config.IMAGE_PRESIGNED_REDIRECT:
+        url = storage.presigned_url(filepath, config.IMAGE_PRESIGNED_EXPIRES)
+        if url is not None:
+            # clients may reuse the redirect while the signature is still valid
+            return RedirectResponse(url, headers={"Cache-Control": f"max-age={config.IMAGE_PRESIGNED_EXPIRES // 2}"})
+
+    local_path = storage.local_path(filepath)
+    if local_path is None:
+        try:
+            stored = await storage.open(filepath)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Image file missing in storage")
+        except StorageError as e:
+            raise storage_exception(e)
+
+        headers = {"Content-Length": str(stored.size)} if stored.size is not None else None
+        return StreamingResponse(stored.chunks, media_type=media_type, headers=headers)
+
+    if config.IMAGE_DELIVERY == DELIVERY_X_SENDFILE:
+        return Response(media_type=media_type, headers={"X-Sendfile": os.path.abspath(local_path)})
+
+    if config.IMAGE_DELIVERY == DELIVERY_X_ACCEL_REDIRECT:
+        uri = _accel_redirect_uri(local_path)
+        # files outside of the image directory are not reachable via the internal location
+        if uri is not None:
+            return Response(media_type=media_type, headers={"X-Accel-Redirect": uri})
+
+    if not os.path.exists(local_path):
+        raise HTTPException(
+            status_code=404, detail="Image file missing on disk")
+
+    return FileResponse(local_path, media_type=media_type)
@@ -0,0 +1,243 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module derives metadata and resized variants from image files with Pillow.
+
+`inspect_image` is called once per image at ingest time and returns the displayed
+dimensions together with a tiny base64 encoded preview (LQIP, low-quality image
+placeholder). Both are stored on the Image row and embedded into API responses so the
+frontend can reserve the correct space and show a blurred preview before the image loads.
+`render_variants` renders the downscaled WebP renditions used for responsive `srcset`s and
+`optimize_image` recompresses originals without visible loss and strips their metadata.
+"""
+
+# Import external dependencies
+import base64
+import hashlib
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+# Longest edge of the placeholder preview in pixels
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 50
+
+# Encoding of the resized variants
+VARIANT_QUALITY = 80
+VARIANT_MIME_TYPE = "image/webp"
+
+# EXIF tag holding the orientation; it is kept when metadata is stripped
+ORIENTATION_TAG = 0x0112
+
+
+class InvalidImage(ValueError):
+    """Raised if a file cannot be decoded as an image."""
+
+
+@dataclass
+class ImageMetadata:
+    """
+    Metadata derived from an image file.
+
+    Attributes:
+        width (int): Displayed width in pixels.
+        height (int): Displayed height in pixels.
+        placeholder (str): Preview encoded as `data:image/webp;base64,...` URI.
+        mime_type (str | None): MIME type of the decoded format, None if Pillow knows none.
+    """
+    width: int
+    height: int
+    placeholder: str
+    mime_type: str | None = None
+
+
+@dataclass
+class RenderedVariant:
+    """
+    A resized rendition of an image, encoded but not yet stored.
+
+    Attributes:
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+        data (bytes): Encoded image data (see `VARIANT_MIME_TYPE`).
+    """
+    width: int
+    height: int
+    data: bytes
+
+
+@dataclass
+class OptimizedFile:
+    """
+    A recompressed copy of an image written to a temporary file.
+
+    Attributes:
+        tmp_path (str): Path of the temporary file holding the optimized content.
+        sha256 (str): Hex encoded SHA-256 digest of the optimized content.
+        size (int): Size of the optimized content in bytes.
+        mime_type (str): MIME type of the optimized content.
+    """
+    tmp_path: str
+    sha256: str
+    size: int
+    mime_type: str
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    """
+    Convert an image to RGB, or RGBA if it carries transparency, so it can be encoded as WebP.
+    """
+    if img.mode in ("RGB", "RGBA"):
+        return img
+    return img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+
+def inspect_image(filepath: str) -> ImageMetadata:
+    """
+    Compute dimensions and placeholder for an image file.
+
+    This is CPU bound; call it from a worker thread (e.g. `run_in_threadpool`).
+
+    Args:
+        filepath (str): Path of the image file.
+
+    Returns:
+        ImageMetadata: Dimensions and placeholder of the image.
+
+    Raises:
+        InvalidImage: If the file is not a decodable image.
+    """
+    try:
+        with Image.open(filepath) as img:
+            # the format is determined by the content, not by the declared type or extension;
+            # multi-picture JPEGs from cameras are reported as MPO but are plain JPEG files
+            mime_type = "image/jpeg" if img.format == "MPO" else Image.MIME.get(img.format)
+
+            # Apply the EXIF orientation so width and height match what browsers display
+            img = ImageOps.exif_transpose(img)
+            width, height = img.size
+
+            img.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+
+            buffer = io.BytesIO()
+            _to_rgb(img).save(buffer, format="WEBP", quality=PLACEHOLDER_QUALITY)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImage(f"File is not a valid image: {e}")
+
+    placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+    return ImageMetadata(width=width, height=height, placeholder=placeholder, mime_type=mime_type)
+
+
+def render_variants(filepath: str, widths: list[int]) -> list[RenderedVariant]:
+    """
+    Render downscaled WebP variants of an image for the given widths.
+
+    Widths that are not smaller than the original are skipped (no upscaling), as are
+    animated images, whose animation would be lost. This is CPU bound; call it from a
+    worker thread (e.g. `run_in_threadpool`).
+
+    Args:
+        filepath (str): Path of the image file.
+        widths (list[int]): Target widths in pixels.
+
+    Returns:
+        list[RenderedVariant]: The rendered variants ordered by width.
+
+    Raises:
+        InvalidImage: If the file is not a decodable image.
+    """
+    variants = []
+    try:
+        with Image.open(filepath) as img:
+            if getattr(img, "is_animated", False):
+                return variants
+
+            img = _to_rgb(ImageOps.exif_transpose(img))
+            for width in sorted(set(widths)):
+                if width >= img.width:
+                    break
+                height = max(1, round(img.height * width / img.width))
+
+                buffer = io.BytesIO()
+                img.resize((width, height), Image.Resampling.LANCZOS).save(
+                    buffer, format="WEBP", quality=VARIANT_QUALITY
+                )
+                variants.append(RenderedVariant(width=width, height=height, data=buffer.getvalue()))
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImage(f"File is not a valid image: {e}")
+
+    return variants
+
+
+def optimize_image(filepath: str, directory: str,
+                   with_metadata: bool = False) -> tuple[OptimizedFile | None, ImageMetadata | None]:
+    """
+    Recompress an image and strip its metadata.
+
+    PNGs are re-encoded losslessly with maximum compression. JPEGs are re-encoded with their
+    original quantization tables and chroma subsampling (`quality="keep"`) as optimized
+    progressive JPEGs, which keeps them visually identical. ICC profiles and the EXIF
+    orientation are preserved; all other metadata (camera EXIF, thumbnails, text chunks) is
+    dropped. Other formats are left untouched.
+
+    This is CPU bound and meant to run in a process pool. The result is written to a
+    temporary file in `directory` so it can be moved into place atomically.
+
+    Args:
+        filepath (str): Path of the image file.
+        directory (str): Directory for the temporary output file.
+        with_metadata (bool): Whether to also compute dimensions and placeholder.
+
+    Returns:
+        tuple[OptimizedFile | None, ImageMetadata | None]: The optimized file, or None if the
+        format is not supported or the recompressed file would not be smaller; and the
+        metadata of the resulting image if requested, also when the file is unchanged.
+
+    Raises:
+        InvalidImage: If the file is not a decodable image.
+    """
+    buffer = io.BytesIO()
+    try:
+        with Image.open(filepath) as img:
+            params = {"optimize": True}
+            if img.info.get("icc_profile"):
+                params["icc_profile"] = img.info["icc_profile"]
+
+            if img.format == "JPEG":
+                orientation = img.getexif().get(ORIENTATION_TAG)
+                if orientation and orientation != 1:
+                    exif = Image.Exif()
+                    exif[ORIENTATION_TAG] = orientation
+                    params["exif"] = exif.tobytes()
+                img.save(buffer, format="JPEG", quality="keep", subsampling="keep", progressive=True, **params)
+                mime_type = "image/jpeg"
+            elif img.format == "PNG" and not getattr(img, "is_animated", False):
+                if "transparency" in img.info:
+                    params["transparency"] = img.info["transparency"]
+                img.save(buffer, format="PNG", **params)
+                mime_type = "image/png"
+            else:
+                mime_type = None
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImage(f"File is not a valid image: {e}")
+
+    data = buffer.getvalue()
+    if mime_type is None or len(data) >= os.path.getsize(filepath):
+        return None, inspect_image(filepath) if with_metadata else None
+
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".optimize-")
+    with os.fdopen(fd, "wb") as target:
+        target.write(data)
+
+    optimized = OptimizedFile(
+        tmp_path=tmp_path,
+        sha256=hashlib.sha256(data).hexdigest(),
+        size=len(data),
+        mime_type=mime_type,
+    )
+    return optimized, inspect_image(tmp_path) if with_metadata else None
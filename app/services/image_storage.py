@@ -0,0 +1,232 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module stores uploaded image files content-addressed in the configured storage backend
+(see `app.services.storage`).
+
+Storing happens in two steps. Uploads are first staged: they are copied in fixed-size chunks
+into a temporary file inside the image directory while their SHA-256 digest is computed, so
+the whole file is never held in memory and can be inspected locally. Committing a staged file
+hands it to the backend under the key `<sha[:2]>/<sha><ext>`; if content with the same digest
+is already stored, the new copy is discarded (deduplication).
+"""
+
+# Import external dependencies
+import hashlib
+import io
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+# Import internal dependencies
+from app.core import config
+from app.services.storage import CHUNK_SIZE, get_storage
+
+
+# Accepted MIME types and the file extension used when storing them
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+
+
+class UnsupportedImageType(ValueError):
+    """Raised if the uploaded file has a MIME type that is not accepted."""
+
+
+class ImageTooLarge(ValueError):
+    """Raised if the uploaded file exceeds the configured maximum size."""
+
+
+@dataclass
+class StagedFile:
+    """
+    A file copied into a local temporary file, hashed but not yet stored.
+
+    Attributes:
+        tmp_path (str): Path of the temporary file.
+        sha256 (str): Hex encoded SHA-256 digest of the content.
+        size (int): File size in bytes.
+        mime_type (str): MIME type of the file.
+    """
+    tmp_path: str
+    sha256: str
+    size: int
+    mime_type: str
+
+
+@dataclass
+class StoredFile:
+    """
+    Result of storing a file.
+
+    Attributes:
+        filename (str): Content-addressed filename (`<sha256><ext>`).
+        filepath (str): Location of the file in the storage backend.
+        sha256 (str): Hex encoded SHA-256 digest of the content.
+        size (int): File size in bytes.
+        mime_type (str): MIME type of the file.
+    """
+    filename: str
+    filepath: str
+    sha256: str
+    size: int
+    mime_type: str
+
+
+def content_key(sha256: str, extension: str) -> str:
+    """
+    Build the content-addressed storage key for a digest.
+
+    Args:
+        sha256 (str): Hex encoded SHA-256 digest.
+        extension (str): File extension including the leading dot.
+
+    Returns:
+        str: The key (`<sha[:2]>/<sha><ext>`).
+    """
+    return f"{sha256[:2]}/{sha256}{extension}"
+
+
+def _copy_and_hash(source, directory: str, max_size: int) -> tuple[str, str, int]:
+    """
+    Copy a file object chunk by chunk into a temporary file while hashing it.
+
+    Returns:
+        tuple[str, str, int]: Temporary file path, hex digest and size in bytes.
+    """
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    # Create the temporary file inside the image directory so moving it into place is atomic
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as target:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise ImageTooLarge(f"Image exceeds the maximum size of {max_size} bytes.")
+                digest.update(chunk)
+                target.write(chunk)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return tmp_path, digest.hexdigest(), size
+
+
+async def _stage(source, mime_type: str) -> StagedFile:
+    """
+    Copy the content of a file object into a hashed temporary file.
+    """
+    if mime_type not in EXTENSIONS:
+        raise UnsupportedImageType(f"Unsupported image type '{mime_type}'.")
+
+    # Blocking file IO runs in the threadpool to keep the event loop free
+    tmp_path, sha256, size = await run_in_threadpool(
+        _copy_and_hash, source, config.IMAGE_DIR, config.IMAGE_MAX_UPLOAD_SIZE
+    )
+
+    return StagedFile(tmp_path=tmp_path, sha256=sha256, size=size, mime_type=mime_type)
+
+
+async def stage_file(filepath: str, mime_type: str) -> StagedFile:
+    """
+    Stage a file of the local disk, e.g. to move it to another storage backend.
+
+    Args:
+        filepath (str): Path of the file; it is copied, not consumed.
+        mime_type (str): MIME type of the file.
+
+    Returns:
+        StagedFile: The hashed temporary copy; pass it to `commit` or `release`.
+
+    Raises:
+        UnsupportedImageType: If the MIME type is not accepted.
+    """
+    if mime_type not in EXTENSIONS:
+        raise UnsupportedImageType(f"Unsupported image type '{mime_type}'.")
+
+    def copy():
+        with open(filepath, "rb") as source:
+            return _copy_and_hash(source, config.IMAGE_DIR, sys.maxsize)
+
+    tmp_path, sha256, size = await run_in_threadpool(copy)
+    return StagedFile(tmp_path=tmp_path, sha256=sha256, size=size, mime_type=mime_type)
+
+
+async def stage_upload(upload: UploadFile) -> StagedFile:
+    """
+    Stage an uploaded image for inspection before it is stored.
+
+    Args:
+        upload (UploadFile): The uploaded file.
+
+    Returns:
+        StagedFile: The hashed temporary copy; pass it to `commit` or `release`.
+
+    Raises:
+        UnsupportedImageType: If the MIME type is not accepted.
+        ImageTooLarge: If the file exceeds `IMAGE_MAX_UPLOAD_SIZE`.
+    """
+    return await _stage(upload.file, upload.content_type)
+
+
+async def commit(staged: StagedFile) -> StoredFile:
+    """
+    Hand a staged file over to the storage backend under its content-addressed key.
+
+    Args:
+        staged (StagedFile): The staged file; its temporary file is consumed.
+
+    Returns:
+        StoredFile: Metadata of the stored file.
+    """
+    key = content_key(staged.sha256, EXTENSIONS[staged.mime_type])
+    filepath = await get_storage().save(staged.tmp_path, key, staged.mime_type, staged.sha256)
+
+    return StoredFile(
+        filename=key.rsplit("/", 1)[-1],
+        filepath=filepath,
+        sha256=staged.sha256,
+        size=staged.size,
+        mime_type=staged.mime_type,
+    )
+
+
+async def release(staged: StagedFile):
+    """
+    Remove the temporary file of a staged file that was not (or not successfully) committed.
+
+    Args:
+        staged (StagedFile): The staged file.
+    """
+    try:
+        await run_in_threadpool(os.unlink, staged.tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def store_bytes(data: bytes, mime_type: str) -> StoredFile:
+    """
+    Store generated image data (e.g. a resized variant) content-addressed.
+
+    Args:
+        data (bytes): Encoded image data.
+        mime_type (str): MIME type of the data.
+
+    Returns:
+        StoredFile: Metadata of the stored file.
+    """
+    staged = await _stage(io.BytesIO(data), mime_type)
+    try:
+        return await commit(staged)
+    finally:
+        await release(staged)
@@ -0,0 +1,143 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module collects Prometheus metrics, exposed on `/metrics` (see
+app/api/routes/metrics/metrics.py):
+
+- http_request_duration_seconds: latency histogram by route template, method, status and
+  response language (`Content-Language`),
+- db_pool_size, db_pool_checked_out: configured size and connections in use of the pool,
+- db_pool_wait_seconds: histogram of the time taken to obtain a connection from the pool,
+- cache_requests_total: hits and misses of the in-process caches (`cache_hit`, `cache_miss`).
+
+With several uvicorn workers, every worker has its own metrics. Set
+`PROMETHEUS_MULTIPROC_DIR` to an empty directory (cleared before every start) to let the
+workers write their metrics there; `/metrics` then aggregates all workers, whichever
+answers the scrape.
+"""
+
+# Import external dependencies
+import os
+import time
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+from sqlalchemy import event
+
+# Import internal dependencies
+from app.core import config
+from app.db import instrumentation
+from app.db.database import engine
+from app.services.routing import route_template
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests until the response was sent.",
+    ["route", "method", "status", "language"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured number of pooled database connections.", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Database connections currently in use.", multiprocess_mode="livesum"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time taken to obtain a database connection from the pool.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Lookups of in-process caches.", ["cache", "result"]
+)
+
+# Label of requests no route matched, so scans of random URLs cannot inflate the label values
+UNMATCHED_ROUTE = "unmatched"
+
+
+def cache_hit(cache: str):
+    """
+    Count a hit of an in-process cache.
+    """
+    CACHE_REQUESTS.labels(cache, "hit").inc()
+
+
+def cache_miss(cache: str):
+    """
+    Count a miss of an in-process cache.
+    """
+    CACHE_REQUESTS.labels(cache, "miss").inc()
+
+
+def _instrument_pool():
+    pool = engine.sync_engine.pool
+    DB_POOL_SIZE.set(pool.size())
+
+    event.listen(pool, "checkout", lambda *args: DB_POOL_CHECKED_OUT.inc())
+    event.listen(pool, "checkin", lambda *args: DB_POOL_CHECKED_OUT.dec())
+    instrumentation.on_pool_wait(DB_POOL_WAIT.observe)
+
+
+_instrument_pool()
+
+
+def render() -> tuple[bytes, str]:
+    """
+    Render the metrics in the Prometheus text format, aggregated over all workers in
+    multi-process mode.
+
+    Returns:
+        tuple[bytes, str]: The metrics and their content type.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """
+    Drop the live gauges of this worker from the aggregation (on shutdown).
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing the duration of every HTTP request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = "500"
+        language = ""
+
+        async def send_observed(message):
+            nonlocal status, language
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-language":
+                        language = value.decode("latin-1")
+                        break
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_observed)
+        finally:
+            REQUEST_DURATION.labels(
+                route_template(scope) or UNMATCHED_ROUTE, scope["method"], status, language
+            ).observe(time.perf_counter() - start)
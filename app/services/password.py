@@ -0,0 +1,103 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module keeps password hashing off the event loop.
+
+Hashing or verifying a password with Argon2 takes tens of milliseconds of CPU time. Run
+inline, as fastapi-users does, every login stalls all other requests of the worker. Here the
+work runs on a dedicated pool of `PASSWORD_HASH_WORKERS` threads (argon2-cffi and bcrypt
+release the GIL while hashing, so threads run in parallel). At most
+`PASSWORD_HASH_QUEUE_SIZE` further jobs may wait for a thread; beyond that, requests are
+rejected with `503 Service Unavailable` instead of piling up. With `PASSWORD_HASH_WORKERS=0`
+hashing runs inline on the event loop, as in plain fastapi-users (meant for comparisons only,
+see scripts/benchmark_login_burst.py).
+
+fastapi-users calls its password helper synchronously, so `OffloadedPasswordHelper`
+additionally lets the user manager compute results on the pool in advance (`prepare_hash`,
+`verify_and_update_async`); the synchronous methods then return the prepared result and only
+fall back to hashing inline for calls that were not prepared.
+"""
+
+# Import external dependencies
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+from fastapi_users.password import PasswordHelper
+
+# Import internal dependencies
+from app.core import config
+
+
+T = TypeVar("T")
+
+_executor = (
+    ThreadPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password")
+    if config.PASSWORD_HASH_WORKERS > 0 else None
+)
+# Number of jobs running on or waiting for the pool
+_pending = 0
+
+
+async def run_hashing(function: Callable[..., T], *args) -> T:
+    """
+    Run a password hashing function on the hashing pool.
+
+    Args:
+        function (Callable[..., T]): The function.
+        *args: Its arguments.
+
+    Returns:
+        T: The result of the function.
+
+    Raises:
+        HTTPException(503): If the pool and its queue are full.
+    """
+    global _pending
+    if _executor is None:
+        # inline mode: blocks the event loop while hashing
+        return function(*args)
+
+    if _pending >= config.PASSWORD_HASH_WORKERS + config.PASSWORD_HASH_QUEUE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The server is busy, please try again.",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, function, *args)
+    finally:
+        _pending -= 1
+
+
+class OffloadedPasswordHelper(PasswordHelper):
+    """
+    Password helper of fastapi-users whose work can be done on the hashing pool in advance.
+
+    An instance belongs to a single user manager and thus to a single request.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._hashes: dict[str, str] = {}
+
+    async def prepare_hash(self, password: str):
+        """
+        Hash a password on the pool; the next `hash(password)` returns the result.
+        """
+        self._hashes[password] = await run_hashing(super().hash, password)
+
+    async def hash_async(self, password: str) -> str:
+        return await run_hashing(super().hash, password)
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await run_hashing(super().verify_and_update, plain_password, hashed_password)
+
+    def hash(self, password: str) -> str:
+        prepared = self._hashes.pop(password, None)
+        return prepared if prepared is not None else super().hash(password)
+
@@ -0,0 +1,83 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module watches the number of statements and the database time of every request, to
+catch N+1 queries (e.g. a lazy loaded relationship accessed per list item) before they reach
+production.
+
+Requests issuing more than `SQL_STATEMENT_THRESHOLD` statements or spending more than
+`SQL_TIME_THRESHOLD_MS` milliseconds in the database are logged with their route template.
+With `SQL_STRICT_MODE` (meant for CI and development), such requests fail with
+`QueryBudgetExceeded` instead, and every lazy load that would emit SQL raises (see
+`instrumentation.enable_strict_loading`), so regressions show up as failing requests.
+"""
+
+# Import external dependencies
+import logging
+
+# Import internal dependencies
+from app.core import config
+from app.db import instrumentation
+from app.services.routing import route_template
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode if a request exceeds the statement or time threshold."""
+
+
+def _route(scope) -> str:
+    return f"{scope['method']} {route_template(scope) or scope['path']}"
+
+
+def check(scope, stats: instrumentation.RequestStats):
+    """
+    Log (or, in strict mode, reject) a request exceeding the thresholds.
+
+    Args:
+        scope: ASGI scope of the request.
+        stats (RequestStats): Database usage of the request.
+
+    Raises:
+        QueryBudgetExceeded: In strict mode, if a threshold is exceeded.
+    """
+    db_time_ms = stats.db_time * 1000
+    if stats.statements <= config.SQL_STATEMENT_THRESHOLD and db_time_ms <= config.SQL_TIME_THRESHOLD_MS:
+        return
+
+    message = (f"{_route(scope)} issued {stats.statements} statements taking {db_time_ms:.1f} ms "
+               f"(thresholds: {config.SQL_STATEMENT_THRESHOLD} statements, {config.SQL_TIME_THRESHOLD_MS} ms)")
+    if config.SQL_STRICT_MODE:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+class QueryBudgetMiddleware:
+    """
+    ASGI middleware accounting the statements of every request and checking them when the
+    response starts.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = instrumentation.start_request()
+
+        async def send_checked(message):
+            if message["type"] == "http.response.start":
+                # raising before the response started turns it into a 500
+                check(scope, stats)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_checked)
+        finally:
+            instrumentation.end_request(token)
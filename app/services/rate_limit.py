@@ -0,0 +1,252 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module protects the public write routes (contact form, authentication) against floods.
+
+Each route policy consists of a token bucket per client IP and a global token bucket shared
+by all clients. A rate such as "5/minute" allows bursts of 5 requests, refilled continuously
+at 5 tokens per minute. The per-IP bucket is checked first, so a single flooding client is
+turned away before it can drain the global bucket.
+
+The limiters are FastAPI dependencies meant to be declared in the `dependencies` of a route
+or router: these are resolved before the parameters of the endpoint, so rejected requests
+(`429 Too Many Requests` with `Retry-After`) cost neither a database query nor a password hash.
+
+Buckets are kept per process (`RATE_LIMIT_BACKEND=memory`) or in Redis (`redis`), where a Lua
+script updates a bucket atomically, so all workers and instances share the same budget. If
+Redis is unreachable, requests are let through rather than taking the routes down.
+
+The client IP is taken from the connection; behind a reverse proxy, uvicorn has to be started
+with `--proxy-headers` and `--forwarded-allow-ips` so it reflects `X-Forwarded-For`.
+"""
+
+# Import external dependencies
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+import redis.asyncio as redis
+from fastapi import HTTPException, Request, status
+
+# Import internal dependencies
+from app.core import config
+
+
+logger = logging.getLogger(__name__)
+
+BACKEND_MEMORY = "memory"
+BACKEND_REDIS = "redis"
+
+# Prefix of the bucket keys in Redis
+KEY_PREFIX = "rate_limit:"
+
+# Maximum number of buckets kept by the memory backend; the least recently used are dropped
+MAX_MEMORY_BUCKETS = 100_000
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    """
+    A token bucket configuration.
+
+    Attributes:
+        capacity (int): Maximum number of tokens (burst size).
+        per_second (float): Tokens added per second.
+    """
+    capacity: int
+    per_second: float
+
+
+def parse_rate(value: str | None) -> Rate | None:
+    """
+    Parse a rate like "5/minute", "100/hour" or "2/second".
+
+    Args:
+        value (str | None): The rate; None or an empty string disables the bucket.
+
+    Returns:
+        Rate | None: The rate, or None if disabled.
+
+    Raises:
+        ValueError: If the rate is malformed.
+    """
+    if not value or not value.strip():
+        return None
+
+    count, _, period = value.strip().lower().partition("/")
+    if not count.strip().isdigit() or int(count) < 1 or period.strip() not in PERIODS:
+        raise ValueError(f"Invalid rate limit '{value}', expected e.g. '5/minute'")
+
+    return Rate(capacity=int(count), per_second=int(count) / PERIODS[period.strip()])
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage of the token buckets.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, rate: Rate) -> float:
+        """
+        Take a token from a bucket.
+
+        Args:
+            key (str): Key of the bucket.
+            rate (Rate): Configuration of the bucket.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is available.
+        """
+
+    async def close(self):
+        """
+        Release the connections held by the backend.
+        """
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    Buckets kept in the memory of the process (one budget per worker).
+    """
+
+    def __init__(self, max_buckets: int = MAX_MEMORY_BUCKETS):
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._max_buckets = max_buckets
+
+    async def acquire(self, key: str, rate: Rate) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (rate.capacity, now))
+        tokens = min(rate.capacity, tokens + (now - updated) * rate.per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate.per_second
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self._max_buckets:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+
+# Refills and takes a token from the bucket in KEYS[1] (ARGV: capacity, tokens per second).
+# Uses the clock of the Redis server, so the instances do not need synchronized clocks.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local per_second = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * per_second)
+
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / per_second
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / per_second * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Buckets kept in Redis (one budget shared by all workers and instances).
+    """
+
+    def __init__(self, url: str):
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rate: Rate) -> float:
+        try:
+            retry_after = await self._script(keys=[KEY_PREFIX + key], args=[rate.capacity, rate.per_second])
+        except (redis.RedisError, OSError) as e:
+            logger.warning("Rate limit backend unavailable, letting the request through: %s", e)
+            return 0.0
+        return float(retry_after)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+@lru_cache
+def get_backend() -> RateLimitBackend:
+    """
+    Return the configured rate limit backend (`RATE_LIMIT_BACKEND`).
+
+    Returns:
+        RateLimitBackend: A `MemoryBackend` or `RedisBackend` instance shared by the process.
+    """
+    if config.RATE_LIMIT_BACKEND == BACKEND_REDIS:
+        return RedisBackend(config.REDIS_URL)
+    return MemoryBackend()
+
+
+class RateLimiter:
+    """
+    Dependency enforcing the rate limit policy of a route.
+
+    Args:
+        name (str): Name of the policy, used in the bucket keys.
+        per_ip (str | None): Rate per client IP (e.g. "5/minute"), or None.
+        total (str | None): Rate of all clients together, or None.
+    """
+
+    def __init__(self, name: str, per_ip: str | None, total: str | None):
+        self.name = name
+        self.per_ip = parse_rate(per_ip)
+        self.total = parse_rate(total)
+
+    async def __call__(self, request: Request):
+        """
+        Raises:
+            HTTPException(429): If a bucket of the policy is empty.
+        """
+        if not config.RATE_LIMIT_ENABLED:
+            return
+
+        backend = get_backend()
+        buckets = []
+        if self.per_ip:
+            client = request.client.host if request.client else "unknown"
+            buckets.append((f"{self.name}:ip:{client}", self.per_ip))
+        if self.total:
+            buckets.append((f"{self.name}:global", self.total))
+
+        for key, rate in buckets:
+            retry_after = await backend.acquire(key, rate)
+            if retry_after > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests, please try again later.",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+
+# Policies of the protected routes
+limit_contact = RateLimiter("contact", config.RATE_LIMIT_CONTACT, config.RATE_LIMIT_CONTACT_GLOBAL)
+limit_auth = RateLimiter("auth", config.RATE_LIMIT_AUTH, config.RATE_LIMIT_AUTH_GLOBAL)
+
+
+async def close():
+    """
+    Release the connections of the configured backend.
+    """
+    if get_backend.cache_info().currsize:
+        await get_backend().close()
@@ -0,0 +1,47 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module resolves the path template of the route that handled a request (e.g.
+`/users/{id}`), used as label by the metrics and the query budget.
+
+Since FastAPI 0.143, `include_router` no longer copies the routes of an included router with
+the prefix applied; the matched route in the ASGI scope keeps the path it was declared with
+(`/me` instead of `/users/me`). Routers included with a prefix are therefore included via
+`include_router` here, which records the full template on their routes.
+"""
+
+# Import external dependencies
+from fastapi import APIRouter, FastAPI
+
+
+def include_router(app: FastAPI, router: APIRouter, prefix: str = "", **kwargs):
+    """
+    Include a router into the app and record the full path template of its routes.
+
+    Args:
+        app (FastAPI): The application.
+        router (APIRouter): The router to include.
+        prefix (str): Path prefix of the router.
+        **kwargs: Further arguments of `FastAPI.include_router`.
+    """
+    for route in router.routes:
+        if hasattr(route, "path"):
+            route.path_template = prefix + route.path
+    app.include_router(router, prefix=prefix, **kwargs)
+
+
+def route_template(scope) -> str | None:
+    """
+    Return the full path template of the route that matched a request.
+
+    Args:
+        scope: ASGI scope of the request, after routing.
+
+    Returns:
+        str | None: The template including all prefixes, or None if no route matched.
+    """
+    route = scope.get("route")
+    if route is None:
+        return None
+    return getattr(route, "path_template", None) or getattr(route, "path", None)
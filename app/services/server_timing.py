@@ -0,0 +1,178 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module adds a `Server-Timing` header breaking down where the time of a request went,
+readable in the network panel of the browser devtools and in CDN logs:
+
+- deps: resolving the dependencies (including parsing the request),
+- db: executing statements (with their number; see app/db/instrumentation.py),
+- app: the endpoint without its statements (ORM mapping and Python code),
+- serialize: validating and serializing the response model,
+- total: from receiving the request until sending the response headers.
+
+The dependency, endpoint and serialization phases are measured by `TimedRoute`, the route
+class of the API routers; other routes (e.g. the auth routes) report db and total only.
+
+`SERVER_TIMING` controls who gets the header: 'off', 'superuser' (requests with the bearer
+token of a superuser) or 'all'. Superusers are recognized without a database query: on the
+admin routes by `get_current_superuser` having resolved one, elsewhere by a token that is in
+its cache.
+"""
+
+# Import external dependencies
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+
+# Import internal dependencies
+from app.core import config
+from app.db import instrumentation
+from app.services.user import cached_superuser
+
+
+@dataclass
+class Timing:
+    """
+    Points in time (`time.perf_counter()`) of a request.
+    """
+    start: float
+    handler_start: float | None = None
+    endpoint_start: float | None = None
+    endpoint_end: float | None = None
+    handler_end: float | None = None
+    # time spent executing statements before the endpoint started and when it ended
+    endpoint_db_start: float = 0.0
+    endpoint_db_end: float = 0.0
+
+    def header(self, stats: instrumentation.RequestStats) -> str:
+        """
+        Render the phases as value of the `Server-Timing` header.
+        """
+        def metric(name: str, seconds: float, description: str | None = None) -> str:
+            value = f"{name};dur={seconds * 1000:.1f}"
+            return value + f';desc="{description}"' if description else value
+
+        metrics = []
+        if self.handler_start is not None and self.endpoint_start is not None:
+            metrics.append(metric("deps", self.endpoint_start - self.handler_start))
+        metrics.append(metric("db", stats.db_time, f"{stats.statements} statements"))
+        if self.endpoint_start is not None and self.endpoint_end is not None:
+            endpoint_db = self.endpoint_db_end - self.endpoint_db_start
+            metrics.append(metric("app", max(self.endpoint_end - self.endpoint_start - endpoint_db, 0)))
+        if self.endpoint_end is not None and self.handler_end is not None:
+            metrics.append(metric("serialize", self.handler_end - self.endpoint_end))
+        metrics.append(metric("total", time.perf_counter() - self.start))
+        return ", ".join(metrics)
+
+
+_timing: ContextVar[Timing | None] = ContextVar("server_timing", default=None)
+
+
+def _db_time() -> float:
+    stats = instrumentation.current()
+    return stats.db_time if stats else 0.0
+
+
+def _timed_endpoint(endpoint):
+    """
+    Wrap a coroutine endpoint to record when it starts and ends.
+    """
+    @functools.wraps(endpoint)
+    async def timed_endpoint(*args, **kwargs):
+        timing = _timing.get()
+        if timing is None:
+            return await endpoint(*args, **kwargs)
+
+        timing.endpoint_start = time.perf_counter()
+        timing.endpoint_db_start = _db_time()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timing.endpoint_end = time.perf_counter()
+            timing.endpoint_db_end = _db_time()
+
+    timed_endpoint.is_timed = True
+    return timed_endpoint
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class recording when dependency resolution, the endpoint and serialization end.
+
+    The endpoint is wrapped before FastAPI analyses it; the wrapper keeps its signature.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint) and not getattr(endpoint, "is_timed", False):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            timing = _timing.get()
+            if timing is None:
+                return await handler(request)
+
+            timing.handler_start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                timing.handler_end = time.perf_counter()
+
+        return timed_handler
+
+
+def _is_exposed(scope) -> bool:
+    if config.SERVER_TIMING == "all":
+        return True
+
+    # set by get_current_superuser on the admin routes
+    if scope.get("state", {}).get("superuser") is not None:
+        return True
+
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    return cached_superuser(token) is not None
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware measuring requests and adding the `Server-Timing` header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or config.SERVER_TIMING not in ("superuser", "all"):
+            await self.app(scope, receive, send)
+            return
+
+        timing = Timing(start=time.perf_counter())
+        # the statements are usually accounted by the query budget middleware already
+        stats, stats_token = instrumentation.current(), None
+        if stats is None:
+            stats, stats_token = instrumentation.start_request()
+        timing_token = _timing.set(timing)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                if _is_exposed(scope):
+                    MutableHeaders(scope=message).append("Server-Timing", timing.header(stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timing.reset(timing_token)
+            if stats_token is not None:
+                instrumentation.end_request(stats_token)
@@ -0,0 +1,152 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module logs slow statements and samples their query plans.
+
+Every statement executed through the engine (see app/db/instrumentation.py) taking longer
+than `SLOW_QUERY_THRESHOLD_MS` milliseconds is logged, with its parameters only if
+`SLOW_QUERY_LOG_PARAMETERS` is enabled, as they contain personal data. For a sample of
+them (`SLOW_QUERY_EXPLAIN_SAMPLE_RATE`), the plan is captured with
+`EXPLAIN (ANALYZE, BUFFERS)` in the background and logged as well, showing e.g. which
+translation join degrades first as the content grows.
+
+As `ANALYZE` executes the statement again, plans are captured:
+
+- for SELECT (and WITH) statements only, in a read-only transaction that is rolled back,
+- on a dedicated connection, so the pool of the API is not drained,
+- at most once per `SLOW_QUERY_EXPLAIN_INTERVAL` seconds per worker and one at a time,
+- with a statement timeout of `EXPLAIN_TIMEOUT`,
+
+so a slow query under load is not amplified into more load.
+"""
+
+# Import external dependencies
+import asyncio
+import logging
+import random
+import time
+
+import asyncpg
+
+# Import internal dependencies
+from app.core import config
+from app.db import instrumentation
+from app.services.change_feed import asyncpg_dsn
+
+
+logger = logging.getLogger(__name__)
+
+# Statement timeout of the EXPLAIN connection, in milliseconds
+EXPLAIN_TIMEOUT = 10000
+
+# Maximum length of a logged parameter value
+MAX_PARAMETER_LENGTH = 200
+
+# Start of the last plan capture (time.monotonic()) and the running capture
+_last_explain: float | None = None
+_explain_task: asyncio.Task | None = None
+
+
+def _format_parameters(parameters) -> str:
+    if not config.SLOW_QUERY_LOG_PARAMETERS:
+        return "(not logged)"
+
+    def short(value) -> str:
+        text = repr(value)
+        return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + "..."
+
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(short(value) for value in parameters) + ")"
+    return short(parameters)
+
+
+def _is_explainable(statement: str, executemany: bool) -> bool:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return not executemany and keyword in ("SELECT", "WITH")
+
+
+async def explain(statement: str, parameters) -> str:
+    """
+    Capture the plan of a statement with `EXPLAIN (ANALYZE, BUFFERS)`.
+
+    Args:
+        statement (str): The statement in the form sent to asyncpg (`$1` placeholders).
+        parameters: Its positional parameters.
+
+    Returns:
+        str: The plan in text format.
+    """
+    connection = await asyncpg.connect(
+        asyncpg_dsn(), server_settings={"statement_timeout": str(EXPLAIN_TIMEOUT)}
+    )
+    try:
+        transaction = connection.transaction(readonly=True)
+        await transaction.start()
+        try:
+            rows = await connection.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", *(parameters or ()))
+        finally:
+            await transaction.rollback()
+    finally:
+        await connection.close()
+
+    return "\n".join(row[0] for row in rows)
+
+
+async def _log_plan(statement: str, parameters):
+    try:
+        plan = await explain(statement, parameters)
+    except Exception as e:
+        logger.info("Could not capture the plan of a slow statement: %s", e)
+        return
+    logger.warning("Plan of slow statement %s:\n%s", statement, plan)
+
+
+def _should_explain(statement: str, executemany: bool) -> bool:
+    if not _is_explainable(statement, executemany):
+        return False
+    if _explain_task is not None and not _explain_task.done():
+        return False
+    if _last_explain is not None and time.monotonic() - _last_explain < config.SLOW_QUERY_EXPLAIN_INTERVAL:
+        return False
+    return random.random() < config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+
+
+def observe(statement: str, parameters, executemany: bool, elapsed: float):
+    """
+    Log a statement if it was slow, and possibly schedule the capture of its plan.
+    """
+    global _last_explain, _explain_task
+    if config.SLOW_QUERY_THRESHOLD_MS < 0 or elapsed * 1000 < config.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    logger.warning("Slow statement (%.1f ms): %s; parameters: %s",
+                   elapsed * 1000, statement, _format_parameters(parameters))
+
+    if not _should_explain(statement, executemany):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # executed through a synchronous engine, e.g. in a migration
+        return
+
+    _last_explain = time.monotonic()
+    _explain_task = loop.create_task(_log_plan(statement, parameters), name="slow-query-explain")
+
+
+instrumentation.on_statement(observe)
+
+
+async def stop():
+    """
+    Cancel a running plan capture (on shutdown).
+    """
+    global _explain_task
+    if _explain_task is not None:
+        _explain_task.cancel()
+        try:
+            await _explain_task
+        except asyncio.CancelledError:
+            pass
+        _explain_task = None
@@ -0,0 +1,161 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module scores contact submissions before they are stored, to keep bot spam out of the
+`contact` table.
+
+Every heuristic that fires adds its weight to the score of a submission; submissions reaching
+`SPAM_SCORE_THRESHOLD` are rejected:
+
+- honeypot: the hidden form field `SPAM_HONEYPOT_FIELD` is filled in (humans do not see it),
+- duplicate: the same message was accepted within `SPAM_DUPLICATE_WINDOW` seconds,
+- links: the message contains more than `SPAM_MAX_LINKS` links (weighted per extra link),
+- email_frequency: the sender address exceeded `SPAM_EMAIL_RATE` (e.g. "3/hour").
+
+Duplicates are detected through an index of the SHA-256 hashes of the normalized messages
+(casefolded, whitespace collapsed), so a lookup is a dict access instead of a table scan.
+The index is kept in memory and bounded to `SPAM_MAX_TRACKED_MESSAGES` entries; the sender
+frequency uses the token buckets of the rate limiter (see app/services/rate_limit.py) and is
+thus shared between workers with the Redis backend.
+"""
+
+# Import external dependencies
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# Import internal dependencies
+from app.core import config
+from app.schemas.contact import SendingContact
+from app.services import rate_limit
+
+
+# Links as posted by bots: URLs with scheme, "www." hosts and HTML/BBCode links
+LINK = re.compile(r"https?://|www\.|<a\s|\[url", re.IGNORECASE)
+
+# Heuristics whose sole firing means a bot or a resubmission, which get a fake success response
+SILENT_REASONS = {"honeypot", "duplicate"}
+
+WEIGHTS = {
+    "honeypot": 1.0,
+    "duplicate": 1.0,
+    "email_frequency": 1.0,
+    # per link above SPAM_MAX_LINKS
+    "links": 0.5,
+}
+
+SPAM_EMAIL_RATE = rate_limit.parse_rate(config.SPAM_EMAIL_RATE)
+
+
+@dataclass
+class Verdict:
+    """
+    Result of scoring a submission.
+
+    Attributes:
+        score (float): Sum of the weights of the fired heuristics.
+        reasons (list[str]): Names of the fired heuristics.
+        message_hash (str): Hash of the normalized message.
+    """
+    score: float
+    message_hash: str
+    reasons: list[str] = field(default_factory=list)
+
+    @property
+    def is_spam(self) -> bool:
+        return self.score >= config.SPAM_SCORE_THRESHOLD
+
+    @property
+    def is_silent(self) -> bool:
+        """
+        Whether the submission should be dropped while pretending success (bots, double submits).
+        """
+        return bool(self.reasons) and set(self.reasons) <= SILENT_REASONS
+
+
+# Hashes of recently accepted messages and the time they were accepted, oldest first
+_recent_messages: OrderedDict[str, float] = OrderedDict()
+
+
+def message_hash(message: str) -> str:
+    """
+    Hash a message, ignoring case and whitespace differences.
+
+    Args:
+        message (str): The message.
+
+    Returns:
+        str: Hex SHA-256 of the normalized message.
+    """
+    normalized = " ".join(message.casefold().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _is_duplicate(digest: str, now: float) -> bool:
+    # drop expired hashes; they are ordered by acceptance time
+    while _recent_messages:
+        oldest, accepted = next(iter(_recent_messages.items()))
+        if now - accepted < config.SPAM_DUPLICATE_WINDOW:
+            break
+        del _recent_messages[oldest]
+
+    return digest in _recent_messages
+
+
+async def score(contact: SendingContact, honeypot: str | None) -> Verdict:
+    """
+    Score a validated submission.
+
+    Accepted messages are added to the duplicate index right away, so a concurrent identical
+    submission is caught; call `forget` if the submission cannot be stored after all.
+
+    Args:
+        contact (SendingContact): The submission.
+        honeypot (str | None): Value of the honeypot field.
+
+    Returns:
+        Verdict: The score and the fired heuristics.
+    """
+    verdict = Verdict(score=0.0, message_hash=message_hash(contact.message))
+
+    def fire(reason: str, weight: float):
+        verdict.score += weight
+        verdict.reasons.append(reason)
+
+    if SPAM_EMAIL_RATE:
+        email = contact.email.lower()
+        if await rate_limit.get_backend().acquire(f"contact:email:{email}", SPAM_EMAIL_RATE) > 0:
+            fire("email_frequency", WEIGHTS["email_frequency"])
+
+    # no awaits below, so checking and remembering the message hash is atomic
+    if honeypot is not None and str(honeypot).strip():
+        fire("honeypot", WEIGHTS["honeypot"])
+
+    now = time.monotonic()
+    if _is_duplicate(verdict.message_hash, now):
+        fire("duplicate", WEIGHTS["duplicate"])
+
+    links = len(LINK.findall(contact.message))
+    if links > config.SPAM_MAX_LINKS:
+        fire("links", WEIGHTS["links"] * (links - config.SPAM_MAX_LINKS))
+
+    if not verdict.is_spam:
+        _recent_messages.pop(verdict.message_hash, None)
+        _recent_messages[verdict.message_hash] = now
+        while len(_recent_messages) > config.SPAM_MAX_TRACKED_MESSAGES:
+            _recent_messages.popitem(last=False)
+
+    return verdict
+
+
+def forget(verdict: Verdict):
+    """
+    Remove the message of a submission that could not be stored from the duplicate index.
+
+    Args:
+        verdict (Verdict): The verdict of the submission.
+    """
+    _recent_messages.pop(verdict.message_hash, None)
@@ -0,0 +1,391 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module abstracts where image files are kept, so API instances do not depend on a
+shared local disk.
+
+A backend persists finished temporary files under a content-addressed key and returns the
+location that is stored in `Image.filepath` / `ImageVariant.filepath`:
+
+- `LocalStorage` moves files below `IMAGE_DIR`; the location is the path on disk, so rows
+  created before the abstraction existed keep working unchanged.
+- `S3Storage` uploads files to a bucket of an S3-compatible object store (AWS S3, MinIO,
+  ...); the location is the object key. Requests are signed with AWS Signature Version 4
+  and sent via httpx, reads are streamed chunk by chunk and presigned URLs allow handing
+  the transfer over to the object store entirely. Locations that are no object key (paths
+  stored while the local backend was configured) are still read from the local disk, until
+  `python -m app.jobs.migrate_images_to_s3` has uploaded them.
+
+The configured backend (`IMAGE_STORAGE`) is returned by `get_storage`.
+"""
+
+# Import external dependencies
+import hashlib
+import hmac
+import os
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator
+from urllib.parse import quote, urlsplit
+
+import anyio
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+# Import internal dependencies
+from app.core import config
+
+
+# Size of the chunks read from and written to the storage
+CHUNK_SIZE = 1024 * 1024
+
+STORAGE_LOCAL = "local"
+STORAGE_S3 = "s3"
+
+# Payload hash for requests whose body is not signed (reads, presigned URLs)
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+EMPTY_PAYLOAD = hashlib.sha256(b"").hexdigest()
+
+# Content-addressed keys (`<sha[:2]>/<sha><ext>`, see app.services.image_storage.content_key)
+OBJECT_KEY = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{64}(\.[a-z0-9]+)?$")
+
+
+class StorageError(RuntimeError):
+    """Raised if the storage backend rejects a request."""
+
+
+class StorageUnavailable(StorageError):
+    """Raised if the storage backend cannot be reached."""
+
+
+@dataclass
+class StoredObject:
+    """
+    A stored file opened for reading.
+
+    Attributes:
+        chunks (AsyncIterator[bytes]): The content, read lazily in chunks.
+        size (int | None): Size of the content in bytes, if known.
+    """
+    chunks: AsyncIterator[bytes]
+    size: int | None = None
+
+
+class StorageBackend(ABC):
+    """
+    Interface of the storage backends.
+    """
+
+    @abstractmethod
+    async def save(self, tmp_path: str, key: str, mime_type: str, sha256: str) -> str:
+        """
+        Persist a temporary file under a content-addressed key.
+
+        The temporary file is consumed. If content with the same key is already stored, it is
+        kept and the temporary file is dropped.
+
+        Args:
+            tmp_path (str): Path of the temporary file.
+            key (str): Content-addressed key (`<sha[:2]>/<sha><ext>`).
+            mime_type (str): MIME type of the content.
+            sha256 (str): Hex encoded SHA-256 digest of the content.
+
+        Returns:
+            str: The location to store in the database.
+        """
+
+    @abstractmethod
+    async def open(self, location: str) -> StoredObject:
+        """
+        Open a stored file for streamed reading.
+
+        Raises:
+            FileNotFoundError: If nothing is stored at the location.
+        """
+
+    @abstractmethod
+    async def delete(self, location: str):
+        """
+        Remove a stored file; missing files are ignored.
+        """
+
+    def local_path(self, location: str) -> str | None:
+        """
+        Return the path on the local disk for a location, or None if the file is not stored locally.
+        """
+        return None
+
+    def presigned_url(self, location: str, expires: int) -> str | None:
+        """
+        Return a temporary URL clients can download the file from directly, or None if unsupported.
+        """
+        return None
+
+    async def close(self):
+        """
+        Release the connections held by the backend.
+        """
+
+
+def move_into_place(tmp_path: str, filepath: str):
+    """
+    Move a temporary file to its content-addressed path or drop it if already present.
+    """
+    if os.path.exists(filepath):
+        # identical content is already stored on disk
+        os.unlink(tmp_path)
+        return
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    # mkstemp creates files readable by the owner only; the file has to be readable for the web server
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, filepath)
+
+
+async def _read_file(filepath: str) -> AsyncIterator[bytes]:
+    """
+    Read a local file chunk by chunk without blocking the event loop.
+    """
+    async with await anyio.open_file(filepath, "rb") as f:
+        while chunk := await f.read(CHUNK_SIZE):
+            yield chunk
+
+
+class LocalStorage(StorageBackend):
+    """
+    Stores files on the local disk below `root`.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    async def save(self, tmp_path: str, key: str, mime_type: str, sha256: str) -> str:
+        filepath = os.path.join(self.root, *key.split("/"))
+        await run_in_threadpool(move_into_place, tmp_path, filepath)
+        return filepath
+
+    async def open(self, location: str) -> StoredObject:
+        size = (await anyio.Path(location).stat()).st_size
+        return StoredObject(chunks=_read_file(location), size=size)
+
+    async def delete(self, location: str):
+        try:
+            await run_in_threadpool(os.unlink, location)
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, location: str) -> str | None:
+        return location
+
+
+def is_object_key(location: str) -> bool:
+    """
+    Check whether a location is a content-addressed object key rather than a path on disk.
+    """
+    return OBJECT_KEY.match(location) is not None
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+
+def _quote(value: str, safe: str = "-_.~") -> str:
+    return quote(value, safe=safe)
+
+
+class S3Storage(StorageBackend):
+    """
+    Stores files in a bucket of an S3-compatible object store.
+
+    Objects are addressed path-style (`<endpoint>/<bucket>/<key>`), which is supported by
+    AWS S3 as well as by self-hosted stores such as MinIO. `public_endpoint_url` is used for
+    presigned URLs, as the signature covers the host clients connect to.
+
+    Locations that are no object key are paths of files stored by `LocalStorage` before the
+    switch to the object store; they are read from and deleted on the local disk.
+    """
+
+    def __init__(self, endpoint_url: str, bucket: str, region: str, access_key_id: str,
+                 secret_access_key: str, public_endpoint_url: str | None = None, local_root: str = "."):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.public_endpoint_url = (public_endpoint_url or endpoint_url).rstrip("/")
+        self.bucket = bucket
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self._client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=5.0))
+        self._local = LocalStorage(local_root)
+
+    def _uri(self, key: str) -> str:
+        return f"/{self.bucket}/{_quote(key, safe='/-_.~')}"
+
+    def _scope(self, now: datetime) -> str:
+        return f"{now:%Y%m%d}/{self.region}/s3/aws4_request"
+
+    def _signature(self, method: str, uri: str, query: dict, headers: dict, payload_hash: str,
+                   now: datetime) -> tuple[str, str]:
+        """
+        Compute the Signature Version 4 of a request.
+
+        Returns:
+            tuple[str, str]: The signed header names (`;` separated) and the signature.
+        """
+        canonical_query = "&".join(f"{_quote(k)}={_quote(v)}" for k, v in sorted(query.items()))
+        canonical_headers = {name.lower(): str(value).strip() for name, value in headers.items()}
+        signed_headers = ";".join(sorted(canonical_headers))
+
+        canonical_request = "\n".join([
+            method,
+            uri,
+            canonical_query,
+            "".join(f"{name}:{canonical_headers[name]}\n" for name in sorted(canonical_headers)),
+            signed_headers,
+            payload_hash,
+        ])
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256",
+            f"{now:%Y%m%dT%H%M%SZ}",
+            self._scope(now),
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+
+        key = _hmac(f"AWS4{self.secret_access_key}".encode(), f"{now:%Y%m%d}")
+        for part in (self.region, "s3", "aws4_request"):
+            key = _hmac(key, part)
+
+        return signed_headers, hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    async def _request(self, method: str, key: str, headers: dict | None = None, content=None,
+                       payload_hash: str = EMPTY_PAYLOAD, stream: bool = False) -> httpx.Response:
+        """
+        Send a signed request for an object.
+        """
+        now = datetime.now(timezone.utc)
+        uri = self._uri(key)
+        headers = {
+            "host": urlsplit(self.endpoint_url).netloc,
+            "x-amz-date": f"{now:%Y%m%dT%H%M%SZ}",
+            "x-amz-content-sha256": payload_hash,
+            **(headers or {}),
+        }
+        signed_headers, signature = self._signature(method, uri, {}, headers, payload_hash, now)
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key_id}/{self._scope(now)}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+
+        request = self._client.build_request(method, self.endpoint_url + uri, headers=headers, content=content)
+        try:
+            return await self._client.send(request, stream=stream)
+        except httpx.HTTPError as e:
+            raise StorageUnavailable(f"Object storage request failed: {e}")
+
+    async def save(self, tmp_path: str, key: str, mime_type: str, sha256: str) -> str:
+        try:
+            response = await self._request("HEAD", key)
+            if response.status_code == 404:
+                size = (await anyio.Path(tmp_path).stat()).st_size
+                # The digest is known already, so the streamed body can be signed without reading it twice
+                response = await self._request(
+                    "PUT",
+                    key,
+                    headers={"content-length": str(size), "content-type": mime_type},
+                    content=_read_file(tmp_path),
+                    payload_hash=sha256,
+                )
+            if response.is_error:
+                raise StorageError(f"Object storage rejected '{key}' with status {response.status_code}.")
+        finally:
+            await run_in_threadpool(os.unlink, tmp_path)
+
+        return key
+
+    async def open(self, location: str) -> StoredObject:
+        if not is_object_key(location):
+            return await self._local.open(location)
+
+        response = await self._request("GET", location, payload_hash=UNSIGNED_PAYLOAD, stream=True)
+        if response.status_code == 404:
+            await response.aclose()
+            raise FileNotFoundError(location)
+        if response.is_error:
+            await response.aclose()
+            raise StorageError(f"Object storage returned status {response.status_code} for '{location}'.")
+
+        async def chunks():
+            # the connection goes back to the pool as soon as the body is consumed or the client disconnects
+            try:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    yield chunk
+            finally:
+                await response.aclose()
+
+        size = response.headers.get("content-length")
+        return StoredObject(chunks=chunks(), size=int(size) if size else None)
+
+    async def delete(self, location: str):
+        if not is_object_key(location):
+            await self._local.delete(location)
+            return
+
+        response = await self._request("DELETE", location)
+        if response.is_error and response.status_code != 404:
+            raise StorageError(f"Object storage returned status {response.status_code} for '{location}'.")
+
+    def local_path(self, location: str) -> str | None:
+        return None if is_object_key(location) else location
+
+    def presigned_url(self, location: str, expires: int) -> str | None:
+        if not is_object_key(location):
+            return None
+
+        now = datetime.now(timezone.utc)
+        uri = self._uri(location)
+        query = {
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{self.access_key_id}/{self._scope(now)}",
+            "X-Amz-Date": f"{now:%Y%m%dT%H%M%SZ}",
+            "X-Amz-Expires": str(expires),
+            "X-Amz-SignedHeaders": "host",
+        }
+        headers = {"host": urlsplit(self.public_endpoint_url).netloc}
+        _, signature = self._signature("GET", uri, query, headers, UNSIGNED_PAYLOAD, now)
+
+        query["X-Amz-Signature"] = signature
+        return f"{self.public_endpoint_url}{uri}?" + "&".join(f"{_quote(k)}={_quote(v)}" for k, v in query.items())
+
+    async def close(self):
+        await self._client.aclose()
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """
+    Return the configured storage backend (`IMAGE_STORAGE`).
+
+    Returns:
+        StorageBackend: A `LocalStorage` or `S3Storage` instance shared by the process.
+    """
+    if config.IMAGE_STORAGE == STORAGE_S3:
+        return S3Storage(
+            endpoint_url=config.S3_ENDPOINT_URL,
+            public_endpoint_url=config.S3_PUBLIC_ENDPOINT_URL,
+            bucket=config.S3_BUCKET,
+            region=config.S3_REGION,
+            access_key_id=config.S3_ACCESS_KEY_ID,
+            secret_access_key=config.S3_SECRET_ACCESS_KEY,
+            local_root=config.IMAGE_DIR,
+        )
+    return LocalStorage(config.IMAGE_DIR)
+
+
+async def close():
+    """
+    Release the connections of the configured backend.
+    """
+    if get_storage.cache_info().currsize:
+        await get_storage().close()
@@ -0,0 +1,197 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module keeps the revocation list of the issued JWTs.
+
+JWTs are validated without a database lookup and would be valid until they expire; logging
+out, changing the password or deactivating or demoting a user would thus not end existing
+sessions. Revocations are stored in the `revoked_token` table, the source of truth shared by
+all workers, and mirrored in memory, so `is_revoked` costs two dict lookups per request:
+
+- single tokens by their ID (`jti` claim), revoked on logout,
+- users whose tokens issued (`iat` claim) before a point in time are revoked, e.g. after a
+  password change.
+
+Every worker reloads the table right after a revocation (through the change feed, see
+app/services/change_feed.py) and every `TOKEN_REVOCATION_REFRESH` seconds. A revocation is
+only kept until every token it revokes has expired, so the table and the in-memory copy stay
+as small as the number of revocations within one token lifetime (`JWT_LIFETIME`).
+Revocations are final; deleting rows by hand takes effect after a restart.
+"""
+
+# Import external dependencies
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Import internal dependencies
+from app.core import config
+from app.db.database import async_session_maker
+from app.db.queries import revoked_token as crud
+from app.services import change_feed
+
+
+logger = logging.getLogger(__name__)
+
+# Revoked token IDs and the expiry of the tokens as UNIX time
+_tokens: dict[str, float] = {}
+# Users by ID: tokens issued before the first UNIX time are revoked until the second one
+_users: dict[str, tuple[float, float]] = {}
+
+_task: asyncio.Task | None = None
+# Set when another worker revoked a token, so the list is reloaded right away
+_changed: asyncio.Event | None = None
+
+
+def _to_timestamp(value: datetime) -> float:
+    # the date columns hold naive UTC
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _remember_token(jti: str, expiry: float):
+    _tokens[jti] = max(expiry, _tokens.get(jti, expiry))
+
+
+def _remember_user(user_id: str, revoked_before: float, expiry: float):
+    previous = _users.get(user_id)
+    if previous:
+        revoked_before, expiry = max(revoked_before, previous[0]), max(expiry, previous[1])
+    _users[user_id] = (revoked_before, expiry)
+
+
+def is_revoked(claims: dict) -> bool:
+    """
+    Check whether a decoded, otherwise valid token was revoked.
+
+    Args:
+        claims (dict): Claims of the token.
+
+    Returns:
+        bool: True if the token must be rejected.
+    """
+    now = time.time()
+
+    jti = claims.get("jti")
+    if jti is not None and _tokens.get(jti, 0) > now:
+        return True
+
+    user = _users.get(str(claims.get("sub")))
+    # tokens issued before revocations were introduced carry no `iat` and count as old
+    return user is not None and user[1] > now and claims.get("iat", 0) < user[0]
+
+
+async def revoke(claims: dict):
+    """
+    Revoke a single token (no-op for tokens without ID).
+
+    Args:
+        claims (dict): Claims of the token.
+    """
+    jti = claims.get("jti")
+    if jti is None:
+        return
+
+    expiry = claims.get("exp", time.time() + config.JWT_LIFETIME)
+    async with async_session_maker() as db:
+        await crud.revoke_token(jti, uuid.UUID(claims["sub"]), _to_datetime(time.time()),
+                                _to_datetime(expiry), db)
+    _remember_token(jti, expiry)
+
+
+async def revoke_user(user_id: uuid.UUID):
+    """
+    Revoke every token issued to a user so far.
+
+    Args:
+        user_id (uuid.UUID): ID of the user.
+    """
+    now = time.time()
+    expiry = now + config.JWT_LIFETIME
+    async with async_session_maker() as db:
+        await crud.revoke_user_tokens(user_id, _to_datetime(now), _to_datetime(expiry), db)
+    _remember_user(str(user_id), now, expiry)
+
+
+async def reload():
+    """
+    Delete expired revocations and merge the table into the in-memory copy.
+    """
+    now = time.time()
+    async with async_session_maker() as db:
+        await crud.delete_expired_revocations(_to_datetime(now), db)
+        revocations = await crud.get_revocations(_to_datetime(now), db)
+
+    for jti, expiry in list(_tokens.items()):
+        if expiry <= now:
+            del _tokens[jti]
+    for user_id, (_, expiry) in list(_users.items()):
+        if expiry <= now:
+            del _users[user_id]
+
+    for revocation in revocations:
+        expiry = _to_timestamp(revocation.expiry_date)
+        if revocation.jti is not None:
+            _remember_token(revocation.jti, expiry)
+        else:
+            _remember_user(str(revocation.user_id), _to_timestamp(revocation.revocation_date), expiry)
+
+
+async def _reload_logged():
+    try:
+        await reload()
+    except Exception:
+        logger.exception("Loading the token revocation list failed")
+
+
+def _on_change(change: change_feed.Change):
+    if _changed is not None:
+        _changed.set()
+
+
+change_feed.subscribe("revoked_token", _on_change)
+
+
+async def run(changed: asyncio.Event):
+    """
+    Reload the revocation list on changes and periodically until cancelled.
+    """
+    while True:
+        try:
+            await asyncio.wait_for(changed.wait(), config.TOKEN_REVOCATION_REFRESH)
+        except asyncio.TimeoutError:
+            pass
+        changed.clear()
+        await _reload_logged()
+
+
+async def start():
+    """
+    Load the revocation list and keep it up to date.
+    """
+    global _task, _changed
+    if _task is None:
+        await _reload_logged()
+        _changed = asyncio.Event()
+        _task = asyncio.create_task(run(_changed), name="token-revocation")
+
+
+async def stop():
+    """
+    Stop reloading the revocation list.
+    """
+    global _task, _changed
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+        _changed = None
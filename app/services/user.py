@@ -3,29 +3,53 @@ User service and FastAPI Users integration.
 
 Provides user management integration for the application using fastapi-users.
 This module defines:
-- a UserManager implementing lifecycle hooks (register, password reset, verification),
+- a UserManager implementing lifecycle hooks (register, password reset, verification), which
+  emit events delivered in the background (see app/services/user_events.py), and hashing
+  passwords on a bounded thread pool (see app/services/password.py),
 - factory helpers for dependency injection,
-- the FastAPIUsers instance and authentication backend configuration.
+- the FastAPIUsers instance and authentication backend configuration, issuing JWTs that can
+  be revoked (see app/services/token_revocation.py),
+- `get_current_superuser`, the dependency protecting the admin routes, which records the
+  resolved superuser in the request state (`request.state.superuser`), and
+  `cached_superuser` for checks outside of routes that must not query the database.
+
+`get_current_superuser` caches resolved superusers by the SHA-256 digest of their token
+for at most `USER_CACHE_TTL` seconds and never beyond the expiry of the token, in an LRU of
+`USER_CACHE_SIZE` entries, so authenticated admin requests need no user query. Entries are
+evicted when a user is updated or deleted through the user manager, and through the change
+feed when the `user` table is changed by any other means (e.g. psql). Revoked tokens are
+rejected on cache hits as well.
+
+Logging out revokes the token; changing the password, or deactivating or demoting a user,
+revokes all tokens of the user.
 
 Author: Simon Neidig <mail@simon-neidig.eu>
 """
 
 # Import external dependencies
+import hashlib
+import time
 import uuid
 import os
+from collections import OrderedDict
 from typing import Optional
-from fastapi import Depends, Request
-from fastapi_users import ( BaseUserManager, FastAPIUsers, UUIDIDMixin )
+import jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi_users import ( BaseUserManager, FastAPIUsers, UUIDIDMixin, exceptions )
 from fastapi_users.db import SQLAlchemyUserDatabase
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 
 
 # Import internal dependencies
+from app.core import config
+from app.services import change_feed, metrics, token_revocation, user_events
 from app.services.db import User, get_user_db
+from app.services.password import OffloadedPasswordHelper
 
 SECRET = os.getenv('SECRET_KEY')
 
@@ -35,8 +59,8 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     Application-specific user manager.
 
     Implements hooks that are executed after user registration, password reset
-    requests and email verification requests. Hooks currently log events to stdout;
-    extend these methods to integrate with notification systems or analytics.
+    requests and email verification requests. Hooks emit user events, which are delivered
+    to the configured sinks (log, mail) in the background.
 
     Note: secrets for tokens are read from the SECRET_KEY environment variable.
     """
@@ -44,18 +68,109 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     reset_password_token_secret = SECRET
     verification_token_secret = SECRET
 
+    def __init__(self, user_db: SQLAlchemyUserDatabase):
+        super().__init__(user_db, OffloadedPasswordHelper())
+
+    async def authenticate(self, credentials) -> Optional[User]:
+        # Same as the base implementation, but hashing runs on the hashing pool
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Run the hasher anyway, so unknown emails cannot be told apart by timing
+            await self.password_helper.hash_async(credentials.password)
+            return None
+
+        verified, updated_password_hash = await self.password_helper.verify_and_update_async(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
+
+    async def create(self, user_create, safe: bool = False, request: Optional[Request] = None) -> User:
+        await self.password_helper.prepare_hash(user_create.password)
+        return await super().create(user_create, safe, request)
+
+    async def update(self, user_update, user: User, safe: bool = False, request: Optional[Request] = None) -> User:
+        if getattr(user_update, "password", None):
+            await self.password_helper.prepare_hash(user_update.password)
+        return await super().update(user_update, user, safe, request)
+
+    async def forgot_password(self, user: User, request: Optional[Request] = None) -> None:
+        # Same as the base implementation, but the password fingerprint is hashed on the hashing pool
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        token_data = {
+            "sub": str(user.id),
+            "password_fgpt": await self.password_helper.hash_async(user.hashed_password),
+            "aud": self.reset_password_token_audience,
+        }
+        token = generate_jwt(
+            token_data, self.reset_password_token_secret, self.reset_password_token_lifetime_seconds
+        )
+        await self.on_after_forgot_password(user, token, request)
+
+    async def reset_password(self, token: str, password: str, request: Optional[Request] = None) -> User:
+        # Same as the base implementation, but hashing runs on the hashing pool and only once
+        # the token is known to be valid
+        try:
+            data = decode_jwt(token, self.reset_password_token_secret, [self.reset_password_token_audience])
+            user_id = data["sub"]
+            password_fingerprint = data["password_fgpt"]
+            parsed_id = self.parse_id(user_id)
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            raise exceptions.InvalidResetPasswordToken()
+
+        user = await self.get(parsed_id)
+
+        valid_password_fingerprint, _ = await self.password_helper.verify_and_update_async(
+            user.hashed_password, password_fingerprint
+        )
+        if not valid_password_fingerprint:
+            raise exceptions.InvalidResetPasswordToken()
+
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        await self.validate_password(password, user)
+        await self.password_helper.prepare_hash(password)
+        updated_user = await self._update(user, {"password": password})
+
+        await self.on_after_reset_password(user, request)
+
+        return updated_user
+
     async def on_after_register(self, user: User, request: Optional[Request] = None):
-        print(f"User {user.id} has registered.")
+        await user_events.emit(user_events.UserEvent(user_events.REGISTERED, user.id, user.email))
 
     async def on_after_forgot_password(
         self, user: User, token: str, request: Optional[Request] = None
     ):
-        print(f"User {user.id} has forgot their password. Reset token: {token}")
+        await user_events.emit(user_events.UserEvent(user_events.FORGOT_PASSWORD, user.id, user.email, token))
 
     async def on_after_request_verify(
         self, user: User, token: str, request: Optional[Request] = None
     ):
-        print(f"Verification requested for user {user.id}. Verification token: {token}")
+        await user_events.emit(
+            user_events.UserEvent(user_events.VERIFICATION_REQUESTED, user.id, user.email, token)
+        )
+
+    async def on_after_update(self, user: User, update_dict: dict, request: Optional[Request] = None):
+        invalidate_cached_user(user.id)
+        # end the sessions of the user if they lost a privilege or their password changed
+        if ("password" in update_dict or update_dict.get("is_active") is False
+                or update_dict.get("is_superuser") is False):
+            await token_revocation.revoke_user(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None):
+        await token_revocation.revoke_user(user.id)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None):
+        invalidate_cached_user(user.id)
 
 
 async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):
@@ -74,8 +189,47 @@ async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 
 
-def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=SECRET, lifetime_seconds=3600)
+class RevocableJWTStrategy(JWTStrategy):
+    """
+    JWT strategy issuing tokens with an ID (`jti`) and issue time (`iat`), which can be revoked.
+
+    Logging out revokes the token instead of being a no-op.
+    """
+
+    def _decode(self, token: str) -> dict:
+        return decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+
+    async def read_token(self, token: Optional[str], user_manager: BaseUserManager) -> Optional[User]:
+        if token is None:
+            return None
+
+        try:
+            data = self._decode(token)
+            if token_revocation.is_revoked(data):
+                return None
+            return await user_manager.get(user_manager.parse_id(data["sub"]))
+        except (jwt.PyJWTError, KeyError, exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "jti": uuid.uuid4().hex,
+            "iat": time.time(),
+        }
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        try:
+            data = self._decode(token)
+        except jwt.PyJWTError:
+            return
+        await token_revocation.revoke(data)
+
+
+def get_jwt_strategy() -> RevocableJWTStrategy:
+    return RevocableJWTStrategy(secret=SECRET, lifetime_seconds=config.JWT_LIFETIME)
 
 
 auth_backend = AuthenticationBackend(
@@ -87,3 +241,115 @@ auth_backend = AuthenticationBackend(
 fastapi_users = FastAPIUsers[User, uuid.UUID](get_user_manager, [auth_backend])
 
 current_active_user = fastapi_users.current_user(active=True)
+
+
+# Resolved superusers by token digest: (user, expiry as UNIX time, token claims), least
+# recently used first
+_superusers: OrderedDict[str, tuple[User, float, dict]] = OrderedDict()
+# Incremented on every invalidation, so users loaded before it are not cached afterwards
+_generation = 0
+
+
+def invalidate_cached_user(user_id: uuid.UUID | str | None = None):
+    """
+    Evict a user (or, without an ID, all users) from the superuser cache.
+
+    Args:
+        user_id (uuid.UUID | str | None): ID of the changed user.
+    """
+    global _generation
+    _generation += 1
+
+    if user_id is None:
+        _superusers.clear()
+        return
+
+    for digest, (user, _, _) in list(_superusers.items()):
+        if str(user.id) == str(user_id):
+            del _superusers[digest]
+
+
+change_feed.subscribe("user", lambda change: invalidate_cached_user(change.row_id))
+
+
+async def get_current_superuser(
+    request: Request,
+    token: str | None = Depends(bearer_transport.scheme),
+    user_manager: UserManager = Depends(get_user_manager),
+) -> User:
+    """
+    Dependency that enforces the current user to be an active superuser.
+
+    The resolved user is recorded as `request.state.superuser` for the middlewares.
+
+    Args:
+        request (Request): The current request.
+        token (str | None): Bearer token of the request.
+        user_manager (UserManager): User manager, injected via dependency.
+
+    Returns:
+        User: The authenticated superuser.
+
+    Raises:
+        HTTPException(401): If the token is invalid, expired or revoked, or the user is unknown or
+            inactive.
+        HTTPException(403): If the user is not a superuser.
+    """
+    # the scheme of the transport does not reject requests without a token itself
+    if token is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+
+    cached = _superusers.get(digest)
+    if cached and cached[1] > now:
+        if token_revocation.is_revoked(cached[2]):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        metrics.cache_hit("superuser")
+        _superusers.move_to_end(digest)
+        request.state.superuser = cached[0]
+        return cached[0]
+    metrics.cache_miss("superuser")
+    _superusers.pop(digest, None)
+
+    generation = _generation
+    try:
+        data = get_jwt_strategy()._decode(token)
+        if token_revocation.is_revoked(data):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        user = await user_manager.get(user_manager.parse_id(data["sub"]))
+    except (jwt.PyJWTError, KeyError, exceptions.UserNotExists, exceptions.InvalidID):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    if not user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    if generation == _generation:
+        _superusers[digest] = (user, min(now + config.USER_CACHE_TTL, data.get("exp", now)), data)
+        while len(_superusers) > config.USER_CACHE_SIZE:
+            _superusers.popitem(last=False)
+
+    request.state.superuser = user
+    return user
+
+
+def cached_superuser(token: str) -> User | None:
+    """
+    Look up a bearer token in the cache of `get_current_superuser`, outside of a route.
+
+    Never queries the database, so tokens that were not used on an admin route within
+    `USER_CACHE_TTL` seconds are not recognized.
+
+    Args:
+        token (str): The bearer token.
+
+    Returns:
+        User | None: The cached superuser, or None if the token is not cached, expired or revoked.
+    """
+    cached = _superusers.get(hashlib.sha256(token.encode()).hexdigest())
+    if cached is None or cached[1] <= time.time() or token_revocation.is_revoked(cached[2]):
+        return None
+    return cached[0]
@@ -0,0 +1,287 @@
+"""
+Author: Simon Neidig <mail@simon-neidig.eu>
+
+Description:
+This module delivers user lifecycle events (registration, password reset and verification
+requests) in the background.
+
+The hooks of the user manager only `emit` an event, which puts one delivery per configured
+sink (`USER_EVENT_SINKS`) into a bounded in-process queue and returns, so the request does not
+wait for a mail server. A background worker delivers the queue; a failed delivery is retried
+after `USER_EVENT_RETRY_DELAY` seconds, doubling with every attempt, until
+`USER_EVENT_MAX_ATTEMPTS` attempts were made. Sinks are:
+
+- log: a structured log record per event (without the token),
+- mail: a mail to the user with the reset or verification link, sent over the SMTP server of
+  the contact outbox (see app/services/contact_outbox.py; for local development, start the
+  debugging server mentioned there to see the mails, including the tokens).
+
+Events are kept in memory only: deliveries still queued or waiting for a retry on shutdown
+are attempted once more, then dropped. Without a running worker (e.g. in jobs), events are
+delivered inline.
+"""
+
+# Import external dependencies
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from typing import Awaitable, Callable
+
+import aiosmtplib
+
+# Import internal dependencies
+from app.core import config
+from app.services.contact_outbox import smtp_client
+
+
+logger = logging.getLogger(__name__)
+
+REGISTERED = "registered"
+FORGOT_PASSWORD = "forgot_password"
+VERIFICATION_REQUESTED = "verification_requested"
+
+# Time a delivery may take on shutdown, in seconds
+SHUTDOWN_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class UserEvent:
+    """
+    A lifecycle event of a user.
+
+    Attributes:
+        name (str): REGISTERED, FORGOT_PASSWORD or VERIFICATION_REQUESTED.
+        user_id (uuid.UUID): ID of the user.
+        email (str): Email address of the user.
+        token (str | None): Reset or verification token, if any; never logged.
+        date (datetime): Time of the event (UTC).
+    """
+    name: str
+    user_id: uuid.UUID
+    email: str
+    token: str | None = field(default=None, repr=False)
+    date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+Sink = Callable[[UserEvent], Awaitable[None]]
+
+
+async def log_sink(event: UserEvent):
+    """
+    Log an event as a structured record.
+    """
+    logger.info("User event %s for user %s", event.name, event.user_id, extra={
+        "event": event.name,
+        "user_id": str(event.user_id),
+        "event_date": event.date.isoformat(),
+    })
+
+
+# Subject and link of the mail per event; events without an entry are not mailed
+MAILS = {
+    FORGOT_PASSWORD: ("Reset your password", config.USER_RESET_PASSWORD_URL,
+                      "To choose a new password, open the following link:"),
+    VERIFICATION_REQUESTED: ("Verify your email address", config.USER_VERIFY_URL,
+                             "To verify your email address, open the following link:"),
+}
+
+
+def build_mail(event: UserEvent) -> EmailMessage | None:
+    """
+    Build the mail to the user for an event.
+
+    Args:
+        event (UserEvent): The event.
+
+    Returns:
+        EmailMessage | None: The mail, or None if the event is not mailed.
+    """
+    if event.name not in MAILS or event.token is None:
+        return None
+
+    subject, url, text = MAILS[event.name]
+    message = EmailMessage()
+    message["From"] = config.USER_MAIL_FROM
+    message["To"] = event.email
+    message["Subject"] = subject
+    message.set_content(f"{text}\n\n{url.format(token=event.token)}\n")
+    return message
+
+
+async def mail_sink(event: UserEvent):
+    """
+    Mail the reset or verification link of an event to the user.
+    """
+    message = build_mail(event)
+    if message is None:
+        return
+
+    smtp = smtp_client()
+    async with smtp:
+        await smtp.send_message(message)
+
+
+SINKS: dict[str, Sink] = {
+    "log": log_sink,
+    "mail": mail_sink,
+}
+
+
+def get_sinks() -> list[Sink]:
+    """
+    Return the sinks configured in `USER_EVENT_SINKS`.
+
+    Raises:
+        ValueError: If an unknown sink is configured.
+    """
+    names = [name.strip() for name in config.USER_EVENT_SINKS.split(",") if name.strip()]
+    unknown = set(names) - set(SINKS)
+    if unknown:
+        raise ValueError(f"Unknown user event sinks: {', '.join(sorted(unknown))}")
+    return [SINKS[name] for name in names]
+
+
+@dataclass
+class Delivery:
+    """
+    Delivery of an event to one sink.
+    """
+    sink: Sink
+    event: UserEvent
+    attempts: int = 0
+
+
+_queue: asyncio.Queue | None = None
+_task: asyncio.Task | None = None
+# Scheduled retries of failed deliveries
+_retries: dict[asyncio.TimerHandle, Delivery] = {}
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Return the delay in seconds before retrying a delivery after `attempts` failed attempts.
+    """
+    return config.USER_EVENT_RETRY_DELAY * 2 ** min(attempts - 1, 10)
+
+
+async def _attempt(delivery: Delivery) -> bool:
+    delivery.attempts += 1
+    try:
+        await delivery.sink(delivery.event)
+        return True
+    except (aiosmtplib.SMTPException, OSError, ValueError) as e:
+        error = e
+    except Exception as e:
+        logger.exception("Sink %s failed for %r", delivery.sink.__name__, delivery.event)
+        error = e
+
+    logger.warning("Delivery of %r to %s failed (attempt %s): %s",
+                   delivery.event, delivery.sink.__name__, delivery.attempts, error)
+    return False
+
+
+def _put(delivery: Delivery):
+    try:
+        if _queue is None:
+            raise asyncio.QueueFull
+        _queue.put_nowait(delivery)
+    except asyncio.QueueFull:
+        logger.error("Dropping %r for %s: the event queue is full or stopped",
+                     delivery.event, delivery.sink.__name__)
+
+
+def _schedule_retry(delivery: Delivery):
+    if delivery.attempts >= config.USER_EVENT_MAX_ATTEMPTS:
+        logger.error("Giving up delivery of %r to %s after %s attempts",
+                     delivery.event, delivery.sink.__name__, delivery.attempts)
+        return
+
+    def retry():
+        del _retries[handle]
+        _put(delivery)
+
+    handle = asyncio.get_running_loop().call_later(retry_delay(delivery.attempts), retry)
+    _retries[handle] = delivery
+
+
+async def emit(event: UserEvent):
+    """
+    Queue an event for delivery to all configured sinks; returns without waiting for them.
+
+    Without a running worker, the event is delivered inline (without retries).
+
+    Args:
+        event (UserEvent): The event.
+    """
+    sinks = get_sinks()
+    if _queue is None:
+        for sink in sinks:
+            await _attempt(Delivery(sink, event))
+        return
+
+    for sink in sinks:
+        _put(Delivery(sink, event))
+
+
+async def _deliver_remaining(queue: asyncio.Queue, remaining: list[Delivery]):
+    """
+    Attempt every queued delivery and every scheduled retry once more (used on shutdown).
+    """
+    while not queue.empty():
+        remaining.append(queue.get_nowait())
+    for handle, delivery in list(_retries.items()):
+        handle.cancel()
+        remaining.append(delivery)
+    _retries.clear()
+
+    for delivery in remaining:
+        try:
+            await asyncio.wait_for(_attempt(delivery), SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error("Dropping %r for %s on shutdown", delivery.event, delivery.sink.__name__)
+
+
+async def run(queue: asyncio.Queue):
+    """
+    Deliver queued events until cancelled, then attempt the pending deliveries once more.
+    """
+    delivery = None
+    try:
+        while True:
+            delivery = await queue.get()
+            if not await _attempt(delivery):
+                _schedule_retry(delivery)
+            delivery = None
+    except asyncio.CancelledError:
+        await _deliver_remaining(queue, [delivery] if delivery else [])
+        raise
+
+
+async def start():
+    """
+    Start the event worker of this process.
+    """
+    global _queue, _task
+    if _task is None:
+        # fail on startup rather than on the first event
+        get_sinks()
+        _queue = asyncio.Queue(maxsize=config.USER_EVENT_QUEUE_SIZE)
+        _task = asyncio.create_task(run(_queue), name="user-events")
+
+
+async def stop():
+    """
+    Stop the event worker after attempting the pending deliveries once more.
+    """
+    global _queue, _task
+    if _task is not None:
+        _queue = None
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
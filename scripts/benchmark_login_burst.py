@@ -0,0 +1,116 @@
+"""
+Measures the latency of `/work/` reads while a burst of logins hits the API.
+
+Password hashing is CPU bound; run inline, every login stalls the other requests of the
+worker. Run this against a local server (a single uvicorn worker) started once with the
+hashing pool and once with `PASSWORD_HASH_WORKERS=0`, which hashes inline on the event loop
+(see app/services/password.py), and compare the percentiles.
+
+`--in-process` needs neither a server nor a database: the readers are coroutines sleeping
+1 ms on the event loop of this process, and the logins verify a password through the
+password helper of the app, so only the effect of hashing on the event loop is measured.
+
+Usage (from the repository root, with the environment of the app):
+    python -m scripts.benchmark_login_burst --email admin@example.com --password secret
+    PASSWORD_HASH_WORKERS=0 python -m scripts.benchmark_login_burst --in-process
+    python -m scripts.benchmark_login_burst --in-process
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+# Duration of a simulated read in the in-process mode, in seconds
+READ_DELAY = 0.001
+
+
+def percentiles(latencies: list[float]) -> str:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return (f"n={len(latencies)} p50={quantiles[49] * 1000:.1f}ms "
+            f"p95={quantiles[94] * 1000:.1f}ms p99={quantiles[98] * 1000:.1f}ms")
+
+
+async def read_work(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/work/")
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> int:
+    response = await client.post("/auth/jwt/login", data={"username": email, "password": password})
+    return response.status_code
+
+
+async def read_in_process(stop: asyncio.Event, latencies: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(READ_DELAY)
+        latencies.append(time.perf_counter() - start)
+
+
+async def measure_in_process(args, burst: bool) -> list[float]:
+    from app.services.password import OffloadedPasswordHelper
+
+    helper = OffloadedPasswordHelper()
+    hashed_password = helper.hash(args.password)
+
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    readers = [asyncio.create_task(read_in_process(stop, latencies)) for _ in range(args.readers)]
+    if burst:
+        results = await asyncio.gather(
+            *(helper.verify_and_update_async(args.password, hashed_password) for _ in range(args.logins)),
+            return_exceptions=True,
+        )
+        rejected = sum(1 for result in results if isinstance(result, Exception))
+        print(f"  logins verified: {len(results) - rejected}, rejected with 503: {rejected}")
+    else:
+        await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*readers)
+    return latencies
+
+
+async def measure(args, burst: bool) -> list[float]:
+    if args.in_process:
+        return await measure_in_process(args, burst)
+
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.readers + args.logins)
+    async with httpx.AsyncClient(base_url=args.host, limits=limits, timeout=30) as client:
+        readers = [asyncio.create_task(read_work(client, stop, latencies)) for _ in range(args.readers)]
+        if burst:
+            statuses = await asyncio.gather(*(login(client, args.email, args.password) for _ in range(args.logins)))
+            print("  login responses:", {code: statuses.count(code) for code in sorted(set(statuses))})
+        else:
+            await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*readers)
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="http://localhost:8000")
+    parser.add_argument("--email")
+    parser.add_argument("--password", default="benchmark-password")
+    parser.add_argument("--in-process", action="store_true", help="measure without server and database")
+    parser.add_argument("--readers", type=int, default=10, help="concurrent /work/ readers")
+    parser.add_argument("--logins", type=int, default=50, help="logins in the burst")
+    parser.add_argument("--duration", type=float, default=5, help="seconds of the baseline run")
+    args = parser.parse_args()
+    if not args.in_process and not args.email:
+        parser.error("--email is required unless --in-process is given")
+
+    print("baseline:", percentiles(await measure(args, burst=False)))
+    print("login burst:")
+    print("  reads:" if args.in_process else "  /work/:", percentiles(await measure(args, burst=True)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Measures the per-request overhead of the Prometheus metrics middleware.
+
+Calls a minimal ASGI app directly (no server, no sockets), once bare and once wrapped in
+`MetricsMiddleware`, and prints the difference per request. Run it once more with
+`PROMETHEUS_MULTIPROC_DIR` pointing to an empty directory to measure the multi-process mode.
+
+Usage (from the repository root, with the environment of the app):
+    python -m scripts.benchmark_metrics_overhead --requests 100000
+    PROMETHEUS_MULTIPROC_DIR=$(mktemp -d) python -m scripts.benchmark_metrics_overhead --requests 100000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+# the middleware only observes requests while metrics are enabled
+os.environ["METRICS_ENABLED"] = "true"
+
+from app.services.metrics import MetricsMiddleware
+
+
+class Route:
+    path = "/work/"
+
+
+async def app(scope, receive, send):
+    scope["route"] = Route
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-language", b"en")]})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def measure(asgi_app, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await asgi_app({"type": "http", "method": "GET", "path": "/work/", "headers": []}, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100000)
+    args = parser.parse_args()
+
+    middleware = MetricsMiddleware(app)
+    # warm up, e.g. to create the labelled histogram
+    await measure(middleware, 1000)
+
+    bare = await measure(app, args.requests)
+    wrapped = await measure(middleware, args.requests)
+    print(f"bare: {bare * 1e6:.2f} µs, with metrics: {wrapped * 1e6:.2f} µs, "
+          f"overhead: {(wrapped - bare) * 1e6:.2f} µs per request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""
+Checks that the metrics label requests with the full route template, including the prefixes
+given when including a router (see app/services/routing.py).
+
+Sends a few requests through the app (no server, no database needed: the requests are
+rejected before any query) and looks for their templates on `/metrics`.
+
+Usage (from the repository root, with the environment of the app):
+    python -m scripts.check_route_labels
+"""
+import os
+import sys
+
+os.environ.setdefault("METRICS_ENABLED", "true")
+os.environ.setdefault("METRICS_TOKEN", "check-route-labels")
+
+from fastapi.testclient import TestClient
+
+from app.core import config
+from app.main import app
+
+# (method, path, expected template)
+REQUESTS = [
+    ("GET", "/users/me", "/users/me"),
+    ("GET", "/users/00000000-0000-0000-0000-000000000000", "/users/{id}"),
+    ("POST", "/auth/jwt/login", "/auth/jwt/login"),
+    ("POST", "/auth/forgot-password", "/auth/forgot-password"),
+]
+
+
+def main() -> int:
+    client = TestClient(app, raise_server_exceptions=False)
+    for method, path, _ in REQUESTS:
+        client.request(method, path)
+
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {config.METRICS_TOKEN}"})
+    response.raise_for_status()
+
+    failed = False
+    for method, path, template in REQUESTS:
+        label = f'route="{template}"'
+        found = any(label in line and f'method="{method}"' in line for line in response.text.splitlines())
+        print(f"{'ok' if found else 'MISSING'}: {method} {path} -> {label}")
+        failed = failed or not found
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())